@@ -0,0 +1,91 @@
+# benchmarks/authentication.py
+
+"""
+Cached token authentication (`CachedTokenAuthentication`) against DRF's
+`TokenAuthentication`, per authentication and per request to `/api/networth/`.
+
+    python -m benchmarks.authentication --requests 2000
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def authenticate_many(authentication, request, count):
+    def _run():
+        for _ in range(count):
+            authentication.authenticate(request)
+
+    return _run
+
+
+def get_many(client, count):
+    def _run():
+        for _ in range(count):
+            client.get("/api/networth/")
+
+    return _run
+
+
+def queries_per_request(client):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    client.get("/api/networth/")
+    with CaptureQueriesContext(connection) as context:
+        client.get("/api/networth/")
+    return len(context.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient, APIRequestFactory
+
+    from networth_tracker.api.authentication import CachedTokenAuthentication
+    from networth_tracker.apis import NetWorthView
+    from networth_tracker.models import CustomUser
+
+    with test_database():
+        user = CustomUser.objects.create_user("bench@bench.com", password="bench")
+        token = Token.objects.create(user=user)
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        classes = (TokenAuthentication, CachedTokenAuthentication)
+        report(
+            f"{args.requests} token authentications",
+            [
+                (
+                    cls.__name__,
+                    measure(authenticate_many(cls(), request, args.requests), args.repeat),
+                )
+                for cls in classes
+            ],
+        )
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        results, queries = [], []
+        NetWorthView.throttle_classes = []
+        for authentication_class in classes:
+            # Views read the authentication classes when they are defined
+            NetWorthView.authentication_classes = [authentication_class]
+            label = authentication_class.__name__
+            queries.append((label, queries_per_request(client)))
+            results.append((label, measure(get_many(client, args.requests), args.repeat)))
+
+        report(f"{args.requests} GET /api/networth/ requests", results)
+        for label, count in queries:
+            print(f"  {label:<32} {count:>10} queries per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/batch.py
+
+"""
+Reads of several endpoints as separate requests against one `/api/batch/`
+request, run one after the other and with `"parallel": true`.
+
+`--rtt` adds that many milliseconds to every HTTP request, as the round trip
+of a mobile client would, and `--latency` to every query, as a database
+across the network would.
+
+    python -m benchmarks.batch --rtt 50 --latency 2
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import (
+    add_query_latency,
+    close_thread_connections,
+    measure,
+    report,
+    setup_django,
+    test_database,
+)
+
+PATHS = [
+    "/api/networth/",
+    "/api/accounts/",
+    "/api/bank_accounts/",
+    "/api/etfs/",
+    "/api/etf_transactions/",
+    "/api/superannuations/",
+]
+
+
+def separately(client, rtt):
+    def _run():
+        for path in PATHS:
+            time.sleep(rtt / 1000)
+            client.get(path)
+
+    return _run
+
+
+def batched(client, rtt, parallel):
+    def _run():
+        time.sleep(rtt / 1000)
+        response = client.post(
+            "/api/batch/",
+            {"requests": [{"path": path} for path in PATHS], "parallel": parallel},
+            format="json",
+        )
+        assert all(item["status"] == 200 for item in response.json()["responses"])
+
+    return _run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt", type=float, default=50.0)
+    parser.add_argument("--latency", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connections
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from networth_tracker.api.batch import _get_executor
+    from networth_tracker.models import BankAccount, CustomUser
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    # Responses must not come from the response cache
+    settings.RESPONSE_CACHE_BACKEND = None
+
+    with test_database():
+        user = CustomUser.objects.create_user("bench@bench.com", password="bench")
+        token = Token.objects.create(user=user)
+        BankAccount.objects.bulk_create(
+            BankAccount(user=user, bank="Bank", account_name=f"{n}", balance=n, interest_rate=1)
+            for n in range(20)
+        )
+        add_query_latency(args.latency)
+        connections.close_all()
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for throttle in ("user_minute", "user_day"):
+            settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][throttle] = "1000000/day"
+
+        report(
+            f"{len(PATHS)} reads, {args.rtt} ms per round trip, {args.latency} ms per query",
+            [
+                ("Separate requests", measure(separately(client, args.rtt), args.repeat)),
+                ("Batch", measure(batched(client, args.rtt, False), args.repeat)),
+                ("Batch, parallel", measure(batched(client, args.rtt, True), args.repeat)),
+            ],
+        )
+        close_thread_connections(_get_executor(), settings.BATCH_MAX_WORKERS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# benchmarks/dashboard.py
+
+"""
+The async dashboard (`/api/dashboard/`): its four queries one after the other
+against concurrently (`DASHBOARD_MAX_WORKERS`), then the endpoint under
+concurrent load served by uvicorn (ASGI) and by gunicorn's sync workers (WSGI).
+
+`--latency` adds that many milliseconds to every query, as a database across
+the network would; the queries of a local database return too fast for their
+overlap to show.
+
+    python -m benchmarks.dashboard --latency 2 --workers 2 --concurrency 32 --requests 2000
+
+The server comparison needs uvicorn (`pip install uvicorn`).
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.utils import (
+    add_query_latency,
+    close_thread_connections,
+    measure,
+    report,
+    setup_django,
+    test_database,
+)
+
+URL = "/api/dashboard/"
+ACCOUNT = {
+    "first_name": "Bench",
+    "last_name": "Bench",
+    "date_of_birth": "1990-01-01",
+    "salary": 0,
+    "eoy_cash_goal": 0,
+    "emergency_fund": 0,
+    "allocation_etfs": 0,
+    "allocation_stocks": 0,
+    "allocation_cryptocurrency": 0,
+    "allocation_cash": 0,
+    "allocation_managed_funds": 0,
+    "allocation_other": 0,
+    "short_term_tax_rate": 0,
+    "long_term_tax_rate": 0,
+}
+
+# Each user stays under the `user_minute` throttle rate
+REQUESTS_PER_USER = 100
+
+
+def _add_latency():
+    add_query_latency(float(os.environ.get("BENCHMARK_QUERY_LATENCY", 0)))
+
+
+def asgi():
+    """
+    uvicorn application factory: `core.asgi` with `BENCHMARK_QUERY_LATENCY`.
+    """
+
+    from core.asgi import application
+
+    _add_latency()
+    return application
+
+
+def wsgi():
+    """
+    gunicorn application factory: `core.wsgi` with `BENCHMARK_QUERY_LATENCY`.
+    """
+
+    from core.wsgi import application
+
+    _add_latency()
+    return application
+
+
+def seed(users):
+    from rest_framework.authtoken.models import Token
+
+    from networth_tracker.models import (
+        Account,
+        BankAccount,
+        CustomUser,
+        Etf,
+        EtfTransaction,
+        Superannuation,
+    )
+
+    tokens = []
+    for index in range(users):
+        user = CustomUser.objects.create_user(f"bench{index}@bench.com", password="bench")
+        tokens.append(Token.objects.create(user=user).key)
+        Account.objects.create(user=user, **ACCOUNT)
+        BankAccount.objects.bulk_create(
+            BankAccount(user=user, bank="Bank", account_name=f"{n}", balance=n, interest_rate=1)
+            for n in range(3)
+        )
+        Superannuation.objects.bulk_create(
+            Superannuation(
+                user=user,
+                provider=f"{n}",
+                investment_plan="Plan",
+                balance=n,
+                market_returns=7,
+                voluntary_contributions=0,
+            )
+            for n in range(2)
+        )
+        etfs = Etf.objects.bulk_create(
+            Etf(user=user, ticker=f"E{n}", fund_name="Fund", units_held=0, average_cost=0)
+            for n in range(5)
+        )
+        EtfTransaction.objects.bulk_create(
+            EtfTransaction(
+                etf=etf,
+                transaction_type=0,
+                order_date=f"2024-01-{day:02}",
+                units=1,
+                order_cost=100,
+                brokerage=0,
+            )
+            for etf in etfs
+            for day in range(1, 21)
+        )
+    return tokens
+
+
+def fan_out(user_id, count):
+    from asgiref.sync import async_to_sync
+
+    from networth_tracker.dashboard import get_dashboard
+
+    def _run():
+        for _ in range(count):
+            async_to_sync(get_dashboard)(user_id)
+
+    return _run
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(command, port, env):
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/api/prices/", timeout=1)
+                break
+            except urllib.error.HTTPError:
+                # Anything answered over HTTP, e.g. 401
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    raise RuntimeError(f"{command[0]} did not start")
+                time.sleep(0.2)
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def load(port, tokens, requests, concurrency):
+    """
+    Run `requests` authenticated GETs of the dashboard, `concurrency` at a
+    time, and return the elapsed seconds and the latency of each request.
+    """
+
+    def _get(index):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}{URL}",
+            headers={"Authorization": f"Token {tokens[index % len(tokens)]}"},
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = list(executor.map(_get, range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def database_url():
+    from django.db import connection
+
+    database = connection.settings_dict
+    if connection.vendor == "sqlite":
+        return f"sqlite:///{database['NAME']}"
+    return (
+        f"postgres://{database['USER']}:{database['PASSWORD']}"
+        f"@{database['HOST'] or 'localhost'}:{database['PORT'] or 5432}/{database['NAME']}"
+    )
+
+
+@contextmanager
+def benchmark_database(directory):
+    """
+    Migrate a database the servers can share for the duration of the block: a
+    SQLite file, or a throwaway test database on PostgreSQL.
+    """
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    if connection.vendor != "sqlite":
+        with test_database():
+            yield
+        return
+
+    connection.close()
+    connection.settings_dict["NAME"] = str(directory / "dashboard.sqlite3")
+    call_command("migrate", verbosity=0)
+    yield
+
+
+def compare_servers(args, tokens):
+    from django.db import connections
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url(),
+        "BENCHMARK_QUERY_LATENCY": str(args.latency),
+        "PYTHONPATH": os.getcwd(),
+    }
+    # Leave the database to the servers
+    connections.close_all()
+
+    port = _free_port()
+    workers = str(args.workers)
+    servers = (
+        (
+            f"uvicorn, {workers} workers",
+            [sys.executable, "-m", "uvicorn", "--factory", "benchmarks.dashboard:asgi"],
+            ["--workers", workers, "--port", str(port), "--no-access-log"],
+        ),
+        (
+            f"gunicorn (sync), {workers} workers",
+            [sys.executable, "-m", "gunicorn", "benchmarks.dashboard:wsgi()"],
+            ["--workers", workers, "--bind", f"127.0.0.1:{port}"],
+        ),
+    )
+
+    print(f"{args.requests} dashboard requests, {args.concurrency} at a time")
+    for label, command, options in servers:
+        with serve(command + options, port, env):
+            # Warm up connections and caches
+            load(port, tokens, args.concurrency * 2, args.concurrency)
+            elapsed, latencies = load(port, tokens, args.requests, args.concurrency)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"  {label:<32} {args.requests / elapsed:>8.0f} req/s"
+            f"  p50 {statistics.median(latencies) * 1000:>7.1f} ms  p99 {p99 * 1000:>7.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=2.0)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ["BENCHMARK_QUERY_LATENCY"] = str(args.latency)
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connections
+
+    from networth_tracker.dashboard import _get_executor
+
+    directory = Path(tempfile.mkdtemp())
+    try:
+        with benchmark_database(directory):
+            tokens = seed(max(1, args.requests // REQUESTS_PER_USER))
+            _add_latency()
+            # Only new connections get the latency
+            connections.close_all()
+
+            from rest_framework.authtoken.models import Token
+
+            user_id = Token.objects.get(key=tokens[0]).user_id
+            results = []
+            for label, workers in (("One after the other", 0), ("Concurrent", 4)):
+                settings.DASHBOARD_MAX_WORKERS = workers
+                results.append((label, measure(fan_out(user_id, args.calls), args.repeat)))
+            report(f"{args.calls} dashboards, {args.latency} ms per query", results)
+
+            close_thread_connections(_get_executor(), 4)
+
+            if importlib.util.find_spec("uvicorn"):
+                compare_servers(args, tokens)
+            else:
+                print("uvicorn is not installed, skipping the server comparison")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
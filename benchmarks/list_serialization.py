@@ -0,0 +1,91 @@
+# benchmarks/list_serialization.py
+
+"""
+List serialization through `ValuesRepresentation` against the `ModelSerializer`
+classes it replaces, for every row of a large list.
+
+    python -m benchmarks.list_serialization --rows 10000
+"""
+
+import argparse
+import datetime
+import random
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def seed(rows):
+    from networth_tracker.models import BankAccount, CustomUser, Etf, EtfTransaction
+
+    user = CustomUser.objects.create_user("bench@bench.com", password="bench")
+    BankAccount.objects.bulk_create(
+        BankAccount(
+            user=user,
+            bank=f"Bank {index % 10}",
+            account_name=f"Account {index}",
+            balance=random.uniform(0, 10000),
+            interest_rate=random.uniform(0, 5),
+        )
+        for index in range(rows)
+    )
+    etf = Etf.objects.create(
+        user=user, ticker="VAS", fund_name="Benchmark", units_held=0, average_cost=0
+    )
+    EtfTransaction.objects.bulk_create(
+        EtfTransaction(
+            etf=etf,
+            transaction_type=index % 2,
+            order_date=datetime.date(2020, 1, 1) + datetime.timedelta(days=index % 1000),
+            units=random.uniform(1, 100),
+            order_cost=random.uniform(100, 10000),
+            brokerage=9.5,
+        )
+        for index in range(rows)
+    )
+
+
+def serializer(serializer_class, queryset):
+    return lambda: serializer_class(queryset.all(), many=True).data
+
+
+def values(serializer_class, queryset):
+    from networth_tracker.api.representation import get_representation
+
+    representation = get_representation(serializer_class)
+    return lambda: representation.represent_many(representation.values(queryset))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from networth_tracker.api.serializers import BankAccountSerializer, EtfTransactionSerializer
+    from networth_tracker.models import BankAccount, EtfTransaction
+
+    with test_database():
+        seed(args.rows)
+        for serializer_class, queryset in (
+            (BankAccountSerializer, BankAccount.objects.order_by("-created_at", "-id")),
+            (EtfTransactionSerializer, EtfTransaction.objects.order_by("-created_at", "-id")),
+        ):
+            report(
+                f"Serializing {args.rows} {queryset.model.__name__} rows",
+                [
+                    (
+                        "ModelSerializer",
+                        measure(serializer(serializer_class, queryset), args.repeat),
+                    ),
+                    (
+                        "ValuesRepresentation",
+                        measure(values(serializer_class, queryset), args.repeat),
+                    ),
+                ],
+            )
+
+
+if __name__ == "__main__":
+    main()
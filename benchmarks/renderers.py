@@ -0,0 +1,86 @@
+# benchmarks/renderers.py
+
+"""
+Rendering a large list page with DRF's `JSONRenderer` against the orjson
+backed `FastJSONRenderer` and `MessagePackRenderer`, and parsing it back with
+`JSONParser` against `FastJSONParser`.
+
+    python -m benchmarks.renderers --rows 10000
+"""
+
+import argparse
+import io
+
+from benchmarks.list_serialization import seed
+from benchmarks.utils import measure, report, setup_django, test_database
+
+
+def render(renderer, data):
+    return lambda: renderer.render(data, "application/json", {})
+
+
+def parse(parser, content):
+    return lambda: parser.parse(io.BytesIO(content), "application/json", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from networth_tracker.api.renderers import (
+        FastJSONParser,
+        FastJSONRenderer,
+        MessagePackRenderer,
+        msgpack,
+        orjson,
+    )
+    from networth_tracker.api.representation import get_representation
+    from networth_tracker.api.serializers import BankAccountSerializer, EtfTransactionSerializer
+    from networth_tracker.models import BankAccount, EtfTransaction
+
+    if orjson is None:
+        print("orjson is not installed: FastJSONRenderer falls back to JSONRenderer")
+
+    with test_database():
+        seed(args.rows)
+        for serializer_class, queryset in (
+            (BankAccountSerializer, BankAccount.objects.order_by("-created_at", "-id")),
+            (EtfTransactionSerializer, EtfTransaction.objects.order_by("-created_at", "-id")),
+        ):
+            representation = get_representation(serializer_class)
+            rows = representation.represent_many(representation.values(queryset))
+            data = {"next": None, "previous": None, "results": rows}
+            content = JSONRenderer().render(data)
+            name = queryset.model.__name__
+
+            results = [
+                ("JSONRenderer", measure(render(JSONRenderer(), data), args.repeat)),
+                ("FastJSONRenderer", measure(render(FastJSONRenderer(), data), args.repeat)),
+            ]
+            if msgpack is not None:
+                results.append(
+                    (
+                        "MessagePackRenderer",
+                        measure(render(MessagePackRenderer(), data), args.repeat),
+                    )
+                )
+            report(f"Rendering {args.rows} {name} rows ({len(content)} bytes of JSON)", results)
+
+            report(
+                f"Parsing {args.rows} {name} rows",
+                [
+                    ("JSONParser", measure(parse(JSONParser(), content), args.repeat)),
+                    ("FastJSONParser", measure(parse(FastJSONParser(), content), args.repeat)),
+                ],
+            )
+
+
+if __name__ == "__main__":
+    main()
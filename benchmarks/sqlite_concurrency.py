@@ -0,0 +1,122 @@
+# benchmarks/sqlite_concurrency.py
+
+"""
+Concurrent reads and writes against a file-backed SQLite database with
+SQLite's default settings and with `SQLITE_PRAGMAS` (networth_tracker/sqlite.py),
+from separate processes the way gunicorn workers share `db.sqlite3`.
+
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 4 --operations 300
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.utils import report, setup_django
+
+
+def _connect(path, pragmas):
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection
+
+    settings.SQLITE_PRAGMAS = pragmas
+    connection.close()
+    connection.settings_dict["NAME"] = str(path)
+
+
+def worker(path, pragmas, role, operations, start):
+    """
+    Run `operations` writes (one `BankAccount` per transaction) or reads (a
+    page of the user's bank accounts) and return the number of operations
+    that failed with `database is locked`.
+    """
+
+    _connect(path, pragmas)
+
+    from django.db import OperationalError
+
+    from networth_tracker.models import BankAccount, CustomUser
+
+    user = CustomUser.objects.get()
+    failed = 0
+
+    # Start all workers together
+    time.sleep(max(0.0, start - time.time()))
+    for index in range(operations):
+        try:
+            if role == "write":
+                BankAccount.objects.create(
+                    user=user, bank="Bank", account_name=f"{index}", balance=index, interest_rate=1
+                )
+            else:
+                list(BankAccount.objects.filter(user=user).order_by("-id")[:100])
+        except OperationalError:
+            failed += 1
+    return failed
+
+
+def run(path, pragmas, args):
+    roles = ["write"] * args.writers + ["read"] * args.readers
+    context = multiprocessing.get_context("spawn")
+
+    with context.Pool(len(roles)) as pool:
+        # Leave time for every worker to set up Django before the clock starts
+        start = time.time() + 5
+        failed = pool.starmap_async(
+            worker, [(path, pragmas, role, args.operations, start) for role in roles]
+        )
+        failed = failed.get()
+        elapsed = time.time() - start
+
+    return elapsed, sum(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--operations", type=int, default=300)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    try:
+        template = directory / "template.sqlite3"
+        _connect(template, {})
+
+        from django.conf import settings
+        from django.core.management import call_command
+
+        from networth_tracker.models import CustomUser
+
+        call_command("migrate", verbosity=0)
+        CustomUser.objects.create_user("bench@bench.com", password="bench")
+
+        results, failures = [], []
+        for label, pragmas in (
+            ("SQLite defaults", {}),
+            ("SQLITE_PRAGMAS", settings.SQLITE_PRAGMAS),
+        ):
+            path = directory / f"{len(results)}.sqlite3"
+            shutil.copy(template, path)
+            elapsed, failed = run(path, pragmas, args)
+            results.append((label, elapsed))
+            failures.append((label, failed))
+
+        total = (args.writers + args.readers) * args.operations
+        report(
+            f"{total} operations by {args.writers} writer and {args.readers} reader processes",
+            results,
+        )
+        for (label, elapsed), (_, failed) in zip(results, failures):
+            print(f"  {label:<32} {total / elapsed:>10.0f} ops/s  {failed:>7} locked")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
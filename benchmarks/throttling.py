@@ -0,0 +1,76 @@
+# benchmarks/throttling.py
+
+"""
+Per-request cost of the GCRA throttles (`networth_tracker.api.throttling`)
+against DRF's `UserRateThrottle`, whose cost grows with the number of
+requests already made in the window.
+
+    python -m benchmarks.throttling --requests 2000
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from benchmarks.utils import measure, report, setup_django
+
+REQUEST = SimpleNamespace(user=SimpleNamespace(pk=1, is_authenticated=True))
+
+
+def throttle_many(throttle_class, count):
+    def _run():
+        for _ in range(count):
+            throttle_class().allow_request(REQUEST, None)
+
+    return _run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 1000, 9000])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.cache import cache
+    from rest_framework.throttling import UserRateThrottle
+
+    from networth_tracker.api.throttling import GCRAUserRateThrottle
+
+    class HistoryThrottle(UserRateThrottle):
+        scope = "bench"
+        # High enough that no request of the benchmark is rejected
+        rate = "1000000/day"
+
+    class GCRAThrottle(GCRAUserRateThrottle):
+        scope = "bench"
+        rate = "1000000/day"
+
+    for history in args.history:
+        results = []
+        for throttle_class in (HistoryThrottle, GCRAThrottle):
+            throttle = throttle_class()
+            key = throttle.get_cache_key(REQUEST, None)
+
+            def _run(throttle_class=throttle_class, key=key):
+                # Start every run from `history` earlier requests of the day
+                cache.clear()
+                if throttle_class is HistoryThrottle:
+                    cache.set(key, [time.time()] * history, 86400)
+                elif history:
+                    throttle = throttle_class()
+                    interval = 86400 * 1_000_000 // throttle.num_requests
+                    cache.set(key, int(time.time() * 1_000_000) + history * interval, 86400)
+                throttle_many(throttle_class, args.requests)()
+
+            results.append((throttle_class.__bases__[0].__name__, measure(_run, args.repeat)))
+
+        report(f"{args.requests} throttled requests after {history} earlier ones", results)
+
+    cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/utils.py
+
+"""
+Helpers shared by the benchmark scripts.
+
+Each script is run as a module from the project root, e.g.
+`python -m benchmarks.valuation`, and works against a throwaway test
+database so it never touches `db.sqlite3`.
+"""
+
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create and migrate a throwaway test database for the duration of the block.
+    """
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def add_query_latency(milliseconds):
+    """
+    Delay every query of the connections opened from now on by `milliseconds`,
+    as a database across the network would.
+    """
+
+    from django.db.backends.signals import connection_created
+
+    def _delay(execute, sql, params, many, context):
+        time.sleep(milliseconds / 1000)
+        return execute(sql, params, many, context)
+
+    def _install(sender, connection, **kwargs):
+        # Reconnecting reuses the connection object and its wrappers. Wrappers
+        # entered with `execute_wrapper()` are popped from the end, so go first
+        if _delay not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, _delay)
+
+    if milliseconds:
+        connection_created.connect(_install, weak=False)
+
+
+def close_thread_connections(executor, workers):
+    """
+    Close the database connections of the `workers` threads of `executor`, which
+    would keep a PostgreSQL test database from being dropped.
+    """
+
+    from django.db import connections
+
+    barrier = threading.Barrier(workers)
+
+    def _close(_):
+        # Hold every thread until each has one of the tasks
+        barrier.wait()
+        connections.close_all()
+
+    list(executor.map(_close, range(workers)))
+
+
+def measure(func, repeat=3):
+    """
+    Run `func` `repeat` times and return the median wall time in seconds.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def report(title, results):
+    """
+    Print `(label, seconds)` pairs relative to the first one.
+    """
+
+    print(title)
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"  {label:<32} {seconds * 1000:>10.2f} ms  {baseline / seconds:>7.1f}x")
@@ -0,0 +1,96 @@
+# benchmarks/valuation.py
+
+"""
+Vectorised valuation (`networth_tracker.valuation`) against a per-object loop.
+
+    python -m benchmarks.valuation --users 2000 --etfs-per-user 5
+"""
+
+import argparse
+import datetime
+import random
+
+from benchmarks.utils import measure, report, setup_django, test_database
+
+DATE = datetime.date(2024, 6, 28)
+TICKERS = ["VAS", "VGS", "IVV", "NDQ", "VDHG", "A200", "VTS", "VEU", "STW", "IOZ"]
+
+
+def seed(users, etfs_per_user):
+    from networth_tracker.models import CustomUser, Etf, InstrumentPrice
+
+    CustomUser.objects.bulk_create(
+        CustomUser(email=f"user{index}@bench.com") for index in range(users)
+    )
+    Etf.objects.bulk_create(
+        Etf(
+            user=user,
+            ticker=random.choice(TICKERS),
+            fund_name="Benchmark",
+            units_held=random.uniform(1, 500),
+            average_cost=random.uniform(20, 200),
+        )
+        for user in CustomUser.objects.all()
+        for _ in range(etfs_per_user)
+    )
+    InstrumentPrice.objects.bulk_create(
+        InstrumentPrice(ticker=ticker, date=DATE - datetime.timedelta(days=day), close=close)
+        for ticker in TICKERS
+        for day, close in enumerate(random.uniform(20, 200) for _ in range(250))
+    )
+
+
+def naive():
+    from networth_tracker.models import Etf, InstrumentPrice, PortfolioValuation
+
+    totals = {}
+    for etf in Etf.objects.all():
+        price = (
+            InstrumentPrice.objects.filter(ticker=etf.ticker.upper(), date__lte=DATE)
+            .order_by("-date")
+            .first()
+        )
+        cost = etf.units_held * etf.average_cost
+        value = etf.units_held * price.close if price else cost
+        market_value, cost_basis = totals.get(etf.user_id, (0.0, 0.0))
+        totals[etf.user_id] = (market_value + value, cost_basis + cost)
+
+    for user_id, (market_value, cost_basis) in totals.items():
+        PortfolioValuation.objects.update_or_create(
+            user_id=user_id,
+            date=DATE,
+            defaults={
+                "market_value": market_value,
+                "cost_basis": cost_basis,
+                "unrealised_pnl": market_value - cost_basis,
+            },
+        )
+
+
+def vectorised():
+    from networth_tracker.valuation import load_holdings, store_valuations, value_holdings
+
+    store_valuations(value_holdings(load_holdings(), DATE), DATE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--etfs-per-user", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        seed(args.users, args.etfs_per_user)
+        report(
+            f"Valuing {args.users * args.etfs_per_user} holdings of {args.users} users",
+            [
+                ("per-object loop", measure(naive, args.repeat)),
+                ("vectorised", measure(vectorised, args.repeat)),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
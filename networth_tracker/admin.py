@@ -8,7 +8,13 @@ from networth_tracker.models import (
     CustomUser,
     Etf,
     EtfTransaction,
+    InstrumentPrice,
+    NetWorthSnapshot,
+    Parcel,
+    ParcelDisposal,
+    PortfolioValuation,
     Superannuation,
+    TransactionImport,
 )
 
 
@@ -256,3 +262,65 @@ class SuperannuationAdmin(admin.ModelAdmin):
         ),
         ("Dates", {"fields": ("created_at", "updated_at")}),
     )
+
+
+@admin.register(InstrumentPrice)
+class InstrumentPriceAdmin(admin.ModelAdmin):
+    list_display = ["ticker", "date", "close"]
+    search_fields = ["ticker"]
+    date_hierarchy = "date"
+
+
+@admin.register(NetWorthSnapshot)
+class NetWorthSnapshotAdmin(admin.ModelAdmin):
+    list_display = ["user", "date", "cash", "etfs", "superannuation", "total"]
+    list_filter = ["date"]
+    search_fields = ["user__email"]
+    readonly_fields = [
+        "created_at",
+        "updated_at",
+    ]
+
+
+@admin.register(PortfolioValuation)
+class PortfolioValuationAdmin(admin.ModelAdmin):
+    list_display = ["user", "date", "market_value", "cost_basis", "unrealised_pnl"]
+    list_filter = ["date"]
+    search_fields = ["user__email"]
+    readonly_fields = [
+        "created_at",
+        "updated_at",
+    ]
+
+
+@admin.register(Parcel)
+class ParcelAdmin(admin.ModelAdmin):
+    list_display = ["etf", "acquired_date", "units", "unit_cost", "units_remaining"]
+    search_fields = ["etf__ticker", "etf__user__email"]
+    # Parcels are derived from the transaction history (see parcels.py)
+    readonly_fields = [
+        "etf",
+        "transaction",
+        "acquired_date",
+        "units",
+        "unit_cost",
+        "units_remaining",
+    ]
+
+
+@admin.register(ParcelDisposal)
+class ParcelDisposalAdmin(admin.ModelAdmin):
+    list_display = ["etf", "disposed_date", "units", "cost_basis", "proceeds"]
+    search_fields = ["etf__ticker", "etf__user__email"]
+    readonly_fields = ["etf", "parcel", "sale", "disposed_date", "units", "cost_basis", "proceeds"]
+
+
+@admin.register(TransactionImport)
+class TransactionImportAdmin(admin.ModelAdmin):
+    list_display = ["user", "file_name", "status", "rows_imported", "rows_failed", "created_at"]
+    list_filter = ["status"]
+    search_fields = ["user__email", "file_name"]
+    readonly_fields = [
+        "created_at",
+        "updated_at",
+    ]
@@ -0,0 +1,158 @@
+# networth_tracker/api/authentication.py
+
+import hashlib
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from networth_tracker.cache import LRUCache
+from networth_tracker.models import CustomUser
+
+SHARED_CACHE_KEY = "auth-token:{digest}"
+GENERATION_KEY = "auth-token-generation:{digest}"
+
+# Columns cached for each token: the user's flags, never its password hash.
+# The other columns of the user are loaded on first access
+TOKEN_FIELDS = ("key", "user_id", "created")
+USER_FIELDS = ("id", "is_active", "is_staff", "is_superuser", "is_verified")
+
+_local_cache = None
+
+
+def _get_local_cache():
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = LRUCache(
+            getattr(settings, "TOKEN_AUTH_CACHE_SIZE", 10000),
+            getattr(settings, "TOKEN_AUTH_CACHE_TTL", 60),
+        )
+    return _local_cache
+
+
+def _get_shared_cache():
+    alias = getattr(settings, "TOKEN_AUTH_SHARED_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _digest(key):
+    # Token keys are credentials, so only their digest leaves the process
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _shared_key(key):
+    return SHARED_CACHE_KEY.format(digest=_digest(key))
+
+
+def _get_generation(shared_cache, key):
+    """
+    Return the shared generation of a cached token, which every process
+    checks its cache entries against.
+    """
+
+    if shared_cache is None:
+        return None
+
+    key = GENERATION_KEY.format(digest=_digest(key))
+    generation = shared_cache.get(key)
+    if generation is None:
+        shared_cache.add(key, uuid.uuid4().hex, None)
+        generation = shared_cache.get(key)
+    return generation
+
+
+def _bump_generation(shared_cache, key):
+    key = GENERATION_KEY.format(digest=_digest(key))
+    shared_cache.delete(key)
+    # Again once committed, in case another process cached the old rows meanwhile
+    transaction.on_commit(partial(shared_cache.delete, key))
+
+
+def invalidate_token(key):
+    """
+    Drop a token from both cache tiers.
+
+    Other processes drop their in-process entry when they next see it if a
+    shared cache is set, and after `TOKEN_AUTH_CACHE_TTL` seconds otherwise.
+    """
+
+    _get_local_cache().delete(key)
+    shared_cache = _get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(_shared_key(key))
+        _bump_generation(shared_cache, key)
+
+
+def invalidate_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list("key", flat=True):
+        invalidate_token(key)
+
+
+def _entry(token, generation):
+    return (
+        tuple(getattr(token, name) for name in TOKEN_FIELDS),
+        tuple(getattr(token.user, name) for name in USER_FIELDS),
+        generation,
+    )
+
+
+def _from_entry(entry):
+    """
+    Return a new token and user built from a cache entry, so requests may
+    modify their own.
+    """
+
+    token_values, user_values, _ = entry
+    token = Token.from_db(Token.objects.db, TOKEN_FIELDS, token_values)
+    token.user = CustomUser.from_db(CustomUser.objects.db, USER_FIELDS, user_values)
+    return token.user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` that caches the token and its user, saving the
+    `Token`/`CustomUser` query of every authenticated request.
+
+    Tokens are looked up in a bounded in-process LRU (`TOKEN_AUTH_CACHE_SIZE`
+    entries for `TOKEN_AUTH_CACHE_TTL` seconds), then in the Django cache named
+    by `TOKEN_AUTH_SHARED_CACHE` if set, then in the database. Deleting a token
+    and saving or deleting its user (e.g. a password change or `is_active=False`)
+    invalidate it (see signals.py).
+
+    With a shared cache, entries of both tiers carry the generation of their
+    token, bumped on every invalidation, so a hit is only used while its
+    generation is current and an invalidation reaches every process at once.
+    Without one, other processes keep an invalidated token for up to
+    `TOKEN_AUTH_CACHE_TTL` seconds.
+
+    Entries hold the token and the flags of its user (`USER_FIELDS`), not the
+    user itself, so no password hash is cached.
+    """
+
+    def authenticate_credentials(self, key):
+        local_cache = _get_local_cache()
+        shared_cache = _get_shared_cache()
+        # Read before the database, so an invalidation committed while the
+        # token is loaded leaves the new entry stale rather than current
+        generation = _get_generation(shared_cache, key)
+
+        entry = local_cache.get(key)
+        if entry is None and shared_cache is not None:
+            entry = shared_cache.get(_shared_key(key))
+            if entry is not None:
+                local_cache.set(key, entry)
+
+        if entry is None or entry[2] != generation:
+            _, token = super().authenticate_credentials(key)
+            entry = _entry(token, generation)
+            if shared_cache is not None:
+                shared_cache.set(
+                    _shared_key(key), entry, getattr(settings, "TOKEN_AUTH_CACHE_TTL", 60)
+                )
+            local_cache.set(key, entry)
+
+        return _from_entry(entry)
@@ -0,0 +1,235 @@
+# networth_tracker/api/batch.py
+
+"""
+`POST /api/batch/`: several API requests in one round trip.
+
+    {
+        "requests": [
+            {"method": "GET", "path": "/api/networth/"},
+            {"method": "PATCH", "path": "/api/bank_accounts/3/", "body": {"balance": 10}}
+        ],
+        "parallel": true
+    }
+
+returns `{"responses": [{"status": 200, "headers": {...}, "body": {...}}, ...]}`
+in the order of the requests, whatever their status. Bodies are JSON or text:
+streamed and binary (`?format=msgpack`) responses are refused per item.
+
+The batch is authenticated once; each sub-request is resolved and dispatched
+in-process to its API view with that user, skipping the middleware and the
+authentication classes of the view. Permissions and throttles still apply
+to every sub-request, so a batch costs the throttles as much as the same
+requests sent one by one.
+
+Sub-requests run in order, each committing on its own like a separate
+request. With `"parallel": true` consecutive reads (`GET`, `HEAD`,
+`OPTIONS`) run concurrently on `BATCH_MAX_WORKERS` threads; writes still
+run one at a time, after the reads before them and before the reads after
+them.
+"""
+
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+from rest_framework import permissions, response, status, views
+from rest_framework.settings import api_settings
+
+from networth_tracker.api.serializers import BatchSerializer
+from networth_tracker.query_budgets import get_budget
+
+logger = logging.getLogger(__name__)
+
+# Headers of the batch request that do not apply to its sub-requests
+DROPPED_HEADERS = {
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_AUTHORIZATION",
+    "HTTP_COOKIE",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_UNMODIFIED_SINCE",
+    "QUERY_STRING",
+}
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "BATCH_MAX_WORKERS", 4),
+            thread_name_prefix="batch",
+        )
+    return _executor
+
+
+def _error(status_code, detail):
+    return {"status": status_code, "headers": {}, "body": {"detail": detail}}
+
+
+def _sub_request(request, item):
+    path, _, query_string = item["path"].partition("?")
+    body = b"" if item["body"] is None else json.dumps(item["body"]).encode()
+
+    environ = {key: value for key, value in request.META.items() if key not in DROPPED_HEADERS}
+    environ.update(
+        {
+            "REQUEST_METHOD": item["method"],
+            "PATH_INFO": path,
+            "QUERY_STRING": query_string,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            # JSON unless the path asks for another format with `?format=`
+            "HTTP_ACCEPT": "application/json, */*;q=0.1",
+            "wsgi.input": io.BytesIO(body),
+            # Missing under ASGI, needed for absolute URLs such as pagination links
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    sub_request = WSGIRequest(environ)
+
+    # Picked up by DRF's `Request` in place of the view's authentication classes
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    sub_request.user = request.user
+    return sub_request
+
+
+def _binary_format(sub_request, match, view_class):
+    """
+    Return whether the sub-request asks for a binary format (`?format=msgpack`)
+    of its view, which the JSON batch response cannot hold.
+    """
+
+    param = api_settings.URL_FORMAT_OVERRIDE
+    requested = (param and sub_request.GET.get(param)) or match.kwargs.get("format")
+    return any(
+        renderer.format == requested and getattr(renderer, "render_style", "text") == "binary"
+        for renderer in view_class.renderer_classes
+    )
+
+
+def _response_body(sub_response):
+    if not sub_response.content:
+        return None
+    if sub_response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(sub_response.content)
+    return sub_response.content.decode(sub_response.charset)
+
+
+def dispatch(request, item):
+    """
+    Run one sub-request of `request` and return its status, headers and body.
+    """
+
+    sub_request = _sub_request(request, item)
+    try:
+        match = resolve(sub_request.path_info)
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None or not issubclass(view_class, views.APIView):
+        return _error(status.HTTP_400_BAD_REQUEST, "Only API endpoints can be batched.")
+    if issubclass(view_class, BatchView):
+        return _error(status.HTTP_400_BAD_REQUEST, "Batches cannot be nested.")
+
+    if _binary_format(sub_request, match, view_class):
+        # Refused before the view runs, so a refused write changes nothing
+        return _error(status.HTTP_406_NOT_ACCEPTABLE, "Binary responses cannot be batched.")
+
+    sub_request.resolver_match = match
+    try:
+        sub_response = match.func(sub_request, *match.args, **match.kwargs)
+        if sub_response.streaming:
+            sub_response.close()
+            return _error(status.HTTP_400_BAD_REQUEST, "Streaming responses cannot be batched.")
+        if hasattr(sub_response, "render"):
+            sub_response.render()
+        body = _response_body(sub_response)
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", item["method"], item["path"])
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, "A server error occurred.")
+
+    return {
+        "status": sub_response.status_code,
+        "headers": dict(sub_response.headers),
+        "body": body,
+    }
+
+
+def _dispatch_in_thread(request, item):
+    try:
+        return dispatch(request, item)
+    finally:
+        # Worker threads outlive requests, so apply `CONN_MAX_AGE` like a request would
+        close_old_connections()
+
+
+def _segments(items, parallel):
+    """
+    Split `items` into runs that may execute concurrently: consecutive reads
+    when `parallel` is set, every other item on its own.
+    """
+
+    segments = []
+    for item in items:
+        read = parallel and item["method"] in permissions.SAFE_METHODS
+        if read and segments and segments[-1][0]:
+            segments[-1][1].append(item)
+        else:
+            segments.append((read, [item]))
+    return segments
+
+
+def run_batch(request, items, parallel=False):
+    results = []
+    for concurrent, segment in _segments(items, parallel):
+        if concurrent and len(segment) > 1:
+            executor = _get_executor()
+            results.extend(executor.map(_dispatch_in_thread, [request] * len(segment), segment))
+        else:
+            results.extend(dispatch(request, item) for item in segment)
+    return results
+
+
+def batch_budget(items):
+    """
+    Query budget of a batch: its own, plus the budget of each sub-request's route.
+    """
+
+    budget = get_budget("batch", "POST")
+    for item in items:
+        try:
+            match = resolve(item["path"].partition("?")[0])
+        except Resolver404:
+            continue
+        budget += get_budget(match.view_name, item["method"]) or 0
+    return budget
+
+
+class BatchView(views.APIView):
+    """
+    Run several API requests in one round trip, see networth_tracker/api/batch.py.
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+
+        # Checked by `QueryBudgetMiddleware` instead of the budget of the route
+        request._request.query_budget = batch_budget(items)
+
+        results = run_batch(request, items, serializer.validated_data["parallel"])
+        return response.Response({"responses": results})
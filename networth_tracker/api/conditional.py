@@ -0,0 +1,108 @@
+# networth_tracker/api/conditional.py
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def collection_validators(queryset):
+    """
+    Return the `(last_modified, count)` of a queryset in one aggregate query.
+
+    Every write to the rows bumps `updated_at`, and a delete that leaves the
+    latest `updated_at` in place still changes the count.
+    """
+
+    totals = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+    return totals["last_modified"], totals["count"]
+
+
+def make_etag(request, last_modified, count):
+    """
+    Return a weak ETag for the representation of `count` rows last modified
+    at `last_modified`, as seen by the requesting user.
+
+    The path, query string and accepted renderer identify the representation;
+    the user's `updated_at` covers the nested user of the serializers.
+    """
+
+    user = request.user
+    parts = (
+        user.pk,
+        getattr(user, "updated_at", None),
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        last_modified,
+        count,
+    )
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return "W/" + quote_etag(digest)
+
+
+def conditional_response(request, validators, get_response):
+    """
+    Return `304 Not Modified` if the request's `If-None-Match` or
+    `If-Modified-Since` still match `validators`, or else the response built
+    by `get_response()`, with `ETag` and `Last-Modified` set either way.
+    """
+
+    last_modified, count = validators
+    etag = make_etag(request, last_modified, count)
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = get_response()
+
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    # Representations are per user: only the client may store them, and it must revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Accept", "Authorization", "Cookie"))
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional `list` and `retrieve` requests with `304 Not Modified`
+    before any row is read or serialised.
+
+    Collections are validated by the latest `updated_at` and the row count of
+    the filtered queryset (`collection_validators`), objects by their own
+    `updated_at`. `Last-Modified` has a one second resolution and does not
+    change when a row other than the latest is deleted, so clients should
+    prefer `If-None-Match`, which takes precedence when both are sent.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list_response(
+            self.filter_queryset(self.get_queryset()),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = None
+
+        def _get_validators():
+            nonlocal instance
+            instance = self.get_object()
+            return instance.updated_at, 1
+
+        return self.validated_response(
+            _get_validators, lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def conditional_list_response(self, queryset, get_response):
+        return self.validated_response(lambda: collection_validators(queryset), get_response)
+
+    def validated_response(self, get_validators, get_response):
+        """
+        Return the conditional response for the validators computed by
+        `get_validators()`, or the response built by `get_response()`.
+        """
+
+        return conditional_response(self.request, get_validators(), get_response)
@@ -0,0 +1,117 @@
+# networth_tracker/api/exports.py
+
+import csv
+import json
+from io import StringIO
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Selects the export format through content negotiation (`Accept` or `?format=`).
+
+    Exported rows are streamed by `ExportMixin` without going through the
+    renderer, which only renders error responses.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+def stream_csv(columns, rows, chunk_size):
+    """
+    Yield a CSV document with a header row, `chunk_size` rows at a time.
+    """
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def stream_ndjson(columns, rows, chunk_size):
+    """
+    Yield one JSON object per row and line, `chunk_size` rows at a time.
+    """
+
+    encoder = DjangoJSONEncoder()
+    lines = []
+
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(columns, row))))
+        if len(lines) == chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+STREAMS = {
+    CSVRenderer.format: stream_csv,
+    NDJSONRenderer.format: stream_ndjson,
+}
+
+
+class ExportMixin:
+    """
+    Adds `GET /<resource>/export` to a viewset, streaming the rows visible to
+    the user as CSV (default) or NDJSON.
+
+    Rows are read with `values_list(*export_fields).iterator()`, so memory use
+    does not depend on the number of rows and the first bytes are sent before
+    the query is exhausted. Lookups spanning relations (`etf__ticker`) are
+    exported as `etf_ticker`.
+    """
+
+    export_fields = ()
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+
+        chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+        rows = queryset.values_list(*self.export_fields).iterator(chunk_size=chunk_size)
+        columns = [field.replace("__", "_") for field in self.export_fields]
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            STREAMS[renderer.format](columns, rows, chunk_size),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        filename = f"{self.basename}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
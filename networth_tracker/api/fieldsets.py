@@ -0,0 +1,120 @@
+# networth_tracker/api/fieldsets.py
+
+"""
+Sparse fieldsets (`?fields=`) and opt-in expansions (`?expand=`) of API responses.
+
+    GET /api/bank_accounts/?fields=id,account_name,balance
+    GET /api/etfs/7/?expand=user
+
+`?fields=` keeps only the listed fields of each object and `?expand=user`
+embeds the owner (`{"id": ..., "email": ...}`) in place of its primary key.
+Both also shape the SQL: lists read only the matching columns with
+`values()` (see `ValuesRepresentation`), `retrieve` loads the object with
+`only()` those columns, and the user table is only joined when the user is
+expanded. Unknown names are rejected with `400 Bad Request`.
+
+`?fields=` only prunes the output: the input of writes is validated in full.
+"""
+
+from functools import lru_cache
+
+from rest_framework.exceptions import ValidationError
+
+from networth_tracker.api.representation import get_representation
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+# Actions that read through `only()` the columns of the requested fields
+SPARSE_ACTIONS = ("list", "retrieve")
+
+# Columns every instance needs whatever the fields: ownership and validators
+REQUIRED_COLUMNS = ("user", "updated_at")
+
+
+class FieldsetSerializerMixin:
+    """
+    Prunes the output of a `ModelSerializer` to `context["fields"]`, and
+    replaces the fields named in `context["expand"]` with the serializer
+    `expandable_fields` maps them to.
+    """
+
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.context.get("expand", ()):
+            fields[name] = self.expandable_fields[name](read_only=True)
+        return fields
+
+    @property
+    def _readable_fields(self):
+        requested = self.context.get("fields")
+        for field in super()._readable_fields:
+            if requested is None or field.field_name in requested:
+                yield field
+
+
+@lru_cache(maxsize=None)
+def _readable_field_names(serializer_class):
+    return frozenset(field.field_name for field in serializer_class()._readable_fields)
+
+
+def _parse(request, param):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def _check(param, names, allowed):
+    unknown = names - allowed
+    if unknown:
+        raise ValidationError({param: f"Unknown fields: {', '.join(sorted(unknown))}."})
+
+
+class FieldsetMixin:
+    """
+    Reads `?fields=` and `?expand=` for serializers using
+    `FieldsetSerializerMixin`, passes them to the serializer context and to
+    `ValuesListMixin`, and restricts the columns and joins of the queryset.
+    """
+
+    def get_fieldset(self, serializer_class=None):
+        """
+        Return the `(fields, expand)` requested for `serializer_class`: the
+        sorted tuple of output fields, or `None` for all of them, and the
+        sorted tuple of expanded fields.
+        """
+
+        serializer_class = serializer_class or self.get_serializer_class()
+        expandable = getattr(serializer_class, "expandable_fields", None)
+        if expandable is None:
+            return None, ()
+
+        fields = _parse(self.request, FIELDS_PARAM)
+        if fields is not None:
+            _check(FIELDS_PARAM, fields, _readable_field_names(serializer_class))
+            fields = tuple(sorted(fields))
+
+        expand = _parse(self.request, EXPAND_PARAM) or set()
+        _check(EXPAND_PARAM, expand, set(expandable))
+        return fields, tuple(sorted(expand))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"], context["expand"] = self.get_fieldset()
+        return context
+
+    def get_values_representation(self, serializer_class):
+        return get_representation(serializer_class, *self.get_fieldset(serializer_class))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in SPARSE_ACTIONS:
+            return queryset
+
+        fields, expand = self.get_fieldset()
+        representation = get_representation(self.get_serializer_class(), fields, expand)
+        queryset = queryset.only(*REQUIRED_COLUMNS, *representation.lookups)
+        return queryset.select_related(*expand) if expand else queryset
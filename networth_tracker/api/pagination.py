@@ -0,0 +1,185 @@
+# networth_tracker/api/pagination.py
+
+import base64
+import json
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque cursor pagination keyed on every column of the queryset ordering.
+
+    DRF's `CursorPagination` only stores the first ordering value plus an offset,
+    so ties on that value are resolved by skipping rows. Here the cursor carries
+    the value of each ordering column of the boundary row (always ending with the
+    primary key), so every page is a single range scan on `(created_at, id)` (or
+    on the client supplied `?ordering=`) no matter how deep the client pages.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(request, queryset, view)
+
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        ordering = [self._flip(field) if self.reverse else field for field in self.fields]
+        queryset = queryset.order_by(*ordering)
+
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._keyset_filter(ordering, position))
+            except (ValidationError, ValueError, TypeError):
+                # Values of the cursor that do not fit their ordering column
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """
+        Return the `?page_size=` requested by the client, capped at `API_MAX_PAGE_SIZE`.
+        """
+
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering used as the keyset, honouring any `OrderingFilter`
+        on the view and always ending with the primary key so it is total.
+        """
+
+        ordering = None
+        for backend in getattr(view, "filter_backends", []):
+            if hasattr(backend, "get_ordering"):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+
+        ordering = list(ordering or self.ordering)
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("-id" if ordering[-1].startswith("-") else "id")
+
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        # Pages of `values()` querysets hold dicts rather than model instances
+        if isinstance(instance, dict):
+            position = [instance[field.lstrip("-")] for field in self.fields]
+        else:
+            position = [
+                attrgetter(field.lstrip("-").replace("__", "."))(instance) for field in self.fields
+            ]
+        # `isoformat()` keeps microseconds, which DjangoJSONEncoder would truncate
+        payload = json.dumps({"p": position, "r": int(reverse)}, default=lambda v: v.isoformat())
+        cursor = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Return the `(position, reverse)` pair carried by `?cursor=`, or `(None, False)`.
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def _keyset_filter(self, ordering, position):
+        """
+        Build the row-value comparison `(a, b, c) > (x, y, z)` as
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`.
+        """
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+
+            clause = Q(**{f"{name}__{lookup}": position[index]})
+            for prefix, value in zip(ordering[:index], position[:index]):
+                clause &= Q(**{prefix.lstrip("-"): value})
+            condition |= clause
+
+        return condition
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
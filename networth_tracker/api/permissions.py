@@ -6,7 +6,8 @@ class isOwnerOrSuperuser(permissions.BasePermission):
         if request.user.is_superuser:
             return True
 
-        return obj.user == request.user
+        # Compare ids so checking ownership does not load the owner
+        return obj.user_id == request.user.pk
 
 
 class onlyAdminCanDelete(permissions.BasePermission):
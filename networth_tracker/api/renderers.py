@@ -0,0 +1,96 @@
+# networth_tracker/api/renderers.py
+
+"""
+Fast JSON rendering and parsing, and MessagePack responses.
+
+`FastJSONRenderer` and `FastJSONParser` are drop-in replacements of DRF's
+`JSONRenderer` and `JSONParser` backed by orjson, which encodes and decodes
+several times faster than the standard library. Without orjson, or for the
+indented output of the browsable API, they fall back to DRF's own.
+
+The output is byte for byte DRF's: compact, unescaped UTF-8 with U+2028 and
+U+2029 escaped, and datetimes, `Decimal`s and lazy strings converted by DRF's
+`JSONEncoder`. The one difference is that non-finite floats render as `null`
+instead of raising.
+
+`MessagePackRenderer` (`Accept: application/msgpack` or `?format=msgpack`)
+serves the same data as MessagePack to internal clients when msgpack is
+installed, with datetimes and other values converted as in JSON.
+"""
+
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+# U+2028 and U+2029 in UTF-8, escaped by DRF so the output is valid JavaScript
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+_encoder = JSONEncoder()
+
+
+def _default(value):
+    """
+    Convert the values orjson and msgpack leave out (datetimes, `Decimal`,
+    lazy strings...) like DRF's `JSONEncoder`.
+    """
+
+    return _encoder.default(value)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+            content = content.replace(LINE_SEPARATOR, b"\\u2028")
+            content = content.replace(PARAGRAPH_SEPARATOR, b"\\u2029")
+        return content
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, datetime=False)
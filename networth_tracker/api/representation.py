@@ -0,0 +1,238 @@
+# networth_tracker/api/representation.py
+
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models
+from django.db.models import ExpressionWrapper, F
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose `to_representation` returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+)
+
+# Fields whose columns are read without the database backend's converters,
+# under the lookup with this suffix
+RAW_FIELDS = (serializers.DateField, serializers.DateTimeField)
+RAW_SUFFIX = "__raw"
+
+
+def _bind_field(field):
+    return field.to_representation
+
+
+def _bind_date(field):
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return date.isoformat
+
+
+def _is_utc(tz):
+    return tz is timezone.utc or getattr(tz, "key", None) == "UTC"
+
+
+def _make_aware(value, database_timezone):
+    if database_timezone is not None and isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=database_timezone)
+    return value
+
+
+def _bind_datetime(field):
+    """
+    Return `DateTimeField.to_representation` with the current timezone looked
+    up once instead of once per value.
+
+    Values are read without the backend's converters, so naive values are
+    taken to be in the database timezone as the converters would, and are
+    formatted as they are when both timezones are UTC.
+    """
+
+    database_timezone = connection.timezone
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return lambda value: field.to_representation(_make_aware(value, database_timezone))
+
+    utc = _is_utc(database_timezone) and _is_utc(field_timezone)
+
+    def _to_representation(value):
+        if not isinstance(value, datetime):
+            return field.to_representation(value)
+        if value.tzinfo is None:
+            if utc:
+                return value.isoformat() + "Z"
+            if database_timezone is None:
+                return field.to_representation(value)
+            value = value.replace(tzinfo=database_timezone)
+
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return _to_representation
+
+
+class ValuesRepresentation:
+    """
+    Builds the output of a `ModelSerializer` straight from `QuerySet.values()` rows.
+
+    The serializer's readable fields are compiled once into a map of output
+    name to `values()` lookup and converter, following nested serializers
+    through joins (`user__email`), so listing rows needs neither model
+    instances nor one query per nested object. Fields that return database
+    values unchanged are copied as is; all others go through the serializer
+    field's own `to_representation`, or an equivalent that only resolves the
+    output format and timezone once per list, so the output matches the
+    serializer. Date and datetime columns are read without the backend's
+    converters (on SQLite, `make_aware()` of every datetime), which
+    `_bind_datetime` replaces; rows must therefore come from `values()`.
+
+    `fields` and `expand` select a sparse fieldset of the output (see
+    `networth_tracker.api.fieldsets`), so only the columns of the requested
+    fields are looked up.
+    """
+
+    def __init__(self, serializer_class, fields=None, expand=()):
+        self.lookups = []
+        self.expressions = {}
+        serializer = serializer_class(context={"fields": fields, "expand": expand})
+        self.fields = self._compile(serializer, prefix="")
+        self.columns = [
+            lookup for lookup in self.lookups if lookup + RAW_SUFFIX not in self.expressions
+        ]
+
+    def _compile(self, serializer, prefix):
+        model = serializer.Meta.model
+        fields = []
+
+        for field in serializer._readable_fields:
+            if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{field.field_name} cannot be read from values()."
+                )
+            lookup = prefix + field.source.replace(".", "__")
+
+            if isinstance(field, serializers.ModelSerializer):
+                if model._meta.get_field(field.source).null:
+                    raise ImproperlyConfigured(
+                        f"{type(serializer).__name__}.{field.field_name} is a nullable relation."
+                    )
+                fields.append((field.field_name, None, self._compile(field, lookup + "__")))
+                continue
+
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                bind = None
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                bind = None
+            elif isinstance(field, serializers.DateTimeField):
+                bind = _bind_datetime
+            elif isinstance(field, serializers.DateField):
+                bind = _bind_date
+            elif isinstance(field, serializers.Field) and not isinstance(
+                field, (serializers.BaseSerializer, serializers.RelatedField)
+            ):
+                bind = _bind_field
+            else:
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{field.field_name} cannot be read from values()."
+                )
+
+            fields.append((field.field_name, self._read(field, lookup), (bind, field)))
+
+        return fields
+
+    def _read(self, field, lookup):
+        """
+        Read the column of `lookup` and return the key of its value in the rows.
+        """
+
+        self.lookups.append(lookup)
+        if not isinstance(field, RAW_FIELDS):
+            return lookup
+
+        key = lookup + RAW_SUFFIX
+        self.expressions[key] = ExpressionWrapper(F(lookup), output_field=models.Field())
+        return key
+
+    def _bind(self, fields):
+        """
+        Resolve the converters of the compiled fields for the current request.
+        """
+
+        bound = []
+        for name, lookup, converter in fields:
+            if lookup is None:
+                bound.append((name, None, self._bind(converter)))
+            else:
+                bind, field = converter
+                bound.append((name, lookup, None if bind is None else bind(field)))
+        return bound
+
+    def values(self, queryset, *extra):
+        """
+        Return the `values()` rows of `queryset` to represent, with the `extra`
+        lookups read as usual alongside.
+        """
+
+        return queryset.values(*dict.fromkeys([*self.columns, *extra]), **self.expressions)
+
+    def represent_many(self, rows):
+        fields = self._bind(self.fields)
+        return [_represent(row, fields) for row in rows]
+
+
+def _represent(row, fields):
+    data = {}
+    for name, lookup, converter in fields:
+        if lookup is None:
+            data[name] = _represent(row, converter)
+            continue
+
+        value = row[lookup]
+        data[name] = value if converter is None or value is None else converter(value)
+    return data
+
+
+# One representation per serializer and requested fieldset
+@lru_cache(maxsize=256)
+def get_representation(serializer_class, fields=None, expand=()):
+    return ValuesRepresentation(serializer_class, fields, expand)
+
+
+class ValuesListMixin:
+    """
+    Serves `list` from `values()` rows through `ValuesRepresentation` instead
+    of instantiating models and running the serializer on every row.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_list_response(queryset, self.get_serializer_class())
+
+    def get_values_representation(self, serializer_class):
+        return get_representation(serializer_class)
+
+    def values_list_response(self, queryset, serializer_class):
+        representation = self.get_values_representation(serializer_class)
+
+        # The cursor of the page is read from the ordering columns of its rows
+        ordering = []
+        get_ordering = getattr(self.paginator, "get_ordering", None)
+        if get_ordering is not None:
+            ordering = [field.lstrip("-") for field in get_ordering(self.request, queryset, self)]
+
+        queryset = representation.values(queryset, *ordering)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation.represent_many(page))
+
+        return Response(representation.represent_many(queryset))
@@ -0,0 +1,161 @@
+# networth_tracker/api/response_cache.py
+
+"""
+Per-user cache of the `list` and `retrieve` responses of the model viewsets.
+
+Entries are keyed by user, path, query parameters, renderer and the user's
+data version: a random token replaced whenever one of the user's rows is
+written (see networth_tracker/data_version.py). A write therefore invalidates
+every cached response of its user in `O(1)` without scanning keys, and the
+stale entries age out of the backend on their own.
+
+The cache is off unless `RESPONSE_CACHE_BACKEND` is set. The alias of a
+Django cache keeps the entries and versions in that cache, so every process
+sees the same entries and versions. `"local"` keeps the entries in a bounded
+LRU of each process and the versions in the default Django cache, which must
+be shared between processes for their writes to invalidate each other's
+entries: with the default per-process `LocMemCache` it is only correct for a
+single process.
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from networth_tracker.api.conditional import conditional_response
+from networth_tracker.cache import LRUCache
+from networth_tracker.data_version import LOCAL_BACKEND, get_data_version
+
+RESPONSE_KEY = "response:{user_id}:{version}:{digest}"
+
+_backend = None
+
+
+class SharedCacheBackend:
+    """
+    Adapts a Django cache to the `get`/`set` interface of `LRUCache`.
+    """
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.ttl)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class CacheStats:
+    """
+    Hit and miss counters of the response cache in this process.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def as_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+stats = CacheStats()
+
+
+def _get_backend():
+    """
+    Return the backend named by `RESPONSE_CACHE_BACKEND`, or None if disabled.
+    """
+
+    global _backend
+    name = getattr(settings, "RESPONSE_CACHE_BACKEND", None)
+    if name is None:
+        return None
+
+    if _backend is None:
+        ttl = getattr(settings, "RESPONSE_CACHE_TTL", 300)
+        if name == LOCAL_BACKEND:
+            _backend = LRUCache(getattr(settings, "RESPONSE_CACHE_SIZE", 10000), ttl)
+        else:
+            _backend = SharedCacheBackend(name, ttl)
+    return _backend
+
+
+def response_cache_key(request):
+    user_id = request.user.pk
+    representation = (
+        request.path,
+        sorted(request.query_params.lists()),
+        request.accepted_renderer.format,
+    )
+    return RESPONSE_KEY.format(
+        user_id=user_id,
+        version=get_data_version(user_id),
+        digest=hashlib.sha256(repr(representation).encode()).hexdigest(),
+    )
+
+
+class ResponseCacheMixin:
+    """
+    Serves the responses of `ConditionalGetMixin` from the response cache,
+    skipping both the validators query and the serialisation on a hit.
+
+    Must come before `ConditionalGetMixin` in the bases of a viewset. Only
+    successful responses are cached, after authentication, throttling and
+    object permissions passed for the same user. Superusers see the rows of
+    every user, whose writes do not bump their version, so they bypass the
+    cache. Responses carry `X-Cache: HIT` or `MISS`.
+    """
+
+    def validated_response(self, get_validators, get_response):
+        backend = _get_backend()
+        if backend is None or self.request.user.is_superuser:
+            return super().validated_response(get_validators, get_response)
+
+        key = response_cache_key(self.request)
+        entry = backend.get(key)
+        stats.record(hit=entry is not None)
+
+        if entry is not None:
+            validators, data = entry
+            response = conditional_response(self.request, validators, lambda: Response(data))
+            response["X-Cache"] = "HIT"
+            return response
+
+        validators = get_validators()
+
+        def _get_response():
+            response = get_response()
+            if response.status_code == status.HTTP_200_OK:
+                backend.set(key, (validators, response.data))
+            return response
+
+        response = conditional_response(self.request, validators, _get_response)
+        response["X-Cache"] = "MISS"
+        return response
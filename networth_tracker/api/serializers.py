@@ -1,5 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from networth_tracker.api.fieldsets import FieldsetSerializerMixin
+from networth_tracker.bulk import create_transactions
 from networth_tracker.models import (
     Account,
     BankAccount,
@@ -7,7 +10,9 @@ from networth_tracker.models import (
     Etf,
     EtfTransaction,
     Superannuation,
+    TransactionImport,
 )
+from networth_tracker.projection import PRESERVATION_AGE
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -23,13 +28,13 @@ class CustomUserSerializer(serializers.ModelSerializer):
         return CustomUser.objects.create_user(**validated_data)
 
 
-class AccountSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
+class AccountSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {"user": CustomUserSerializer}
 
     class Meta:
         model = Account
         fields = "__all__"
-        read_only_fields = ("id",)
+        read_only_fields = ("id", "user")
 
     def create(self, validated_data, **kwargs):
         user = self.context["request"].user
@@ -41,22 +46,22 @@ class AccountSerializer(serializers.ModelSerializer):
         return super(AccountSerializer, self).create(validated_data)
 
 
-class BankAccountSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
+class BankAccountSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {"user": CustomUserSerializer}
 
     class Meta:
         model = BankAccount
         fields = "__all__"
-        read_only_fields = ("id",)
+        read_only_fields = ("id", "user")
 
 
-class EtfSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
+class EtfSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {"user": CustomUserSerializer}
 
     class Meta:
         model = Etf
         fields = "__all__"
-        read_only_fields = ("id", "units_held", "average_cost")
+        read_only_fields = ("id", "user", "units_held", "average_cost", "units_bought")
 
     def validate_ticker(self, value):
         user = self.context["request"].user
@@ -65,27 +70,205 @@ class EtfSerializer(serializers.ModelSerializer):
         return value
 
 
+ETF_OWNERSHIP_ERROR = "Invalid ETF selection. You can only create transactions for ETFs you own."
+
+
+class OwnedEtfField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves ETFs from the `owned_etfs` context of a batch when it is set,
+    instead of running one query per row.
+    """
+
+    def to_internal_value(self, data):
+        owned_etfs = self.context.get("owned_etfs")
+        if owned_etfs is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        if pk not in owned_etfs:
+            raise serializers.ValidationError(ETF_OWNERSHIP_ERROR)
+        return owned_etfs[pk]
+
+
+class EtfTransactionListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of transactions, checking the ownership of every
+    referenced ETF in one query, and creates them with `bulk_create`.
+
+    Rows that pass validation are kept in `valid_rows` even when others fail,
+    so callers can choose to create them anyway.
+    """
+
+    def to_internal_value(self, data):
+        self.valid_rows = []
+
+        if isinstance(data, list):
+            pks = {
+                row["etf"]
+                for row in data
+                if isinstance(row, dict) and isinstance(row.get("etf"), (int, str))
+            }
+            pks = {int(pk) for pk in pks if str(pk).isdigit()}
+            user = self.context["request"].user
+            self.context["owned_etfs"] = Etf.objects.filter(pk__in=pks, user=user).in_bulk()
+
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        validated = super().run_child_validation(data)
+        self.valid_rows.append(validated)
+        return validated
+
+    def create(self, validated_data):
+        return create_transactions([EtfTransaction(**attrs) for attrs in validated_data])
+
+
 class EtfTransactionSerializer(serializers.ModelSerializer):
+    etf = OwnedEtfField(queryset=Etf.objects.all())
+
     class Meta:
         model = EtfTransaction
         fields = "__all__"
         read_only_fields = ("id",)
+        list_serializer_class = EtfTransactionListSerializer
 
     def validate_etf(self, value):
-        user = self.context["request"].user
+        if "owned_etfs" in self.context:
+            # Ownership was checked for the whole batch by `OwnedEtfField`
+            return value
 
-        if not Etf.objects.filter(pk=value.id, user=user).exists():
-            raise serializers.ValidationError(
-                "Invalid ETF selection. You can only create transactions for ETFs you own."
-            )
+        # The ETF was just loaded by the field, so no query is needed
+        if value.user_id != self.context["request"].user.pk:
+            raise serializers.ValidationError(ETF_OWNERSHIP_ERROR)
+
+        return value
+
+
+class TransactionImportSerializer(serializers.ModelSerializer):
+    """
+    Upload and status of a broker CSV import (see `networth_tracker.imports`).
+    """
+
+    file = serializers.FileField(write_only=True)
+    status = serializers.CharField(source="get_status_display", read_only=True)
+    progress = serializers.SerializerMethodField()
 
+    class Meta:
+        model = TransactionImport
+        fields = (
+            "id",
+            "file",
+            "file_name",
+            "date_format",
+            "status",
+            "progress",
+            "rows_read",
+            "rows_imported",
+            "rows_failed",
+            "errors",
+            "message",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = (
+            "id",
+            "file_name",
+            "rows_read",
+            "rows_imported",
+            "rows_failed",
+            "errors",
+            "message",
+            "created_at",
+            "updated_at",
+        )
+
+    def get_progress(self, obj):
+        """
+        Return the share of the file processed so far, between 0 and 1.
+        """
+
+        if obj.status == TransactionImport.COMPLETED:
+            return 1.0
+        if not obj.size:
+            return 0.0
+        return min(obj.bytes_read / obj.size, 1.0)
+
+    def validate_file(self, value):
+        max_size = getattr(settings, "TRANSACTION_IMPORT_MAX_SIZE", 50 * 1024 * 1024)
+        if value.size > max_size:
+            raise serializers.ValidationError(f"Files are limited to {max_size} bytes.")
         return value
 
 
-class SuperannuationSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
+class SuperannuationSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {"user": CustomUserSerializer}
 
     class Meta:
         model = Superannuation
         fields = "__all__"
-        read_only_fields = ("id",)
+        read_only_fields = ("id", "user")
+
+
+class ProjectionQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of `GET /superannuations/<pk>/projection`.
+    """
+
+    paths = serializers.IntegerField(default=10000, min_value=100)
+    volatility = serializers.FloatField(default=10.0, min_value=0, max_value=100)
+    retirement_age = serializers.IntegerField(default=PRESERVATION_AGE, min_value=1, max_value=120)
+    seed = serializers.IntegerField(default=0, min_value=0)
+
+    def validate_paths(self, value):
+        max_paths = getattr(settings, "SUPER_PROJECTION_MAX_PATHS", 200000)
+        if value > max_paths:
+            raise serializers.ValidationError(
+                f"Ensure this value is less than or equal to {max_paths}."
+            )
+        return value
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """
+    One sub-request of `POST /batch/`.
+    """
+
+    METHODS = ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+
+    method = serializers.CharField(default="GET")
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False, default=None)
+
+    def validate_method(self, value):
+        value = value.upper()
+        if value not in self.METHODS:
+            raise serializers.ValidationError(f"Unsupported method: {value}.")
+        return value
+
+    def validate_path(self, value):
+        if not value.startswith("/"):
+            raise serializers.ValidationError("Paths must be absolute, e.g. `/api/etfs/`.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Body of `POST /batch/`.
+    """
+
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        max_requests = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        if len(value) > max_requests:
+            raise serializers.ValidationError(
+                f"Ensure there are no more than {max_requests} requests."
+            )
+        return value
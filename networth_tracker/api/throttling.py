@@ -1,12 +1,90 @@
 # networth_tracker/api/throttling.py
 
+"""
+Per-user rate limits using the generic cell rate algorithm (GCRA).
+
+DRF's `SimpleRateThrottle` keeps the timestamp of every request of the
+window in the cache and loads, trims and rewrites the whole list on each
+request - up to 10,000 floats for `user_day`. GCRA only stores the
+theoretical arrival time (TAT) of the next request: every allowed request
+pushes it `duration / num_requests` further, and a request is rejected when
+that would put it more than `duration` ahead of now. Like the window of
+`SimpleRateThrottle`, this allows bursts of up to `num_requests`.
+
+The TAT is kept in integer microseconds and advanced with `cache.incr`, which
+is atomic in the cache backends that support it across processes, so
+concurrent requests cannot overwrite each other's update. Only resetting an
+idle bucket is a plain `set`, where concurrent requests can at worst go
+uncounted.
+"""
+
+import math
 
 from rest_framework.throttling import UserRateThrottle
 
+MICROSECONDS = 1_000_000
+
+
+class GCRAUserRateThrottle(UserRateThrottle):
+    """
+    Drop-in replacement for `UserRateThrottle` with constant-size state.
+    """
+
+    cache_format = "throttle_gcra_%(scope)s_%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = int(self.timer() * MICROSECONDS)
+        self.interval = self.duration * MICROSECONDS // self.num_requests
+        self.limit = self.duration * MICROSECONDS
+
+        tat = self._advance()
+        if tat - self.now > self.limit:
+            # Rejected requests do not consume capacity
+            self.cache.decr(self.key, self.interval)
+            self.wait_time = (tat - self.now - self.limit) / MICROSECONDS
+            return self.throttle_failure()
+
+        return self.throttle_success()
+
+    def _advance(self):
+        """
+        Push the TAT of the bucket one interval further and return it.
+        """
+
+        try:
+            tat = self.cache.incr(self.key, self.interval)
+        except ValueError:
+            tat = None
+
+        if tat is None or tat - self.interval < self.now:
+            # The bucket is new or idle, hence full again
+            tat = self.now + self.interval
+            self.cache.set(self.key, tat, self._timeout(tat))
+        else:
+            # `incr` keeps the expiry of the key, which must outlive the TAT
+            self.cache.touch(self.key, self._timeout(tat))
+        return tat
+
+    def _timeout(self, tat):
+        return math.ceil((tat - self.now) / MICROSECONDS)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return self.wait_time
+
 
-class MinuteRateThrottle(UserRateThrottle):
+class MinuteRateThrottle(GCRAUserRateThrottle):
     scope = "user_minute"
 
 
-class DailyRateThrottle(UserRateThrottle):
+class DailyRateThrottle(GCRAUserRateThrottle):
     scope = "user_day"
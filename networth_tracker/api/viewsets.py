@@ -1,28 +1,52 @@
 # networth_tracker/api/viewsets.py
 
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from networth_tracker.api.conditional import ConditionalGetMixin
+from networth_tracker.api.exports import ExportMixin
+from networth_tracker.api.fieldsets import FieldsetMixin
 from networth_tracker.api.filters import BankAccountFilterBackend, UserFilterBackend
 from networth_tracker.api.permissions import (
     isOwnerOrSuperuser,
     onlyAdminCanDelete,
     onlyOneAccountAllowed,
 )
+from networth_tracker.api.representation import ValuesListMixin
+from networth_tracker.api.response_cache import ResponseCacheMixin
 from networth_tracker.api.serializers import (
     AccountSerializer,
     BankAccountSerializer,
     EtfSerializer,
     EtfTransactionSerializer,
+    ProjectionQuerySerializer,
     SuperannuationSerializer,
+    TransactionImportSerializer,
 )
-from networth_tracker.models import Account, BankAccount, Etf, EtfTransaction, Superannuation
+from networth_tracker.imports import schedule_import
+from networth_tracker.models import (
+    Account,
+    BankAccount,
+    Etf,
+    EtfTransaction,
+    Superannuation,
+    TransactionImport,
+)
+from networth_tracker.parcels import open_position, realised_gains
+from networth_tracker.prices import normalise_ticker, prices_as_of
+from networth_tracker.projection import PERCENTILES, project
 
 
-class AccountViewSet(ModelViewSet):
+class AccountViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, FieldsetMixin, ValuesListMixin, ModelViewSet
+):
     """
     API endpoint for managing user-owned `Account`.
 
@@ -56,7 +80,14 @@ class AccountViewSet(ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class BankAccountViewSet(ModelViewSet):
+class BankAccountViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    FieldsetMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     """
     API endpoint for managing user-owned `BankAccount`.
 
@@ -71,10 +102,24 @@ class BankAccountViewSet(ModelViewSet):
         - Retrieve (GET /bank_accounts/<pk>): Retrieves a specific bank account by its ID.
         - Update (PUT /bank_accounts/<pk>): Updates an existing bank account for the user.
         - Delete (DELETE /bank_accounts/<pk>): Deletes a bank account owned by the user.
+
+    Export endpoint:
+
+        - GET /bank_accounts/export?format=csv|ndjson: Streams every bank account of the user as
+          CSV (default) or newline-delimited JSON (see `ExportMixin`).
     """
 
     queryset = BankAccount.objects.all()
     serializer_class = BankAccountSerializer
+    export_fields = (
+        "id",
+        "bank",
+        "account_name",
+        "balance",
+        "interest_rate",
+        "created_at",
+        "updated_at",
+    )
     permission_classes = [IsAuthenticated, isOwnerOrSuperuser]
     search_fields = ["bank", "account_name"]
     ordering_fields = ["bank", "account_name", "balance"]
@@ -89,7 +134,14 @@ class BankAccountViewSet(ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class EtfViewSet(ModelViewSet):
+class EtfViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    FieldsetMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     """
     API endpoint for managing user-owned `Etf`.
 
@@ -109,10 +161,31 @@ class EtfViewSet(ModelViewSet):
 
         - GET /etfs/<pk>/transactions: Retrieves all transactions associated with a specific ETF
             - Requires the ETF to belong to the authenticated user.
+
+    Gains endpoint:
+
+        - GET /etfs/<pk>/gains?price=<price>: Retrieves the realised gain and the open
+          parcels of an ETF, plus the unrealised gain at `price`, or at the latest
+          stored closing price when `price` is not given.
+
+    Export endpoint:
+
+        - GET /etfs/export?format=csv|ndjson: Streams every ETF of the user as CSV (default)
+          or newline-delimited JSON (see `ExportMixin`).
     """
 
     queryset = Etf.objects.all()
     serializer_class = EtfSerializer
+    export_fields = (
+        "id",
+        "ticker",
+        "fund_name",
+        "units_held",
+        "average_cost",
+        "units_bought",
+        "created_at",
+        "updated_at",
+    )
     permission_classes = [IsAuthenticated, isOwnerOrSuperuser]
     filter_backends = [UserFilterBackend]
 
@@ -126,11 +199,40 @@ class EtfViewSet(ModelViewSet):
         if pk:
             queryset = queryset.filter(etf=pk)
 
-        serializer = EtfTransactionSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
-
-class EtfTransactionViewSet(ModelViewSet):
+        return self.conditional_list_response(
+            queryset, lambda: self.values_list_response(queryset, EtfTransactionSerializer)
+        )
+
+    @action(detail=True, methods=["get"], url_path="gains")
+    def get_etf_gains(self, request, pk=None):
+        etf = self.get_object()
+
+        price = request.query_params.get("price")
+        if price is not None:
+            try:
+                price = float(price)
+            except ValueError:
+                raise ValidationError({"price": "A valid number is required."})
+        else:
+            latest = prices_as_of([etf.ticker], timezone.localdate()).get(
+                normalise_ticker(etf.ticker)
+            )
+            price = latest[1] if latest else None
+
+        units, cost_basis = open_position(etf.pk)
+        data = {
+            "etf": etf.pk,
+            "units": units,
+            "cost_basis": cost_basis,
+            "realised_gain": realised_gains([etf.pk]).get(etf.pk, 0.0),
+            "unrealised_gain": None if price is None else units * price - cost_basis,
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class EtfTransactionViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, ExportMixin, ValuesListMixin, ModelViewSet
+):
     """
     API endpoint for managing user-owned `EtfTransaction`.
 
@@ -142,22 +244,117 @@ class EtfTransactionViewSet(ModelViewSet):
     Actions:
 
         - List (GET /etf_transactions): Retrieves all transactions for the current user
-        - Create (POST /etf_transactions): Creates a new transaction for the current user
+        - Create (POST /etf_transactions): Creates a new transaction for the current user, or
+          a batch of transactions when the body is a JSON array (see `create`)
         - Retrieve (GET /etf_transactions/<pk>): Retrieves a specific transaction by its ID
         - Update (PUT /etf_transactions/<pk>): Updates an existing transaction for the current user
         - Delete (DELETE /etf_transactions/<pk>): Deletes a transaction owned by the current user
+
+    Import endpoints:
+
+        - POST /etf_transactions/import: Uploads a broker trade-history CSV (`file`, and an
+          optional strptime `date_format`) to be imported in the background. Rows are matched
+          to the user's ETFs by ticker.
+        - GET /etf_transactions/import/<id>: Retrieves the status and progress of an import.
+
+    Export endpoint:
+
+        - GET /etf_transactions/export?format=csv|ndjson: Streams every transaction of the
+          user, with the ETF ticker, as CSV (default) or newline-delimited JSON (see
+          `ExportMixin`).
     """
 
     queryset = EtfTransaction.objects.all()
     serializer_class = EtfTransactionSerializer
+    export_fields = (
+        "id",
+        "etf",
+        "etf__ticker",
+        "transaction_type",
+        "order_date",
+        "units",
+        "order_cost",
+        "brokerage",
+        "created_at",
+        "updated_at",
+    )
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         queryset = super().get_queryset()
         return queryset.filter(etf__user=self.request.user)
 
-
-class SuperannuationViewSet(ModelViewSet):
+    def create(self, request, *args, **kwargs):
+        """
+        Create a transaction, or a non-empty batch of up to `API_MAX_BULK_SIZE`
+        when the body is a JSON array.
+
+        A batch responds with `{"created": [...], "errors": [...]}`, where
+        `errors` holds one entry per row (empty for valid rows). Valid rows are
+        created even if others fail (207), unless `?atomic=true` is given, in
+        which case any invalid row rejects the whole batch (400).
+        """
+
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, "API_MAX_BULK_SIZE", 1000),
+        )
+        if serializer.is_valid():
+            created = serializer.save()
+            data = {"created": self.get_serializer(created, many=True).data, "errors": []}
+            return Response(data, status=status.HTTP_201_CREATED)
+
+        errors = serializer.errors
+        atomic = request.query_params.get("atomic", "").lower() in ("1", "true")
+        if atomic or not isinstance(errors, list) or not serializer.valid_rows:
+            return Response({"created": [], "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        created = serializer.create(serializer.valid_rows)
+        data = {"created": self.get_serializer(created, many=True).data, "errors": errors}
+        return Response(data, status=status.HTTP_207_MULTI_STATUS)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        serializer_class=TransactionImportSerializer,
+    )
+    def import_transactions(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data["file"]
+        transaction_import = serializer.save(
+            user=request.user, file_name=upload.name[:255], size=upload.size
+        )
+        schedule_import(transaction_import)
+
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"import/(?P<import_id>\d+)",
+        serializer_class=TransactionImportSerializer,
+    )
+    def get_import(self, request, import_id=None):
+        transaction_import = get_object_or_404(TransactionImport, pk=import_id, user=request.user)
+        return Response(self.get_serializer(transaction_import).data, status=status.HTTP_200_OK)
+
+
+class SuperannuationViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    FieldsetMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     """
     API endpoint for managing user-owned `Superannuation`.
 
@@ -173,12 +370,77 @@ class SuperannuationViewSet(ModelViewSet):
         - Retrieve (GET /superannuations/<pk>): Retrieves a specific superannuation by its ID
         - Update (PUT /superannuations/<pk>): Updates an existing superannuation for the user
         - Delete (DELETE /superannuations/<pk>): Deletes a superannuation owned by the current user
+
+    Projection endpoint:
+
+        - GET /superannuations/<pk>/projection: Retrieves Monte Carlo percentile bands of the
+          balance for every year until `retirement_age` (default 60), using the owner's
+          `Account.date_of_birth`. Accepts `paths`, `volatility` (%), `retirement_age`, `seed`.
+
+    Export endpoint:
+
+        - GET /superannuations/export?format=csv|ndjson: Streams every superannuation of the
+          user as CSV (default) or newline-delimited JSON (see `ExportMixin`).
     """
 
     queryset = Superannuation.objects.all()
     serializer_class = SuperannuationSerializer
+    export_fields = (
+        "id",
+        "provider",
+        "investment_plan",
+        "balance",
+        "market_returns",
+        "voluntary_contributions",
+        "created_at",
+        "updated_at",
+    )
     permission_classes = [IsAuthenticated, isOwnerOrSuperuser]
     filter_backends = [UserFilterBackend]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=True, methods=["get"], url_path="projection")
+    def get_projection(self, request, pk=None):
+        superannuation = self.get_object()
+
+        params = ProjectionQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        date_of_birth = (
+            Account.objects.filter(user_id=superannuation.user_id)
+            .values_list("date_of_birth", flat=True)
+            .first()
+        )
+        if date_of_birth is None:
+            raise ValidationError("An account with a date of birth is required for projections.")
+
+        today = timezone.localdate()
+        age = today.year - date_of_birth.year
+        age -= (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
+        years = max(params["retirement_age"] - age, 0)
+
+        percentiles = project(
+            superannuation.balance,
+            superannuation.market_returns / 100,
+            params["volatility"] / 100,
+            superannuation.voluntary_contributions,
+            years,
+            params["paths"],
+            params["seed"],
+        )
+
+        data = [
+            {
+                "year": today.year + offset,
+                "age": age + offset,
+                **{
+                    f"p{percentile}": band[offset]
+                    for percentile, band in zip(PERCENTILES, percentiles)
+                },
+            }
+            for offset in range(years + 1)
+        ]
+        return Response(data, status=status.HTTP_200_OK)
@@ -1,6 +1,27 @@
-from rest_framework import permissions, response, views
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import exceptions, permissions, response, views
 
 from .api import serializers as user_serializer
+from .networth import get_networth, networth_history
+from .prices import prices_as_of
+
+
+def _parse_date(request, name):
+    """
+    Return the `name` query parameter as a date, or None when it is absent.
+    """
+
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise exceptions.ValidationError({name: "Date has wrong format. Use YYYY-MM-DD."})
 
 
 class RegisterView(views.APIView):
@@ -12,3 +33,79 @@ class RegisterView(views.APIView):
         serializer.save()
 
         return response.Response(serializer.data)
+
+
+class NetWorthView(views.APIView):
+    """
+    Totals by asset class for the authenticated user: cash from `BankAccount`,
+    the cost basis of `Etf` holdings and `Superannuation` balances.
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        return response.Response(get_networth(request.user.pk))
+
+
+class NetWorthHistoryView(views.APIView):
+    """
+    Daily net worth snapshots of the authenticated user, downsampled for charts.
+
+    Query parameters:
+        - points: Maximum number of rows returned (default 200, at least 3).
+        - start, end: Optional inclusive date range as YYYY-MM-DD.
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+    default_points = 200
+
+    def get(self, request):
+        max_points = getattr(settings, "NETWORTH_HISTORY_MAX_POINTS", 2000)
+        points = request.query_params.get("points", self.default_points)
+        try:
+            points = int(points)
+        except ValueError:
+            raise exceptions.ValidationError({"points": "A valid integer is required."})
+        if not 3 <= points <= max_points:
+            raise exceptions.ValidationError(
+                {"points": f"Ensure this value is between 3 and {max_points}."}
+            )
+
+        start = _parse_date(request, "start")
+        end = _parse_date(request, "end")
+
+        return response.Response(networth_history(request.user.pk, points, start, end))
+
+
+class PriceView(views.APIView):
+    """
+    Latest closing price on or before a date for a set of tickers.
+
+    Query parameters:
+        - tickers: Comma separated tickers, e.g. `VAS,VGS`.
+        - date: Optional as-of date as YYYY-MM-DD (default today).
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+    max_tickers = 100
+
+    def get(self, request):
+        tickers = [
+            ticker for ticker in request.query_params.get("tickers", "").split(",") if ticker
+        ]
+        if not tickers:
+            raise exceptions.ValidationError({"tickers": "This query parameter is required."})
+        if len(tickers) > self.max_tickers:
+            raise exceptions.ValidationError(
+                {"tickers": f"Ensure there are no more than {self.max_tickers} tickers."}
+            )
+
+        date = _parse_date(request, "date") or timezone.localdate()
+
+        prices = prices_as_of(tickers, date)
+        return response.Response(
+            {
+                ticker: {"date": price_date, "close": close}
+                for ticker, (price_date, close) in prices.items()
+            }
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class NetworthTrackerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "networth_tracker"
+
+    def ready(self):
+        from networth_tracker import signals  # noqa: F401
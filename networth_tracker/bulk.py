@@ -0,0 +1,45 @@
+# networth_tracker/bulk.py
+
+"""
+Bulk creation of `EtfTransaction` rows.
+
+`bulk_create` sends no `post_save` signals, so the holdings, parcels, cached
+net worth and data version that the signal receivers keep in sync are updated
+here instead, once per ETF and user rather than once per row.
+"""
+
+from django.db import transaction
+
+from networth_tracker import holdings, parcels
+from networth_tracker.data_version import bump_data_version
+from networth_tracker.models import Etf, EtfTransaction
+from networth_tracker.networth import invalidate_networth
+
+
+def create_transactions(transactions, batch_size=None):
+    """
+    Insert unsaved transactions and bring their ETFs in sync in one database transaction.
+    """
+
+    if not transactions:
+        return []
+
+    with transaction.atomic():
+        created = EtfTransaction.objects.bulk_create(transactions, batch_size=batch_size)
+        holdings.record_transactions(created)
+
+        # Only the suffix from the earliest new transaction of an ETF needs re-matching
+        from_dates = {}
+        for created_transaction in created:
+            order_date = created_transaction.order_date
+            etf_id = created_transaction.etf_id
+            from_dates[etf_id] = min(from_dates.get(etf_id, order_date), order_date)
+        for etf_id, from_date in from_dates.items():
+            parcels.rematch(etf_id, from_date)
+
+        user_ids = Etf.objects.filter(pk__in=from_dates).values_list("user_id", flat=True)
+        for user_id in set(user_ids):
+            invalidate_networth(user_id)
+            bump_data_version(user_id)
+
+    return created
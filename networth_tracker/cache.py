@@ -0,0 +1,57 @@
+# networth_tracker/cache.py
+
+"""
+In-process caches for hot paths where even a round trip to the shared Django
+cache is too slow.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A thread-safe mapping bounded to `maxsize` entries, evicting the least
+    recently used one first, whose entries expire `ttl` seconds after being set.
+    """
+
+    def __init__(self, maxsize, ttl=None, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            expires, value = self._entries.get(key, (None, _MISSING))
+            if value is _MISSING:
+                return default
+            if expires is not None and expires <= self.timer():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,57 @@
+# networth_tracker/data_version.py
+
+"""
+Per-user data version: a random token replaced whenever one of the user's
+rows is written (see signals.py), which keys the cached API responses of the
+user (see networth_tracker/api/response_cache.py).
+
+The version is kept in the Django cache named by `RESPONSE_CACHE_BACKEND`,
+next to the responses it keys, so a write in one process invalidates the
+responses cached by every other. With the in-process `"local"` backend, or
+with the response cache off, it is kept in the default cache: the responses
+are then only invalidated across processes if that cache is shared (e.g.
+Redis or Memcached). With the default per-process `LocMemCache`, `"local"`
+is only correct for a single process.
+"""
+
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+VERSION_KEY = "data-version:{user_id}"
+
+LOCAL_BACKEND = "local"
+
+
+def _get_cache():
+    name = getattr(settings, "RESPONSE_CACHE_BACKEND", None)
+    return cache if name in (None, LOCAL_BACKEND) else caches[name]
+
+
+def get_data_version(user_id):
+    version_cache = _get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = version_cache.get(key)
+    if version is None:
+        # Never reuse a version, even after an eviction
+        version_cache.add(key, uuid.uuid4().hex, None)
+        version = version_cache.get(key)
+    return version
+
+
+def bump_data_version(user_id):
+    """
+    Invalidate every cached response of a user.
+
+    Like `invalidate_networth`, the version is dropped again once the
+    transaction commits, so a read racing the write cannot cache data from
+    before it under the new version.
+    """
+
+    version_cache = _get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version_cache.delete(key)
+    transaction.on_commit(partial(version_cache.delete, key))
@@ -0,0 +1,173 @@
+# networth_tracker/holdings.py
+
+"""
+Incremental position engine for `Etf.units_held` and `Etf.average_cost`.
+
+Every `EtfTransaction` contributes a fixed delta to its ETF: a buy adds its
+units to both `units_held` and `units_bought` and its cost (order cost plus
+brokerage) to the cost basis, a sell removes its units from `units_held`.
+`average_cost` is the cost basis divided by `units_bought`, so the deltas
+commute and creating, editing or deleting any transaction - back-dated or
+not - is a single `UPDATE` built from `F()` expressions instead of a replay.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Case, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from networth_tracker.models import Etf, EtfTransaction
+
+BUY = 0
+SELL = 1
+
+# Absolute difference tolerated between stored and replayed holdings
+DRIFT_TOLERANCE = 1e-6
+
+
+def transaction_delta(transaction_type, units, order_cost, brokerage):
+    """
+    Return the `(units_held, units_bought, cost)` delta a transaction contributes.
+    """
+
+    if transaction_type == BUY:
+        return units, units, order_cost + (brokerage or 0)
+    return -units, 0, 0
+
+
+def apply_delta(etf_id, units_held, units_bought, cost):
+    """
+    Atomically add a delta to the holdings of an ETF.
+
+    All right-hand sides of an `UPDATE` see the row as it was before the
+    statement, so the new average can be computed from the old average and
+    `units_bought` in the same statement without reading the row first.
+    """
+
+    if not (units_held or units_bought or cost):
+        return
+
+    old_cost_basis = F("average_cost") * F("units_bought")
+    Etf.objects.filter(pk=etf_id).update(
+        units_held=F("units_held") + units_held,
+        units_bought=F("units_bought") + units_bought,
+        average_cost=Case(
+            When(
+                units_bought__gt=-units_bought,
+                then=(old_cost_basis + cost) / (F("units_bought") + units_bought),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        # `update()` skips `auto_now`, which the conditional GET validators rely on
+        updated_at=timezone.now(),
+    )
+
+
+def record_transaction(transaction, previous=None):
+    """
+    Apply a created or updated transaction to its ETF.
+
+    `previous` holds the stored values of an updated transaction (see
+    `snapshot_transaction`) and is reverted in the same call; when both
+    versions belong to the same ETF the two deltas are merged into one update.
+    """
+
+    delta = transaction_delta(
+        transaction.transaction_type,
+        transaction.units,
+        transaction.order_cost,
+        transaction.brokerage,
+    )
+
+    if previous is None:
+        return apply_delta(transaction.etf_id, *delta)
+
+    reverted = transaction_delta(
+        previous["transaction_type"],
+        previous["units"],
+        previous["order_cost"],
+        previous["brokerage"],
+    )
+    if previous["etf_id"] == transaction.etf_id:
+        return apply_delta(transaction.etf_id, *(new - old for new, old in zip(delta, reverted)))
+
+    apply_delta(previous["etf_id"], *(-value for value in reverted))
+    apply_delta(transaction.etf_id, *delta)
+
+
+def record_transactions(transactions):
+    """
+    Apply many created transactions with one update per ETF.
+
+    The deltas commute, so the transactions of each ETF are summed first.
+    """
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    for transaction in transactions:
+        delta = transaction_delta(
+            transaction.transaction_type,
+            transaction.units,
+            transaction.order_cost,
+            transaction.brokerage,
+        )
+        totals[transaction.etf_id] = [
+            total + value for total, value in zip(totals[transaction.etf_id], delta)
+        ]
+
+    for etf_id, delta in totals.items():
+        apply_delta(etf_id, *delta)
+
+
+def revert_transaction(transaction):
+    """
+    Remove a deleted transaction from its ETF.
+    """
+
+    delta = transaction_delta(
+        transaction.transaction_type,
+        transaction.units,
+        transaction.order_cost,
+        transaction.brokerage,
+    )
+    apply_delta(transaction.etf_id, *(-value for value in delta))
+
+
+def snapshot_transaction(pk):
+    """
+    Return the stored values `record_transaction` needs to revert an update.
+    """
+
+    return (
+        EtfTransaction.objects.filter(pk=pk)
+        .values("etf_id", "transaction_type", "order_date", "units", "order_cost", "brokerage")
+        .first()
+    )
+
+
+def replay_holdings(etf_ids):
+    """
+    Recompute holdings from the full transaction history of the given ETFs.
+
+    Returns a mapping of ETF id to `(units_held, units_bought, average_cost)`
+    using one grouped query; ETFs without transactions map to zeros.
+    """
+
+    is_buy = Q(transaction_type=BUY)
+    totals = (
+        EtfTransaction.objects.filter(etf_id__in=etf_ids)
+        .values("etf_id")
+        .annotate(
+            bought=Coalesce(Sum("units", filter=is_buy), 0.0),
+            sold=Coalesce(Sum("units", filter=~is_buy), 0.0),
+            cost=Coalesce(Sum(F("order_cost") + Coalesce("brokerage", 0.0), filter=is_buy), 0.0),
+        )
+    )
+
+    holdings = {etf_id: (0.0, 0.0, 0.0) for etf_id in etf_ids}
+    for row in totals:
+        average_cost = row["cost"] / row["bought"] if row["bought"] > 0 else 0.0
+        holdings[row["etf_id"]] = (row["bought"] - row["sold"], row["bought"], average_cost)
+
+    return holdings
@@ -0,0 +1,280 @@
+# networth_tracker/imports.py
+
+"""
+Background import of broker trade-history CSV files.
+
+A file is streamed through a pipeline of generators - decode, normalise the
+columns, resolve tickers to `Etf` rows, validate - and the resulting
+transactions are written in fixed-size `bulk_create` chunks, so memory use
+does not depend on the size of the file. Progress is stored on the
+`TransactionImport` after every chunk for the status endpoint.
+"""
+
+import codecs
+import csv
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from networth_tracker.bulk import create_transactions
+from networth_tracker.holdings import BUY, SELL
+from networth_tracker.models import Etf, EtfTransaction, TransactionImport
+from networth_tracker.prices import normalise_ticker
+
+logger = logging.getLogger(__name__)
+
+# Accepted header names (lower case) of each column, across common brokers
+COLUMNS = {
+    "order_date": ("order_date", "date", "trade date", "order date", "transaction date"),
+    "ticker": ("ticker", "code", "symbol", "security", "instrument"),
+    "transaction_type": ("transaction_type", "type", "side", "action", "buy/sell"),
+    "units": ("units", "quantity", "qty", "volume"),
+    "order_cost": ("order_cost", "consideration", "value", "amount", "gross value"),
+    "price": ("price", "average price", "trade price"),
+    "brokerage": ("brokerage", "fee", "fees", "commission"),
+}
+REQUIRED_COLUMNS = ("order_date", "ticker", "transaction_type", "units")
+
+TRANSACTION_TYPES = {
+    "buy": BUY,
+    "b": BUY,
+    "bought": BUY,
+    "sell": SELL,
+    "s": SELL,
+    "sold": SELL,
+}
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d %b %Y")
+
+_executor = None
+
+
+class InvalidFileError(Exception):
+    """
+    Raised when a file cannot be imported at all, e.g. a required column is missing.
+    """
+
+
+def _decode(lines, progress):
+    """
+    Yield the lines of a binary file as text, counting the bytes read.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for line in lines:
+        progress["bytes_read"] += len(line)
+        yield decoder.decode(line)
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _normalise(lines):
+    """
+    Yield `(line_number, row)` with `row` keyed by the canonical column names.
+    """
+
+    reader = csv.reader(lines)
+    header = [column.strip().lower() for column in next(reader, [])]
+
+    indexes = {}
+    for name, aliases in COLUMNS.items():
+        index = next((header.index(alias) for alias in aliases if alias in header), None)
+        if index is not None:
+            indexes[name] = index
+
+    missing = [name for name in REQUIRED_COLUMNS if name not in indexes]
+    if missing:
+        raise InvalidFileError(f"Missing required columns: {', '.join(missing)}.")
+    if "order_cost" not in indexes and "price" not in indexes:
+        raise InvalidFileError("Missing required columns: order_cost or price.")
+
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        yield reader.line_num, {
+            name: row[index].strip() if index < len(row) else "" for name, index in indexes.items()
+        }
+
+
+def _resolve(rows, etfs):
+    """
+    Add the id of the user's `Etf` matching the ticker of each row, if any.
+    """
+
+    for line, row in rows:
+        row["etf_id"] = etfs.get(normalise_ticker(row["ticker"]))
+        yield line, row
+
+
+def _validate(rows, date_format):
+    """
+    Yield `(line_number, transaction, errors)` with either an unsaved
+    `EtfTransaction` or a mapping of column to error message.
+    """
+
+    formats = (date_format,) if date_format else DATE_FORMATS
+    for line, row in rows:
+        errors = {}
+
+        if row["etf_id"] is None:
+            errors["ticker"] = f"No ETF with ticker {row['ticker']!r}."
+
+        transaction_type = TRANSACTION_TYPES.get(row["transaction_type"].lower())
+        if transaction_type is None:
+            errors["transaction_type"] = "Expected buy or sell."
+
+        order_date = _parse_date(row["order_date"], formats)
+        if order_date is None:
+            errors["order_date"] = "Date has wrong format."
+
+        units = _parse_number(row["units"])
+        if units is None or units <= 0:
+            errors["units"] = "A positive number is required."
+
+        order_cost = _parse_number(row.get("order_cost", ""))
+        if order_cost is None and units is not None:
+            price = _parse_number(row.get("price", ""))
+            order_cost = None if price is None else abs(price * units)
+        if order_cost is None:
+            errors["order_cost"] = "A valid number is required."
+
+        brokerage = _parse_number(row.get("brokerage", "")) if row.get("brokerage") else None
+        if row.get("brokerage") and brokerage is None:
+            errors["brokerage"] = "A valid number is required."
+
+        if errors:
+            yield line, None, errors
+            continue
+
+        yield line, EtfTransaction(
+            etf_id=row["etf_id"],
+            transaction_type=transaction_type,
+            order_date=order_date,
+            units=units,
+            order_cost=abs(order_cost),
+            brokerage=None if brokerage is None else abs(brokerage),
+        ), None
+
+
+def _parse_date(value, formats):
+    for date_format in formats:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_number(value):
+    try:
+        return float(value.replace(",", "").replace("$", ""))
+    except ValueError:
+        return None
+
+
+def _track(rows, progress, errors, max_errors):
+    """
+    Yield the valid transactions of validated rows, counting rows and keeping
+    the first `max_errors` invalid ones in `errors`.
+    """
+
+    for line, etf_transaction, row_errors in rows:
+        progress["rows_read"] += 1
+        if row_errors is None:
+            yield etf_transaction
+            continue
+
+        progress["rows_failed"] += 1
+        if len(errors) < max_errors:
+            errors.append({"line": line, "errors": row_errors})
+
+
+def run_import(import_id):
+    """
+    Import a pending `TransactionImport`, recording its progress and outcome.
+    """
+
+    claimed = TransactionImport.objects.filter(
+        pk=import_id, status=TransactionImport.PENDING
+    ).update(status=TransactionImport.RUNNING)
+    if not claimed:
+        return
+
+    upload = TransactionImport.objects.get(pk=import_id)
+    chunk_size = getattr(settings, "TRANSACTION_IMPORT_CHUNK_SIZE", 1000)
+    max_errors = getattr(settings, "TRANSACTION_IMPORT_MAX_ERRORS", 100)
+    etfs = {
+        normalise_ticker(ticker): pk
+        for pk, ticker in Etf.objects.filter(user_id=upload.user_id).values_list("pk", "ticker")
+    }
+
+    progress = {"bytes_read": 0, "rows_read": 0, "rows_imported": 0, "rows_failed": 0}
+    errors = []
+
+    try:
+        with upload.file.open("rb") as csv_file:
+            lines = _decode(csv_file, progress)
+            rows = _validate(_resolve(_normalise(lines), etfs), upload.date_format)
+            transactions = _track(rows, progress, errors, max_errors)
+
+            while True:
+                chunk = list(islice(transactions, chunk_size))
+                if not chunk:
+                    break
+
+                create_transactions(chunk)
+                progress["rows_imported"] += len(chunk)
+                TransactionImport.objects.filter(pk=import_id).update(**progress, errors=errors)
+    except (InvalidFileError, UnicodeDecodeError, csv.Error) as error:
+        _finish(import_id, TransactionImport.FAILED, progress, errors, str(error))
+    except Exception:
+        logger.exception("Transaction import %s failed", import_id)
+        _finish(import_id, TransactionImport.FAILED, progress, errors, "Unexpected error.")
+    else:
+        _finish(import_id, TransactionImport.COMPLETED, progress, errors)
+    finally:
+        upload.file.delete(save=False)
+
+
+def _finish(import_id, status, progress, errors, message=""):
+    TransactionImport.objects.filter(pk=import_id).update(
+        status=status, file="", **progress, errors=errors, message=message
+    )
+
+
+def _run_in_thread(import_id):
+    try:
+        run_import(import_id)
+    finally:
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Imports write to the same tables, so run them one at a time
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transaction-import")
+    return _executor
+
+
+def schedule_import(upload):
+    """
+    Start importing `upload` once the transaction that created it commits.
+
+    Imports run on a background thread unless `TRANSACTION_IMPORT_ASYNC` is
+    off; pending imports left behind by a restart are picked up by the
+    `run_imports` management command.
+    """
+
+    def _start():
+        if getattr(settings, "TRANSACTION_IMPORT_ASYNC", True):
+            _get_executor().submit(_run_in_thread, upload.pk)
+        else:
+            run_import(upload.pk)
+
+    transaction.on_commit(_start)
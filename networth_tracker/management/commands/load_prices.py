@@ -0,0 +1,110 @@
+# networth_tracker/management/commands/load_prices.py
+
+import csv
+import datetime
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from networth_tracker.models import InstrumentPrice
+from networth_tracker.prices import normalise_ticker
+
+TICKER_COLUMNS = ("ticker", "symbol", "code")
+DATE_COLUMNS = ("date",)
+CLOSE_COLUMNS = ("close", "adj_close", "adj close", "price")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load end-of-day prices from CSV files into `InstrumentPrice`. Files are "
+        "streamed row by row and written in batches, so their size is not limited "
+        "by memory. Existing prices for the same ticker and date are overwritten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="CSV files with a header row.")
+        parser.add_argument(
+            "--ticker",
+            help="Ticker of every row, for files without a ticker/symbol/code column.",
+        )
+        parser.add_argument(
+            "--date-format",
+            default="%Y-%m-%d",
+            help="strptime format of the date column (default: %%Y-%%m-%%d).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50000,
+            help="Number of rows written per database transaction (default: 50000).",
+        )
+
+    def handle(self, *args, **options):
+        loaded = 0
+        for path in options["paths"]:
+            try:
+                with open(path, newline="", encoding="utf-8-sig") as csv_file:
+                    rows = self._parse(csv_file, path, options)
+                    loaded += self._load(rows, options["batch_size"])
+            except OSError as error:
+                raise CommandError(f"Could not read {path}: {error}")
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} prices."))
+
+    def _parse(self, csv_file, path, options):
+        """
+        Yield an unsaved `InstrumentPrice` per CSV row.
+        """
+
+        reader = csv.reader(csv_file)
+        header = [column.strip().lower() for column in next(reader, [])]
+
+        ticker_index = _column(header, TICKER_COLUMNS)
+        date_index = _column(header, DATE_COLUMNS)
+        close_index = _column(header, CLOSE_COLUMNS)
+        if date_index is None or close_index is None:
+            raise CommandError(f"{path}: a date and a close column are required.")
+        if ticker_index is None and not options["ticker"]:
+            raise CommandError(f"{path}: no ticker column, pass --ticker.")
+
+        fixed_ticker = normalise_ticker(options["ticker"]) if options["ticker"] else None
+        date_format = options["date_format"]
+
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            try:
+                yield InstrumentPrice(
+                    ticker=fixed_ticker or normalise_ticker(row[ticker_index]),
+                    date=datetime.datetime.strptime(row[date_index].strip(), date_format).date(),
+                    close=float(row[close_index]),
+                )
+            except (IndexError, ValueError) as error:
+                raise CommandError(f"{path}:{line}: invalid row {row!r} ({error}).")
+
+    def _load(self, prices, batch_size):
+        loaded = 0
+        while True:
+            batch = list(islice(prices, batch_size))
+            if not batch:
+                return loaded
+
+            # One row per key, as PostgreSQL refuses to upsert the same row twice
+            batch = list({(price.ticker, price.date): price for price in batch}.values())
+            with transaction.atomic():
+                InstrumentPrice.objects.bulk_create(
+                    batch,
+                    update_conflicts=True,
+                    unique_fields=["ticker", "date"],
+                    update_fields=["close"],
+                )
+            loaded += len(batch)
+            self.stdout.write(f"Loaded {loaded} prices...")
+
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
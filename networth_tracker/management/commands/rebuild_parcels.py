@@ -0,0 +1,28 @@
+# networth_tracker/management/commands/rebuild_parcels.py
+
+from django.core.management.base import BaseCommand
+
+from networth_tracker.models import Etf
+from networth_tracker.parcels import rematch
+
+
+class Command(BaseCommand):
+    help = "Rebuild the parcels and parcel disposals of every ETF from its transaction history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of ETF ids fetched per query (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        etf_ids = Etf.objects.order_by("pk").values_list("pk", flat=True)
+
+        rebuilt = 0
+        for etf_id in etf_ids.iterator(chunk_size=options["chunk_size"]):
+            rematch(etf_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt parcels for {rebuilt} ETFs."))
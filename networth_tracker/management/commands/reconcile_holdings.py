@@ -0,0 +1,95 @@
+# networth_tracker/management/commands/reconcile_holdings.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from networth_tracker.data_version import bump_data_version
+from networth_tracker.holdings import DRIFT_TOLERANCE, replay_holdings
+from networth_tracker.models import Etf
+from networth_tracker.networth import invalidate_networth
+
+# Columns of the ETFs read to check and fix their holdings
+ETF_COLUMNS = ("pk", "user", "ticker", "units_held", "units_bought", "average_cost")
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the transaction history of every ETF and report any drift from the "
+        "stored `units_held` / `average_cost`. Use --fix to overwrite drifted rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of ETFs replayed per query (default: 1000).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Write the replayed holdings back to drifted ETFs.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        checked = drifted = 0
+        last_pk = 0
+
+        while True:
+            # Keyset over the primary key so each chunk is an index range scan
+            etfs = list(
+                Etf.objects.filter(pk__gt=last_pk).order_by("pk").only(*ETF_COLUMNS)[:chunk_size]
+            )
+            if not etfs:
+                break
+            last_pk = etfs[-1].pk
+
+            replayed = replay_holdings([etf.pk for etf in etfs])
+            stale = []
+            for etf in etfs:
+                units_held, units_bought, average_cost = replayed[etf.pk]
+                if _drifted(etf, units_held, units_bought, average_cost):
+                    self.stdout.write(
+                        f"Drift on ETF {etf.pk} ({etf.ticker}): "
+                        f"units_held {etf.units_held} != {units_held}, "
+                        f"average_cost {etf.average_cost} != {average_cost}"
+                    )
+                    stale.append(etf)
+
+            if stale and options["fix"]:
+                self._fix(stale)
+
+            checked += len(etfs)
+            drifted += len(stale)
+
+        action = "fixed" if options["fix"] else "found"
+        style = self.style.SUCCESS if not drifted or options["fix"] else self.style.WARNING
+        self.stdout.write(style(f"Checked {checked} ETFs, {action} {drifted} with drift."))
+
+    def _fix(self, etfs):
+        pks = [etf.pk for etf in etfs]
+
+        with transaction.atomic():
+            # Lock the rows and replay again so transactions posted since the
+            # first replay are not overwritten
+            list(Etf.objects.select_for_update().filter(pk__in=pks).values_list("pk"))
+            replayed = replay_holdings(pks)
+
+            now = timezone.now()
+            for etf in etfs:
+                etf.units_held, etf.units_bought, etf.average_cost = replayed[etf.pk]
+                etf.updated_at = now
+            Etf.objects.bulk_update(
+                etfs, ["units_held", "units_bought", "average_cost", "updated_at"]
+            )
+            for user_id in {etf.user_id for etf in etfs}:
+                bump_data_version(user_id)
+                invalidate_networth(user_id)
+
+
+def _drifted(etf, units_held, units_bought, average_cost):
+    stored = (etf.units_held, etf.units_bought, etf.average_cost)
+    replayed = (units_held, units_bought, average_cost)
+    return any(abs(old - new) > DRIFT_TOLERANCE for old, new in zip(stored, replayed))
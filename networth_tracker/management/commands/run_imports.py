@@ -0,0 +1,34 @@
+# networth_tracker/management/commands/run_imports.py
+
+from django.core.management.base import BaseCommand
+
+from networth_tracker.imports import run_import
+from networth_tracker.models import TransactionImport
+
+
+class Command(BaseCommand):
+    help = (
+        "Run pending broker CSV imports, e.g. those left behind when the web "
+        "process restarted before its background thread picked them up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--include-running",
+            action="store_true",
+            help="Also restart imports marked as running, after a crash. Rows already "
+            "imported by them are imported again.",
+        )
+
+    def handle(self, *args, **options):
+        if options["include_running"]:
+            TransactionImport.objects.filter(status=TransactionImport.RUNNING).update(
+                status=TransactionImport.PENDING
+            )
+
+        pending = TransactionImport.objects.filter(status=TransactionImport.PENDING)
+        import_ids = list(pending.order_by("pk").values_list("pk", flat=True))
+        for import_id in import_ids:
+            run_import(import_id)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {len(import_ids)} imports."))
@@ -0,0 +1,72 @@
+# networth_tracker/management/commands/snapshot_networth.py
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from networth_tracker.models import CustomUser, NetWorthSnapshot
+from networth_tracker.networth import compute_networth_many
+
+SNAPSHOT_FIELDS = ["cash", "etfs", "superannuation", "total", "updated_at"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the net worth of every user for a day in `NetWorthSnapshot`. "
+        "Rerunning for the same day overwrites that day's snapshots."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Day of the snapshot as YYYY-MM-DD (default: today).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of users aggregated and written per batch (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                date = datetime.date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+        else:
+            date = timezone.localdate()
+
+        chunk_size = options["chunk_size"]
+        user_ids = CustomUser.objects.order_by("pk").values_list("pk", flat=True)
+
+        written = 0
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=chunk_size):
+            batch.append(user_id)
+            if len(batch) == chunk_size:
+                written += self._snapshot(batch, date)
+                batch = []
+        if batch:
+            written += self._snapshot(batch, date)
+
+        self.stdout.write(self.style.SUCCESS(f"Stored {written} snapshots for {date}."))
+
+    def _snapshot(self, user_ids, date):
+        totals = compute_networth_many(user_ids)
+        snapshots = [
+            NetWorthSnapshot(user_id=user_id, date=date, **user_totals)
+            for user_id, user_totals in totals.items()
+        ]
+
+        with transaction.atomic():
+            NetWorthSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=["user", "date"],
+                update_fields=SNAPSHOT_FIELDS,
+            )
+
+        return len(snapshots)
@@ -0,0 +1,46 @@
+# networth_tracker/management/commands/value_holdings.py
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from networth_tracker.valuation import load_holdings, store_valuations, value_holdings
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark every ETF holding to market with the latest stored prices and "
+        "store the totals per user in `PortfolioValuation`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="As-of date of the prices as YYYY-MM-DD (default: today).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of valuations written per INSERT (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                date = datetime.date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+        else:
+            date = timezone.localdate()
+
+        valuations = value_holdings(load_holdings(), date)
+        with transaction.atomic():
+            stored = store_valuations(valuations, date, batch_size=options["batch_size"])
+
+        valued = len(valuations["etf_id"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Valued {valued} holdings, stored {stored} valuations for {date}.")
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:51
+
+from django.db import migrations, models
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_holdings(apps, schema_editor):
+    Etf = apps.get_model("networth_tracker", "Etf")
+    EtfTransaction = apps.get_model("networth_tracker", "EtfTransaction")
+
+    is_buy = Q(transaction_type=0)
+    totals = (
+        EtfTransaction.objects.values("etf_id")
+        .annotate(
+            bought=Coalesce(Sum("units", filter=is_buy), 0.0),
+            sold=Coalesce(Sum("units", filter=~is_buy), 0.0),
+            cost=Coalesce(Sum(F("order_cost") + Coalesce("brokerage", 0.0), filter=is_buy), 0.0),
+        )
+        .iterator(chunk_size=2000)
+    )
+
+    etfs = []
+    for row in totals:
+        etfs.append(
+            Etf(
+                pk=row["etf_id"],
+                units_held=row["bought"] - row["sold"],
+                units_bought=row["bought"],
+                average_cost=row["cost"] / row["bought"] if row["bought"] > 0 else 0.0,
+            )
+        )
+        if len(etfs) == 2000:
+            Etf.objects.bulk_update(etfs, ["units_held", "units_bought", "average_cost"])
+            etfs = []
+
+    Etf.objects.bulk_update(etfs, ["units_held", "units_bought", "average_cost"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("networth_tracker", "0007_superannuation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="etf",
+            name="units_bought",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_holdings, migrations.RunPython.noop),
+    ]
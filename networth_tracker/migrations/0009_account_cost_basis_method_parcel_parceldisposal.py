@@ -0,0 +1,186 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:53
+
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BUY = 0
+
+# Units below this are treated as fully consumed to absorb float rounding
+EPSILON = 1e-9
+
+
+def _match_fifo(Parcel, ParcelDisposal, etf_id, transactions):
+    """
+    Return the parcels and disposals of one ETF's transactions, in date order.
+
+    `cost_basis_method` is added here with FIFO as the default, so every sell
+    consumes the oldest parcels acquired on or before its order date, as
+    `networth_tracker.parcels.rematch` would.
+    """
+
+    parcels, disposals, open_parcels = [], [], deque()
+    for _, day in groupby(transactions, key=itemgetter("order_date")):
+        day = list(day)
+        for buy in day:
+            if buy["transaction_type"] == BUY and buy["units"] > 0:
+                parcel = Parcel(
+                    etf_id=etf_id,
+                    transaction_id=buy["id"],
+                    acquired_date=buy["order_date"],
+                    units=buy["units"],
+                    unit_cost=(buy["order_cost"] + (buy["brokerage"] or 0)) / buy["units"],
+                    units_remaining=buy["units"],
+                )
+                parcels.append(parcel)
+                open_parcels.append(parcel)
+
+        for sale in day:
+            if sale["transaction_type"] == BUY or sale["units"] <= 0:
+                continue
+
+            remaining = sale["units"]
+            proceeds_per_unit = (sale["order_cost"] - (sale["brokerage"] or 0)) / sale["units"]
+            while remaining > EPSILON and open_parcels:
+                parcel = open_parcels[0]
+                units = min(remaining, parcel.units_remaining)
+
+                parcel.units_remaining -= units
+                remaining -= units
+                if parcel.units_remaining <= EPSILON:
+                    parcel.units_remaining = 0.0
+                    open_parcels.popleft()
+
+                disposals.append(
+                    ParcelDisposal(
+                        etf_id=etf_id,
+                        parcel=parcel,
+                        sale_id=sale["id"],
+                        disposed_date=sale["order_date"],
+                        units=units,
+                        cost_basis=units * parcel.unit_cost,
+                        proceeds=units * proceeds_per_unit,
+                    )
+                )
+
+    return parcels, disposals
+
+
+def backfill_parcels(apps, schema_editor):
+    EtfTransaction = apps.get_model("networth_tracker", "EtfTransaction")
+    Parcel = apps.get_model("networth_tracker", "Parcel")
+    ParcelDisposal = apps.get_model("networth_tracker", "ParcelDisposal")
+
+    transactions = (
+        EtfTransaction.objects.order_by("etf_id", "order_date", "id")
+        .values(
+            "id", "etf_id", "transaction_type", "order_date", "units", "order_cost", "brokerage"
+        )
+        .iterator(chunk_size=2000)
+    )
+    for etf_id, rows in groupby(transactions, key=itemgetter("etf_id")):
+        parcels, disposals = _match_fifo(Parcel, ParcelDisposal, etf_id, rows)
+        # Saved first so the disposals can reference their primary keys
+        Parcel.objects.bulk_create(parcels, batch_size=2000)
+        ParcelDisposal.objects.bulk_create(disposals, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [("networth_tracker", "0008_etf_units_bought")]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="cost_basis_method",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "FIFO"), (1, "LIFO"), (2, "Highest cost")], default=0
+            ),
+        ),
+        migrations.CreateModel(
+            name="Parcel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("acquired_date", models.DateField()),
+                ("units", models.FloatField()),
+                ("unit_cost", models.FloatField()),
+                ("units_remaining", models.FloatField()),
+                (
+                    "etf",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="networth_tracker.etf"
+                    ),
+                ),
+                (
+                    "transaction",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="networth_tracker.etftransaction",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ParcelDisposal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("disposed_date", models.DateField()),
+                ("units", models.FloatField()),
+                ("cost_basis", models.FloatField()),
+                ("proceeds", models.FloatField()),
+                (
+                    "etf",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="networth_tracker.etf"
+                    ),
+                ),
+                (
+                    "parcel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="disposals",
+                        to="networth_tracker.parcel",
+                    ),
+                ),
+                (
+                    "sale",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="disposals",
+                        to="networth_tracker.etftransaction",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="parcel",
+            index=models.Index(
+                fields=["etf", "acquired_date"], name="networth_tr_etf_id_b3cca8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="parcel",
+            index=models.Index(
+                fields=["etf", "units_remaining"], name="networth_tr_etf_id_157ce7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="parceldisposal",
+            index=models.Index(
+                fields=["etf", "disposed_date"], name="networth_tr_etf_id_8429a6_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_parcels, migrations.RunPython.noop),
+    ]
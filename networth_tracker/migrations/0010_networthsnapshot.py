@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("networth_tracker", "0009_account_cost_basis_method_parcel_parceldisposal"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NetWorthSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="created at")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="updated at")),
+                ("date", models.DateField()),
+                ("cash", models.FloatField()),
+                ("etfs", models.FloatField()),
+                ("superannuation", models.FloatField()),
+                ("total", models.FloatField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "date")},
+            },
+        ),
+    ]
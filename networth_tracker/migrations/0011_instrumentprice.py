@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("networth_tracker", "0010_networthsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstrumentPrice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("ticker", models.CharField(max_length=100)),
+                ("date", models.DateField()),
+                ("close", models.FloatField()),
+            ],
+            options={
+                "unique_together": {("ticker", "date")},
+            },
+        ),
+    ]
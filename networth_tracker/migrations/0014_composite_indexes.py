@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("networth_tracker", "0013_transactionimport"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bankaccount",
+            index=models.Index(
+                fields=["user", "created_at"], name="networth_tr_user_id_79623b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="etf",
+            index=models.Index(
+                fields=["user", "created_at"], name="networth_tr_user_id_790d2d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="etf",
+            index=models.Index(fields=["user", "ticker"], name="networth_tr_user_id_cc1a9a_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="etftransaction",
+            index=models.Index(fields=["etf", "order_date"], name="networth_tr_etf_id_9271af_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="etftransaction",
+            index=models.Index(
+                fields=["etf", "transaction_type"], name="networth_tr_etf_id_e52222_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="superannuation",
+            index=models.Index(
+                fields=["user", "created_at"], name="networth_tr_user_id_e06c6d_idx"
+            ),
+        ),
+    ]
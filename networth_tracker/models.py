@@ -2,7 +2,7 @@
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from .managers import CustomUserManager
@@ -64,6 +64,9 @@ class Account(Timestamp):
     short_term_tax_rate = models.FloatField(validators=PERCENTAGE_VALIDATOR)
     long_term_tax_rate = models.FloatField(validators=PERCENTAGE_VALIDATOR)
 
+    COST_BASIS_METHODS = ((0, "FIFO"), (1, "LIFO"), (2, "Highest cost"))
+    cost_basis_method = models.PositiveSmallIntegerField(choices=COST_BASIS_METHODS, default=0)
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -82,6 +85,11 @@ class BankAccount(Timestamp):
     def __str__(self):
         return f"{self.bank} - {self.account_name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
 
 class Etf(Timestamp):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
@@ -90,10 +98,18 @@ class Etf(Timestamp):
     fund_name = models.CharField(max_length=100)
     units_held = models.FloatField()
     average_cost = models.FloatField()
+    # Total units ever bought; the denominator of `average_cost` (see holdings.py)
+    units_bought = models.FloatField(default=0)
 
     def __str__(self):
         return f"{self.fund_name} - {self.ticker}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["user", "ticker"]),
+        ]
+
 
 class EtfTransaction(Timestamp):
     etf = models.ForeignKey(Etf, on_delete=models.CASCADE)
@@ -108,6 +124,18 @@ class EtfTransaction(Timestamp):
     def __str__(self):
         return f"{self.etf} - {self.units} - {self.order_cost} - {self.transaction_type}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["etf", "order_date"]),
+            models.Index(fields=["etf", "transaction_type"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Keep the row and the `Etf` holdings update applied by the `post_save`
+        # receiver in the same database transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Superannuation(Timestamp):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
@@ -120,3 +148,149 @@ class Superannuation(Timestamp):
 
     def __str__(self):
         return f"{self.provider} - {self.investment_plan} - {self.user}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
+
+class NetWorthSnapshot(Timestamp):
+    """
+    Totals by asset class of a user at the end of a day (see `snapshot_networth`).
+    """
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+
+    date = models.DateField()
+    cash = models.FloatField()
+    etfs = models.FloatField()
+    superannuation = models.FloatField()
+    total = models.FloatField()
+
+    def __str__(self):
+        return f"{self.user} - {self.date} - {self.total}"
+
+    class Meta:
+        unique_together = ("user", "date")
+
+
+class PortfolioValuation(Timestamp):
+    """
+    Mark-to-market value of the ETF holdings of a user on a day (see `value_holdings`).
+    """
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+
+    date = models.DateField()
+    market_value = models.FloatField()
+    cost_basis = models.FloatField()
+    unrealised_pnl = models.FloatField()
+
+    def __str__(self):
+        return f"{self.user} - {self.date} - {self.market_value}"
+
+    class Meta:
+        unique_together = ("user", "date")
+
+
+class InstrumentPrice(models.Model):
+    """
+    End-of-day closing price of a listed instrument, loaded by `load_prices`.
+    """
+
+    ticker = models.CharField(max_length=100)
+    date = models.DateField()
+    close = models.FloatField()
+
+    def __str__(self):
+        return f"{self.ticker} - {self.date} - {self.close}"
+
+    class Meta:
+        # Also the index behind the as-of lookups in prices.py
+        unique_together = ("ticker", "date")
+
+
+class Parcel(models.Model):
+    """
+    An open or closed lot of units acquired by a buy `EtfTransaction`.
+
+    Parcels and their disposals are derived from the transaction history by
+    `networth_tracker.parcels` and should not be edited directly.
+    """
+
+    etf = models.ForeignKey(Etf, on_delete=models.CASCADE)
+    transaction = models.OneToOneField(EtfTransaction, on_delete=models.CASCADE)
+
+    acquired_date = models.DateField()
+    units = models.FloatField()
+    unit_cost = models.FloatField()
+    units_remaining = models.FloatField()
+
+    def __str__(self):
+        return f"{self.etf} - {self.acquired_date} - {self.units_remaining}/{self.units}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["etf", "acquired_date"]),
+            models.Index(fields=["etf", "units_remaining"]),
+        ]
+
+
+class ParcelDisposal(models.Model):
+    """
+    Units of a `Parcel` consumed by a sell `EtfTransaction`.
+    """
+
+    etf = models.ForeignKey(Etf, on_delete=models.CASCADE)
+    parcel = models.ForeignKey(Parcel, on_delete=models.CASCADE, related_name="disposals")
+    sale = models.ForeignKey(EtfTransaction, on_delete=models.CASCADE, related_name="disposals")
+
+    disposed_date = models.DateField()
+    units = models.FloatField()
+    cost_basis = models.FloatField()
+    proceeds = models.FloatField()
+
+    def __str__(self):
+        return f"{self.parcel} - {self.disposed_date} - {self.units}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["etf", "disposed_date"]),
+        ]
+
+
+class TransactionImport(Timestamp):
+    """
+    A broker trade-history CSV uploaded to `POST /api/etf_transactions/import/`
+    and imported in the background by `networth_tracker.imports`.
+    """
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+
+    PENDING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
+    STATUSES = (
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (COMPLETED, "Completed"),
+        (FAILED, "Failed"),
+    )
+    status = models.PositiveSmallIntegerField(choices=STATUSES, default=PENDING)
+
+    file = models.FileField(upload_to="imports/")
+    file_name = models.CharField(max_length=255, blank=True)
+    date_format = models.CharField(max_length=50, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    bytes_read = models.PositiveBigIntegerField(default=0)
+    rows_read = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    # The first invalid rows as `{"line": ..., "errors": ...}`
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.file_name} - {self.get_status_display()}"
@@ -0,0 +1,142 @@
+# networth_tracker/networth.py
+
+"""
+Per-user net worth totals, cached until one of the underlying rows changes.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from networth_tracker.models import BankAccount, CustomUser, Etf, NetWorthSnapshot, Superannuation
+from networth_tracker.timeseries import lttb_indices
+
+CACHE_KEY = "networth:{user_id}"
+
+SNAPSHOT_SERIES = ("cash", "etfs", "superannuation", "total")
+
+
+def _total(queryset, expression):
+    """
+    Return a correlated scalar subquery summing `expression` over the user's rows.
+    """
+
+    return Coalesce(
+        Subquery(
+            queryset.filter(user=OuterRef("pk"))
+            .order_by()
+            .values("user")
+            .annotate(total=Sum(expression))
+            .values("total"),
+            output_field=FloatField(),
+        ),
+        Value(0.0),
+    )
+
+
+def compute_networth(user_id):
+    """
+    Return the totals by asset class of a user in a single query.
+    """
+
+    # Annotation names must not clash with the reverse relations of `CustomUser`
+    row = (
+        CustomUser.objects.filter(pk=user_id)
+        .annotate(
+            cash_total=_total(BankAccount.objects, "balance"),
+            etfs_total=_total(Etf.objects, F("units_held") * F("average_cost")),
+            superannuation_total=_total(Superannuation.objects, "balance"),
+        )
+        .values_list("cash_total", "etfs_total", "superannuation_total")
+        .first()
+    ) or (0.0, 0.0, 0.0)
+
+    totals = dict(zip(("cash", "etfs", "superannuation"), row))
+    totals["total"] = sum(row)
+    return totals
+
+
+def compute_networth_many(user_ids):
+    """
+    Return a mapping of user id to totals for many users with one grouped
+    query per asset class, for batch jobs where per-user queries are too slow.
+    """
+
+    totals = {user_id: {"cash": 0.0, "etfs": 0.0, "superannuation": 0.0} for user_id in user_ids}
+    sources = (
+        ("cash", BankAccount.objects, F("balance")),
+        ("etfs", Etf.objects, F("units_held") * F("average_cost")),
+        ("superannuation", Superannuation.objects, F("balance")),
+    )
+
+    for name, queryset, expression in sources:
+        rows = (
+            queryset.filter(user_id__in=user_ids)
+            .order_by()
+            .values("user_id")
+            .annotate(total=Sum(expression))
+            .values_list("user_id", "total")
+        )
+        for user_id, total in rows:
+            totals[user_id][name] = total or 0.0
+
+    for user_totals in totals.values():
+        user_totals["total"] = sum(user_totals.values())
+
+    return totals
+
+
+def get_networth(user_id):
+    """
+    Return the cached totals of a user, computing them on a miss.
+    """
+
+    key = CACHE_KEY.format(user_id=user_id)
+    totals = cache.get(key)
+    if totals is None:
+        totals = compute_networth(user_id)
+        cache.set(key, totals, getattr(settings, "NETWORTH_CACHE_TIMEOUT", 3600))
+    return totals
+
+
+def invalidate_networth(user_id):
+    """
+    Drop the cached totals of a user.
+
+    The key is dropped straight away and again once the surrounding transaction
+    commits, so a read racing the write cannot cache totals from before it.
+    """
+
+    key = CACHE_KEY.format(user_id=user_id)
+    cache.delete(key)
+    transaction.on_commit(partial(cache.delete, key))
+
+
+def networth_history(user_id, points, start=None, end=None):
+    """
+    Return the daily snapshots of a user downsampled to at most `points` rows.
+
+    The points are picked by LTTB on the `total` series and the same dates are
+    kept for every other series so they stay aligned on the chart.
+    """
+
+    snapshots = NetWorthSnapshot.objects.filter(user_id=user_id)
+    if start is not None:
+        snapshots = snapshots.filter(date__gte=start)
+    if end is not None:
+        snapshots = snapshots.filter(date__lte=end)
+
+    rows = list(snapshots.order_by("date").values_list("date", *SNAPSHOT_SERIES))
+    if not rows:
+        return []
+
+    dates = [row[0].toordinal() for row in rows]
+    totals = [row[-1] for row in rows]
+    return [
+        dict(zip(("date",) + SNAPSHOT_SERIES, rows[index]))
+        for index in lttb_indices(dates, totals, points)
+    ]
@@ -0,0 +1,243 @@
+# networth_tracker/parcels.py
+
+"""
+Parcel (lot) cost-basis store.
+
+Every buy `EtfTransaction` opens a `Parcel`; every sell consumes units from
+the open parcels acquired on or before its order date, in the order given by
+the owner's `Account.cost_basis_method`, recording a `ParcelDisposal` per
+parcel touched.
+
+How a sell is matched only depends on the transactions dated on or before it,
+so when a transaction dated `D` changes, only the suffix of the history from
+`D` onwards is re-matched: disposals from `D` are dropped and their units
+handed back to the earlier parcels, parcels from `D` are rebuilt, and the
+sells from `D` are matched again.
+"""
+
+import heapq
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+from networth_tracker.holdings import BUY, SELL
+from networth_tracker.models import Account, Etf, EtfTransaction, Parcel, ParcelDisposal
+
+FIFO = 0
+LIFO = 1
+HIGHEST_COST = 2
+
+# Units below this are treated as fully consumed to absorb float rounding
+EPSILON = 1e-9
+
+
+def _fifo_key(parcel):
+    return (parcel.acquired_date.toordinal(), parcel.transaction_id)
+
+
+def _lifo_key(parcel):
+    return (-parcel.acquired_date.toordinal(), -parcel.transaction_id)
+
+
+def _highest_cost_key(parcel):
+    return (-parcel.unit_cost, parcel.acquired_date.toordinal(), parcel.transaction_id)
+
+
+MATCHING_KEYS = {
+    FIFO: _fifo_key,
+    LIFO: _lifo_key,
+    HIGHEST_COST: _highest_cost_key,
+}
+
+
+def rematch(etf_id, from_date=None):
+    """
+    Re-match the parcels of an ETF for transactions dated on or after `from_date`.
+
+    Without `from_date` the whole history of the ETF is rebuilt.
+    """
+
+    with transaction.atomic():
+        # Serialise concurrent re-matches of the same ETF
+        user_id = (
+            Etf.objects.select_for_update().filter(pk=etf_id).values_list("user_id", flat=True)
+        ).first()
+        if user_id is None:
+            return
+
+        method = (
+            Account.objects.filter(user_id=user_id)
+            .values_list("cost_basis_method", flat=True)
+            .first()
+        )
+        key = MATCHING_KEYS[method if method is not None else FIFO]
+
+        earlier = _release_suffix(etf_id, from_date)
+        suffix = _build_parcels(etf_id, from_date)
+
+        sales = EtfTransaction.objects.filter(etf_id=etf_id, transaction_type=SELL)
+        if from_date is not None:
+            sales = sales.filter(order_date__gte=from_date)
+        sales = sales.order_by("order_date", "id").values(
+            "id", "order_date", "units", "order_cost", "brokerage"
+        )
+
+        disposals = _match(etf_id, earlier + suffix, sales, key)
+
+        Parcel.objects.bulk_update(
+            [parcel for parcel in earlier if parcel.units_remaining != parcel.stored_remaining],
+            ["units_remaining"],
+        )
+        Parcel.objects.bulk_create(suffix)
+        ParcelDisposal.objects.bulk_create(disposals)
+
+
+def release_sale(sale_id):
+    """
+    Hand the units consumed by a sale back to its parcels.
+
+    Called before a sale is deleted, since deleting it cascades to its
+    disposals and `rematch` could no longer tell which parcels they consumed.
+    """
+
+    released = (
+        ParcelDisposal.objects.filter(sale_id=sale_id)
+        .values("parcel_id")
+        .annotate(units=Sum("units"))
+        .values_list("parcel_id", "units")
+    )
+    for parcel_id, units in released:
+        Parcel.objects.filter(pk=parcel_id).update(units_remaining=F("units_remaining") + units)
+
+
+def _release_suffix(etf_id, from_date):
+    """
+    Delete the suffix of parcels and disposals and return the earlier parcels
+    that still have units to match, with the released units handed back.
+    """
+
+    disposals = ParcelDisposal.objects.filter(etf_id=etf_id)
+    parcels = Parcel.objects.filter(etf_id=etf_id)
+
+    if from_date is None:
+        disposals.delete()
+        parcels.delete()
+        return []
+
+    disposals = disposals.filter(disposed_date__gte=from_date)
+    released = dict(
+        disposals.filter(parcel__acquired_date__lt=from_date)
+        .values("parcel_id")
+        .annotate(units=Sum("units"))
+        .values_list("parcel_id", "units")
+    )
+    disposals.delete()
+    parcels.filter(acquired_date__gte=from_date).delete()
+
+    earlier = list(
+        parcels.filter(acquired_date__lt=from_date).filter(
+            Q(units_remaining__gt=EPSILON) | Q(pk__in=list(released))
+        )
+    )
+    for parcel in earlier:
+        parcel.stored_remaining = parcel.units_remaining
+        parcel.units_remaining += released.get(parcel.pk, 0)
+
+    return earlier
+
+
+def _build_parcels(etf_id, from_date):
+    """
+    Return unsaved parcels for the buys dated on or after `from_date`.
+    """
+
+    buys = EtfTransaction.objects.filter(etf_id=etf_id, transaction_type=BUY)
+    if from_date is not None:
+        buys = buys.filter(order_date__gte=from_date)
+
+    return [
+        Parcel(
+            etf_id=etf_id,
+            transaction_id=buy["id"],
+            acquired_date=buy["order_date"],
+            units=buy["units"],
+            unit_cost=(buy["order_cost"] + (buy["brokerage"] or 0)) / buy["units"],
+            units_remaining=buy["units"],
+        )
+        for buy in buys.values("id", "order_date", "units", "order_cost", "brokerage")
+        if buy["units"] > 0
+    ]
+
+
+def _match(etf_id, parcels, sales, key):
+    """
+    Consume `parcels` in place for each sale and return the resulting disposals.
+
+    Sales arrive in date order, so the set of eligible parcels only grows: a
+    pointer walks the parcels by acquisition date and pushes them onto a heap
+    ordered by the matching method, making each match `O(log n)`.
+    """
+
+    parcels = sorted(parcels, key=_fifo_key)
+    heap, pointer, disposals = [], 0, []
+
+    for sale in sales:
+        if sale["units"] <= 0:
+            continue
+
+        while pointer < len(parcels) and parcels[pointer].acquired_date <= sale["order_date"]:
+            if parcels[pointer].units_remaining > EPSILON:
+                heapq.heappush(heap, (key(parcels[pointer]), pointer))
+            pointer += 1
+
+        remaining = sale["units"]
+        proceeds_per_unit = (sale["order_cost"] - (sale["brokerage"] or 0)) / sale["units"]
+
+        while remaining > EPSILON and heap:
+            parcel = parcels[heap[0][1]]
+            units = min(remaining, parcel.units_remaining)
+
+            parcel.units_remaining -= units
+            remaining -= units
+            if parcel.units_remaining <= EPSILON:
+                parcel.units_remaining = 0.0
+                heapq.heappop(heap)
+
+            disposals.append(
+                ParcelDisposal(
+                    etf_id=etf_id,
+                    parcel=parcel,
+                    sale_id=sale["id"],
+                    disposed_date=sale["order_date"],
+                    units=units,
+                    cost_basis=units * parcel.unit_cost,
+                    proceeds=units * proceeds_per_unit,
+                )
+            )
+
+    return disposals
+
+
+def realised_gains(etf_ids):
+    """
+    Return a mapping of ETF id to the realised gain of its disposals.
+    """
+
+    return dict(
+        ParcelDisposal.objects.filter(etf_id__in=etf_ids)
+        .values("etf_id")
+        .annotate(gain=Sum(F("proceeds") - F("cost_basis")))
+        .values_list("etf_id", "gain")
+    )
+
+
+def open_position(etf_id):
+    """
+    Return the units and cost basis of the open parcels of an ETF.
+    """
+
+    totals = Parcel.objects.filter(etf_id=etf_id, units_remaining__gt=EPSILON).aggregate(
+        units=Sum("units_remaining"),
+        cost_basis=Sum(F("units_remaining") * F("unit_cost")),
+    )
+    return totals["units"] or 0.0, totals["cost_basis"] or 0.0
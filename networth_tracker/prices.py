@@ -0,0 +1,35 @@
+# networth_tracker/prices.py
+
+"""
+Lookups against the local `InstrumentPrice` store.
+"""
+
+from django.db.models import OuterRef, Subquery
+
+from networth_tracker.models import InstrumentPrice
+
+
+def normalise_ticker(ticker):
+    return ticker.strip().upper()
+
+
+def prices_as_of(tickers, date):
+    """
+    Return a mapping of ticker to its latest `(date, close)` on or before `date`.
+
+    A single query: the correlated subquery finds the latest date per ticker
+    with a backwards range scan of the `(ticker, date)` index. Tickers without
+    a price on or before `date` are left out.
+    """
+
+    tickers = {normalise_ticker(ticker) for ticker in tickers}
+    latest = (
+        InstrumentPrice.objects.filter(ticker=OuterRef("ticker"), date__lte=date)
+        .order_by("-date")
+        .values("date")[:1]
+    )
+    rows = InstrumentPrice.objects.filter(ticker__in=tickers, date=Subquery(latest)).values_list(
+        "ticker", "date", "close"
+    )
+
+    return {ticker: (price_date, close) for ticker, price_date, close in rows}
@@ -0,0 +1,124 @@
+# networth_tracker/query_budgets.py
+
+"""
+Maximum number of SQL queries per route and HTTP method.
+
+Budgets are keyed by the view name of the route (`reverse()` name, with its
+namespace) and count every query of a request made with session
+authentication, including the session and user lookups and the savepoints of
+nested atomic blocks. They must not depend on the number of rows involved;
+`tests/test_query_budgets.py` checks both against every route of `urls.py`.
+
+In production `QueryBudgetMiddleware` counts the queries of each request and
+logs the ones over budget.
+"""
+
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGETS = {
+    "api-root": {"GET": 2},
+    "rest_framework:login": {"GET": 0},
+    "rest_framework:logout": {"POST": 4},
+    "api_token_auth": {"POST": 4},
+    "register": {"POST": 5},
+    "networth": {"GET": 3},
+    "networth-history": {"GET": 3},
+    "prices": {"GET": 3},
+    # Only counts the queries of the request's thread: with `DASHBOARD_MAX_WORKERS`
+    # the four loaders run on worker threads
+    "dashboard": {"GET": 6},
+    # Plus the budgets of the sub-requests, see `batch_budget()`
+    "batch": {"POST": 2},
+    "accounts-list": {"GET": 4, "POST": 3},
+    "accounts-detail": {"GET": 3, "PUT": 5, "PATCH": 5, "DELETE": 2},
+    "bank-accounts-list": {"GET": 4, "POST": 3},
+    "bank-accounts-export": {"GET": 3},
+    "bank-accounts-detail": {"GET": 3, "PUT": 4, "PATCH": 4, "DELETE": 4},
+    "etfs-list": {"GET": 4, "POST": 4},
+    "etfs-export": {"GET": 3},
+    # Deleting an ETF cascades to its transactions, parcels and disposals
+    "etfs-detail": {"GET": 3, "PUT": 4, "PATCH": 4, "DELETE": 12},
+    "etfs-get-etf-gains": {"GET": 6},
+    "etfs-get-etf-transactions": {"GET": 4},
+    # Writing a transaction also updates holdings, parcels and the cached net worth
+    "etf-transactions-list": {"GET": 4, "POST": 19},
+    "etf-transactions-export": {"GET": 3},
+    "etf-transactions-import-transactions": {"POST": 3},
+    "etf-transactions-get-import": {"GET": 3},
+    "etf-transactions-detail": {"GET": 3, "PUT": 22, "PATCH": 22, "DELETE": 20},
+    "superannuations-list": {"GET": 4, "POST": 3},
+    "superannuations-export": {"GET": 3},
+    "superannuations-detail": {"GET": 3, "PUT": 4, "PATCH": 4, "DELETE": 4},
+    "superannuations-get-projection": {"GET": 4},
+}
+
+
+def get_budget(view_name, method):
+    """
+    Return the query budget of a route and method, or None if it has none.
+    """
+
+    return QUERY_BUDGETS.get(view_name, {}).get(method)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries it sees.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of every request and report the ones over the budget of
+    their route, by logging a warning (`QUERY_BUDGET_MODE = "log"`) or raising
+    `QueryBudgetExceeded` (`"raise"`, for development). `"off"` disables it.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = getattr(settings, "QUERY_BUDGET_MODE", "log")
+        if self.mode == "off":
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        # Views running other views (`/api/batch/`) set the budget of the request
+        budget = getattr(request, "query_budget", None)
+        if budget is None and match:
+            budget = get_budget(match.view_name, request.method)
+        if budget is not None and counter.count > budget:
+            message = (
+                f"{request.method} {match.view_name} ran {counter.count} queries, "
+                f"over its budget of {budget}"
+            )
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={"request": request})
+
+        return response
@@ -0,0 +1,194 @@
+# networth_tracker/signals.py
+
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from networth_tracker import holdings, parcels, sqlite
+from networth_tracker.api.authentication import invalidate_token, invalidate_user_tokens
+from networth_tracker.data_version import bump_data_version
+from networth_tracker.models import (
+    Account,
+    BankAccount,
+    CustomUser,
+    Etf,
+    EtfTransaction,
+    Superannuation,
+)
+from networth_tracker.networth import invalidate_networth
+
+
+def _deleted_with_etf(origin):
+    """
+    Return whether a transaction is being deleted because its ETF (or its
+    owner) is, in which case there is nothing left to keep in sync.
+    """
+
+    if origin is None:
+        return False
+
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not EtfTransaction
+
+
+def _order_date(instance):
+    # Instances built outside of a form or serializer may still hold a string
+    return EtfTransaction._meta.get_field("order_date").to_python(instance.order_date)
+
+
+@receiver(pre_save, sender=EtfTransaction)
+def remember_previous_transaction(sender, instance, raw, **kwargs):
+    """
+    Keep the stored version of an updated transaction so its delta can be reverted.
+    """
+
+    if raw or instance._state.adding:
+        instance._holdings_previous = None
+        return
+
+    instance._holdings_previous = holdings.snapshot_transaction(instance.pk)
+
+
+@receiver(post_save, sender=EtfTransaction)
+def update_holdings_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    previous = None if created else getattr(instance, "_holdings_previous", None)
+    holdings.record_transaction(instance, previous=previous)
+
+
+@receiver(post_delete, sender=EtfTransaction)
+def update_holdings_on_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_etf(origin):
+        return
+
+    holdings.revert_transaction(instance)
+
+
+@receiver(post_save, sender=EtfTransaction)
+def rematch_parcels_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    order_date = _order_date(instance)
+    previous = None if created else getattr(instance, "_holdings_previous", None)
+    if previous is None:
+        return parcels.rematch(instance.etf_id, order_date)
+
+    if previous["etf_id"] != instance.etf_id:
+        parcels.rematch(previous["etf_id"], previous["order_date"])
+        return parcels.rematch(instance.etf_id, order_date)
+
+    parcels.rematch(instance.etf_id, min(previous["order_date"], order_date))
+
+
+@receiver(pre_delete, sender=EtfTransaction)
+def release_parcels_on_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_etf(origin) or instance.transaction_type != holdings.SELL:
+        return
+
+    parcels.release_sale(instance.pk)
+
+
+@receiver(post_delete, sender=EtfTransaction)
+def rematch_parcels_on_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_etf(origin):
+        return
+
+    parcels.rematch(instance.etf_id, _order_date(instance))
+
+
+@receiver(pre_save, sender=Account)
+def remember_previous_cost_basis_method(sender, instance, raw, **kwargs):
+    if raw:
+        instance._previous_cost_basis_method = None
+        return
+
+    if instance._state.adding:
+        # Users without an account are matched first-in first-out
+        instance._previous_cost_basis_method = parcels.FIFO
+        return
+
+    instance._previous_cost_basis_method = (
+        Account.objects.filter(pk=instance.pk).values_list("cost_basis_method", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Account)
+def rematch_parcels_on_method_change(sender, instance, created, raw, **kwargs):
+    """
+    Changing the matching method affects every sale, so rebuild all parcels of the user.
+    """
+
+    previous = getattr(instance, "_previous_cost_basis_method", None)
+    if raw or previous is None or previous == instance.cost_basis_method:
+        return
+
+    for etf_id in Etf.objects.filter(user_id=instance.user_id).values_list("pk", flat=True):
+        parcels.rematch(etf_id)
+
+
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+@receiver(post_save, sender=Etf)
+@receiver(post_delete, sender=Etf)
+@receiver(post_save, sender=Superannuation)
+@receiver(post_delete, sender=Superannuation)
+def invalidate_networth_on_change(sender, instance, **kwargs):
+    invalidate_networth(instance.user_id)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+@receiver(post_save, sender=Etf)
+@receiver(post_delete, sender=Etf)
+@receiver(post_save, sender=Superannuation)
+@receiver(post_delete, sender=Superannuation)
+def bump_data_version_on_change(sender, instance, **kwargs):
+    bump_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=EtfTransaction)
+@receiver(post_delete, sender=EtfTransaction)
+def invalidate_user_caches_on_transaction_change(sender, instance, origin=None, **kwargs):
+    # Holdings are written with `QuerySet.update()`, which sends no `Etf` signal
+    if _deleted_with_etf(origin):
+        return
+
+    user_id = Etf.objects.filter(pk=instance.etf_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        invalidate_networth(user_id)
+        bump_data_version(user_id)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token_on_delete(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_cached_tokens_on_user_change(sender, instance, raw, **kwargs):
+    # Covers password changes and deactivation, and keeps cached users current
+    if raw:
+        return
+
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_data_version_on_user_change(sender, instance, raw, **kwargs):
+    # Serializers nest the owner of each row
+    if raw:
+        return
+
+    bump_data_version(instance.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    sqlite.configure_connection(connection)
@@ -0,0 +1,61 @@
+# networth_tracker/sqlite.py
+
+"""
+PRAGMAs applied to every new SQLite connection (`SQLITE_PRAGMAS` in
+core/settings.py; none without it).
+
+SQLite's defaults favour durability on a single connection: the rollback
+journal blocks readers while a write commits, and every commit waits for an
+fsync. With several gunicorn workers sharing `db.sqlite3` that shows up as
+`database is locked` errors and fsync-bound writes. In WAL mode readers and
+the single writer no longer block each other, `synchronous=NORMAL` only
+syncs at checkpoints (a power loss may roll back the last commits, but never
+corrupts the database), and `busy_timeout` makes writers queue for the lock
+instead of failing.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# PRAGMAs that only take a keyword or an integer, so they can be formatted safely
+PRAGMAS = {
+    "busy_timeout",
+    "cache_size",
+    "journal_mode",
+    "journal_size_limit",
+    "mmap_size",
+    "synchronous",
+    "temp_store",
+    "wal_autocheckpoint",
+}
+
+
+def pragma_statements(pragmas):
+    statements = []
+    for name, value in pragmas.items():
+        if name not in PRAGMAS:
+            raise ImproperlyConfigured(f"Unsupported SQLite PRAGMA in SQLITE_PRAGMAS: {name}")
+        if not isinstance(value, int) and not str(value).isidentifier():
+            raise ImproperlyConfigured(f"Invalid value for SQLite PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def configure_connection(connection):
+    """
+    Apply `SQLITE_PRAGMAS` to a new SQLite connection.
+
+    The PRAGMAs run on the DB-API connection, so they are neither logged nor
+    counted against the query budget of the request that opened it.
+    """
+
+    if connection.vendor != "sqlite":
+        return
+
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    cursor = connection.connection.cursor()
+    try:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
+    finally:
+        cursor.close()
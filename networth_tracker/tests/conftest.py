@@ -1,7 +1,10 @@
 import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
 
+from networth_tracker.api import response_cache
+from networth_tracker.api.authentication import _get_local_cache
 from networth_tracker.tests.factories import (
     AccountFactory,
     BankAccountFactory,
@@ -45,3 +48,15 @@ def create_auth_client():
 @pytest.fixture
 def admin_user(custom_user_factory):
     return custom_user_factory(is_staff=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    # Primary keys are reused across tests, so per-user cache entries must not leak
+    cache.clear()
+    _get_local_cache().clear()
+    # Each test starts with an empty response cache built for its own settings
+    monkeypatch.setattr(response_cache, "_backend", None)
+    yield
+    cache.clear()
+    _get_local_cache().clear()
@@ -0,0 +1,74 @@
+# networth_tracker/tests/explain.py
+
+"""
+Query plan assertions for tests.
+
+`capture_selects()` records the `SELECT` statements run inside a block, and
+`table_scans()` explains each of them (`EXPLAIN QUERY PLAN` on SQLite,
+`EXPLAIN (FORMAT JSON)` on PostgreSQL) and returns the tables read without
+an index. PostgreSQL happily scans the tiny tables of a test database, so
+sequential scans are disabled while explaining: a `Seq Scan` that remains
+has no usable index.
+"""
+
+import json
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def capture_selects():
+    statements = []
+
+    def _capture(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(_capture):
+        yield statements
+
+
+def _sqlite_scans(cursor, sql, params):
+    cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+    scans = []
+    for row in cursor.fetchall():
+        detail = row[-1]
+        # e.g. "SCAN networth_tracker_bankaccount" but not "SCAN ... USING INDEX ..."
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            scans.append(detail.split()[1])
+    return scans
+
+
+def _postgres_scans(cursor, sql, params):
+    cursor.execute("SET enable_seqscan = off")
+    try:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.execute("RESET enable_seqscan")
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans, nodes = [], [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            scans.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scans
+
+
+def table_scans(statements, tables):
+    """
+    Return `(table, sql)` for every statement reading one of `tables` without an index.
+    """
+
+    explain = _postgres_scans if connection.vendor == "postgresql" else _sqlite_scans
+    found = []
+    with connection.cursor() as cursor:
+        for sql, params in statements:
+            found.extend((table, sql) for table in explain(cursor, sql, params) if table in tables)
+    return found
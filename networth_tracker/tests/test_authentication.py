@@ -1,10 +1,20 @@
 # networth_tracker/tests/test_authentication.py
 
+import pickle
+
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+from networth_tracker.api import authentication
+from networth_tracker.api.authentication import _get_local_cache, _shared_key
+from networth_tracker.cache import LRUCache
 from networth_tracker.models import CustomUser
 
 pytestmark = pytest.mark.django_db
@@ -29,3 +39,155 @@ def test_call_with_token_authentication():
     response = client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.fixture
+def token_client(custom_user_1):
+    token = Token.objects.create(user=custom_user_1)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client, token
+
+
+class TestCachedTokenAuthentication:
+    url = reverse("networth")
+
+    def test_cached_token_skips_the_database(self, token_client):
+        client, _ = token_client
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        # Only the cached net worth is read, so no query is left at all
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(self.url).status_code == status.HTTP_200_OK
+        assert len(context.captured_queries) == 0
+
+    def test_deleted_token_is_rejected(self, token_client):
+        client, token = token_client
+        client.get(self.url)
+
+        token.delete()
+
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivated_user_is_rejected(self, token_client, custom_user_1):
+        client, _ = token_client
+        client.get(self.url)
+
+        custom_user_1.is_active = False
+        custom_user_1.save()
+
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_change_refreshes_cached_user(self, token_client, custom_user_1):
+        client, _ = token_client
+        client.get(self.url)
+
+        custom_user_1.set_password("changed")
+        custom_user_1.save()
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.url)
+        assert len(context.captured_queries) == 1
+
+    def test_shared_cache_tier(self, settings, token_client):
+        settings.TOKEN_AUTH_SHARED_CACHE = "default"
+        client, token = token_client
+        client.get(self.url)
+
+        # Another process starts with an empty in-process cache
+        _get_local_cache().clear()
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.url)
+        assert len(context.captured_queries) == 0
+
+        token.delete()
+        _get_local_cache().clear()
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.parametrize(
+        "revoke, expected",
+        [
+            (lambda token, user: token.delete(), status.HTTP_401_UNAUTHORIZED),
+            (
+                lambda token, user: setattr(user, "is_active", False) or user.save(),
+                status.HTTP_401_UNAUTHORIZED,
+            ),
+            # The token stays valid, but its user is read again
+            (lambda token, user: user.set_password("changed") or user.save(), None),
+        ],
+        ids=["deleted-token", "deactivated-user", "changed-password"],
+    )
+    def test_invalidation_reaches_other_processes(
+        self, settings, monkeypatch, token_client, custom_user_1, revoke, expected
+    ):
+        settings.TOKEN_AUTH_SHARED_CACHE = "default"
+        client, token = token_client
+        # Each process has an in-process cache of its own
+        first, second = LRUCache(100, 60), LRUCache(100, 60)
+        for lru in (first, second):
+            monkeypatch.setattr(authentication, "_local_cache", lru)
+            assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        # The first process handles the change, the second one the next request
+        monkeypatch.setattr(authentication, "_local_cache", first)
+        revoke(token, custom_user_1)
+        monkeypatch.setattr(authentication, "_local_cache", second)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url)
+        if expected is None:
+            assert response.status_code == status.HTTP_200_OK
+            assert len(context.captured_queries) == 1
+        else:
+            assert response.status_code == expected
+
+    def test_invalidation_during_the_lookup_is_not_missed(
+        self, settings, monkeypatch, token_client
+    ):
+        settings.TOKEN_AUTH_SHARED_CACHE = "default"
+        client, token = token_client
+        load = TokenAuthentication.authenticate_credentials
+
+        def _load_then_revoke(self, key):
+            loaded = load(self, key)
+            # Another request deletes the token before this one caches it
+            token.delete()
+            return loaded
+
+        monkeypatch.setattr(TokenAuthentication, "authenticate_credentials", _load_then_revoke)
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+        monkeypatch.setattr(TokenAuthentication, "authenticate_credentials", load)
+
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_hash_is_not_cached(self, settings, token_client, custom_user_1):
+        settings.TOKEN_AUTH_SHARED_CACHE = "default"
+        client, token = token_client
+        client.get(self.url)
+
+        entry = cache.get(_shared_key(token.key))
+
+        assert entry is not None
+        assert custom_user_1.password.encode() not in pickle.dumps(entry)
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+
+    def test_entries_expire(self):
+        now = [0.0]
+        lru = LRUCache(maxsize=2, ttl=10, timer=lambda: now[0])
+        lru.set("a", 1)
+
+        now[0] = 9.9
+        assert lru.get("a") == 1
+        now[0] = 10.0
+        assert lru.get("a") is None
+        assert len(lru) == 0
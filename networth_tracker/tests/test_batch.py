@@ -0,0 +1,249 @@
+# networth_tracker/tests/test_batch.py
+
+import threading
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from networth_tracker.api import batch
+from networth_tracker.api.throttling import MinuteRateThrottle
+from networth_tracker.models import BankAccount
+
+pytestmark = pytest.mark.django_db
+
+BANK_ACCOUNT = {"bank": "Bank", "account_name": "Savings", "balance": 100.0, "interest_rate": 1}
+
+
+def _batch(client, requests, **options):
+    response = client.post(reverse("batch"), {"requests": requests, **options}, format="json")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.json()["responses"]
+
+
+class TestBatch:
+    def test_reads_and_writes_in_order(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-list")
+
+        responses = _batch(
+            client,
+            [
+                {"method": "GET", "path": url},
+                {"method": "POST", "path": url, "body": BANK_ACCOUNT},
+                {"method": "get", "path": url},
+            ],
+        )
+
+        assert [item["status"] for item in responses] == [200, 201, 200]
+        assert responses[0]["body"]["results"] == []
+        assert responses[1]["body"]["account_name"] == "Savings"
+        assert responses[2]["body"]["results"] == [responses[1]["body"]]
+        assert BankAccount.objects.filter(user=custom_user_1).count() == 1
+
+    def test_keeps_the_status_of_every_item(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+
+        responses = _batch(
+            client,
+            [
+                {"path": reverse("bank-accounts-detail", kwargs={"pk": 999})},
+                {"method": "POST", "path": reverse("bank-accounts-list"), "body": {}},
+                {"path": "/api/missing/"},
+                {"path": reverse("networth")},
+            ],
+        )
+
+        assert [item["status"] for item in responses] == [404, 400, 404, 200]
+        assert "balance" in responses[1]["body"]
+        assert responses[3]["body"]["total"] == 0.0
+
+    def test_query_string_and_headers(
+        self, create_auth_client, custom_user_1, bank_account_factory
+    ):
+        bank_account_factory(user=custom_user_1, bank="Westpac")
+        bank_account_factory(user=custom_user_1, bank="ANZ")
+        client = create_auth_client(custom_user_1)
+
+        (item,) = _batch(client, [{"path": reverse("bank-accounts-list") + "?search=ANZ"}])
+
+        assert [row["bank"] for row in item["body"]["results"]] == ["ANZ"]
+        assert item["headers"]["Content-Type"] == "application/json"
+        assert "ETag" in item["headers"]
+
+    def test_other_users_objects_stay_hidden(
+        self, create_auth_client, custom_user_1, custom_user_factory, bank_account_factory
+    ):
+        account = bank_account_factory(user=custom_user_factory(email="another@user.com"))
+        client = create_auth_client(custom_user_1)
+
+        (item,) = _batch(
+            client, [{"path": reverse("bank-accounts-detail", kwargs={"pk": account.pk})}]
+        )
+
+        assert item["status"] == status.HTTP_404_NOT_FOUND
+
+    def test_token_authentication(self, custom_user_1):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=custom_user_1)}")
+
+        (item,) = _batch(client, [{"path": reverse("networth")}])
+
+        assert item["status"] == status.HTTP_200_OK
+
+    def test_requires_authentication(self):
+        response = APIClient().post(
+            reverse("batch"), {"requests": [{"path": reverse("networth")}]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.parametrize(
+        "path, detail",
+        [
+            ("/api/batch/", "Batches cannot be nested."),
+            ("/api/dashboard/", "Only API endpoints can be batched."),
+            ("/admin/", "Only API endpoints can be batched."),
+        ],
+    )
+    def test_rejected_paths(self, create_auth_client, custom_user_1, path, detail):
+        (item,) = _batch(create_auth_client(custom_user_1), [{"method": "POST", "path": path}])
+
+        assert item["status"] == status.HTTP_400_BAD_REQUEST
+        assert item["body"] == {"detail": detail}
+
+    def test_streaming_responses_are_rejected(self, create_auth_client, custom_user_1):
+        (item,) = _batch(
+            create_auth_client(custom_user_1),
+            [{"path": reverse("bank-accounts-export") + "?format=csv"}],
+        )
+
+        assert item["status"] == status.HTTP_400_BAD_REQUEST
+
+    def test_binary_responses_are_rejected(self, create_auth_client, custom_user_1, caplog):
+        pytest.importorskip("msgpack")
+        responses = _batch(
+            create_auth_client(custom_user_1),
+            [
+                {"path": reverse("bank-accounts-list") + "?format=msgpack"},
+                {"path": reverse("bank-accounts-list")},
+            ],
+        )
+
+        assert [item["status"] for item in responses] == [406, 200]
+        assert responses[0]["body"] == {"detail": "Binary responses cannot be batched."}
+        assert not caplog.records
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+    def test_binary_writes_are_rejected_before_running(
+        self, create_auth_client, custom_user_1, bank_account_1, method
+    ):
+        pytest.importorskip("msgpack")
+        path, body = reverse("bank-accounts-list"), BANK_ACCOUNT
+        if method != "POST":
+            path = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+            body = {"balance": 5}
+
+        (item,) = _batch(
+            create_auth_client(custom_user_1),
+            [{"method": method, "path": path + "?format=msgpack", "body": body}],
+        )
+
+        assert item["status"] == status.HTTP_406_NOT_ACCEPTABLE
+        assert list(BankAccount.objects.values_list("pk", "balance")) == [
+            (bank_account_1.pk, bank_account_1.balance)
+        ]
+
+    def test_server_errors_are_isolated(self, create_auth_client, custom_user_1, monkeypatch):
+        def _fail(*args, **kwargs):
+            raise RuntimeError
+
+        monkeypatch.setattr("networth_tracker.apis.get_networth", _fail)
+
+        responses = _batch(
+            create_auth_client(custom_user_1),
+            [{"path": reverse("networth")}, {"path": reverse("bank-accounts-list")}],
+        )
+
+        assert [item["status"] for item in responses] == [500, 200]
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"requests": []},
+            {"requests": [{"method": "TRACE", "path": "/api/networth/"}]},
+            {"requests": [{"path": "api/networth/"}]},
+            {"requests": [{"path": "/api/networth/"}] * 21},
+        ],
+    )
+    def test_invalid_batches(self, create_auth_client, custom_user_1, data):
+        response = create_auth_client(custom_user_1).post(reverse("batch"), data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_sub_requests_are_throttled(self, create_auth_client, custom_user_1, monkeypatch):
+        monkeypatch.setattr(MinuteRateThrottle, "rate", "3/minute", raising=False)
+
+        responses = _batch(create_auth_client(custom_user_1), [{"path": reverse("networth")}] * 3)
+
+        # The batch itself used the first request of the rate
+        assert [item["status"] for item in responses] == [200, 200, 429]
+
+
+class TestSegments:
+    def test_groups_consecutive_reads(self):
+        items = [{"method": method} for method in ("GET", "GET", "POST", "GET", "HEAD", "DELETE")]
+
+        segments = batch._segments(items, parallel=True)
+
+        assert [(read, len(segment)) for read, segment in segments] == [
+            (True, 2),
+            (False, 1),
+            (True, 2),
+            (False, 1),
+        ]
+
+    def test_sequential_without_parallel(self):
+        items = [{"method": "GET"}] * 3
+
+        assert [read for read, _ in batch._segments(items, parallel=False)] == [False] * 3
+
+
+@pytest.mark.django_db(transaction=True)
+class TestParallelBatch:
+    def test_reads_run_on_worker_threads(
+        self, create_auth_client, custom_user_1, bank_account_factory, monkeypatch
+    ):
+        bank_account_factory(user=custom_user_1)
+        # Close the workers' connections after each query so the test database can be dropped
+        monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+        threads = set()
+        dispatch = batch.dispatch
+
+        def _dispatch(request, item):
+            threads.add(threading.current_thread().name)
+            return dispatch(request, item)
+
+        monkeypatch.setattr(batch, "dispatch", _dispatch)
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-list")
+
+        responses = _batch(
+            client,
+            [
+                {"path": url},
+                {"path": reverse("networth")},
+                {"method": "POST", "path": url, "body": BANK_ACCOUNT},
+                {"path": url},
+            ],
+            parallel=True,
+        )
+
+        assert [item["status"] for item in responses] == [200, 200, 201, 200]
+        assert len(responses[0]["body"]["results"]) == 1
+        assert len(responses[3]["body"]["results"]) == 2
+        assert any(name.startswith("batch") for name in threads)
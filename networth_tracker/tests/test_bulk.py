@@ -0,0 +1,113 @@
+# networth_tracker/tests/test_bulk.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.models import EtfTransaction, ParcelDisposal
+from networth_tracker.networth import get_networth
+from networth_tracker.parcels import open_position
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def empty_etf(etf_factory, custom_user_1):
+    return etf_factory(user=custom_user_1, units_held=0, average_cost=0)
+
+
+def _row(etf, day, transaction_type=0, units=10, order_cost=100.0):
+    return {
+        "etf": etf.id,
+        "transaction_type": transaction_type,
+        "order_date": f"2024-01-{day:02d}",
+        "units": units,
+        "order_cost": order_cost,
+        "brokerage": 0.0,
+    }
+
+
+class TestBulkCreateTransactions:
+    url = reverse("etf-transactions-list")
+
+    def test_creates_batch_and_syncs_holdings_and_parcels(
+        self, create_auth_client, custom_user_1, empty_etf
+    ):
+        client = create_auth_client(custom_user_1)
+        rows = [_row(empty_etf, 1), _row(empty_etf, 2, order_cost=300.0), _row(empty_etf, 3, 1, 5)]
+        response = client.post(self.url, rows, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["created"]) == 3
+        assert response.data["errors"] == []
+
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 15
+        assert empty_etf.average_cost == pytest.approx(20.0)
+        assert ParcelDisposal.objects.filter(etf=empty_etf).count() == 1
+        assert open_position(empty_etf.pk)[0] == pytest.approx(15)
+
+    def test_ownership_is_checked_in_one_query(
+        self, create_auth_client, custom_user_1, etf_factory, empty_etf
+    ):
+        client = create_auth_client(custom_user_1)
+        other = etf_factory(user=custom_user_1, ticker="VAS")
+
+        def _queries(count):
+            rows = [_row(etf, 1) for etf in (empty_etf, other)] * count
+            with CaptureQueriesContext(connection) as context:
+                client.post(self.url + "?atomic=true", rows + [{"etf": "x"}], format="json")
+            return len(context.captured_queries)
+
+        assert _queries(1) == _queries(20)
+
+    def test_invalid_rows_are_reported_and_valid_rows_created(
+        self, create_auth_client, custom_user_1, custom_user_factory, etf_factory, empty_etf
+    ):
+        foreign = etf_factory(user=custom_user_factory(email="anotheruser@user.com"))
+        client = create_auth_client(custom_user_1)
+        rows = [_row(empty_etf, 1), _row(foreign, 2), {**_row(empty_etf, 3), "units": "ten"}]
+        response = client.post(self.url, rows, format="json")
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert len(response.data["created"]) == 1
+        errors = response.data["errors"]
+        assert errors[0] == {}
+        assert "etf" in errors[1]
+        assert "units" in errors[2]
+        assert EtfTransaction.objects.filter(etf=foreign).count() == 0
+
+    def test_atomic_rejects_whole_batch(self, create_auth_client, custom_user_1, empty_etf):
+        client = create_auth_client(custom_user_1)
+        rows = [_row(empty_etf, 1), {**_row(empty_etf, 2), "order_date": "not-a-date"}]
+        response = client.post(self.url + "?atomic=true", rows, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["created"] == []
+        assert not EtfTransaction.objects.exists()
+
+    def test_invalidates_cached_networth(self, create_auth_client, custom_user_1, empty_etf):
+        assert get_networth(custom_user_1.pk)["etfs"] == 0
+
+        client = create_auth_client(custom_user_1)
+        client.post(self.url, [_row(empty_etf, 1)], format="json")
+
+        assert get_networth(custom_user_1.pk)["etfs"] == pytest.approx(100.0)
+
+    def test_batch_size_is_capped(self, create_auth_client, custom_user_1, empty_etf, settings):
+        settings.API_MAX_BULK_SIZE = 2
+        client = create_auth_client(custom_user_1)
+        response = client.post(
+            self.url, [_row(empty_etf, day) for day in (1, 2, 3)], format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not EtfTransaction.objects.exists()
+
+    def test_empty_batch_is_rejected(self, create_auth_client, custom_user_1):
+        response = create_auth_client(custom_user_1).post(self.url, [], format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["created"] == []
@@ -0,0 +1,128 @@
+# networth_tracker/tests/test_conditional.py
+
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client(create_auth_client, custom_user_1):
+    return create_auth_client(custom_user_1)
+
+
+def _revalidate(client, url, response, **params):
+    return client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+class TestCollectionConditionalGet:
+    def test_not_modified_without_reading_rows(self, client, custom_user_1, bank_account_factory):
+        bank_account_factory.create_batch(3, user=custom_user_1)
+        url = reverse("bank-accounts-list")
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('W/"')
+        assert "Last-Modified" in response
+        assert "private" in response["Cache-Control"]
+
+        with CaptureQueriesContext(connection) as context:
+            revalidated = _revalidate(client, url, response)
+
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        assert revalidated.content == b""
+        assert revalidated["ETag"] == response["ETag"]
+        assert not [query for query in context.captured_queries if "balance" in query["sql"]]
+
+    def test_if_modified_since(self, client, custom_user_1, bank_account_factory):
+        bank_account_factory(user=custom_user_1)
+        url = reverse("bank-accounts-list")
+        response = client.get(url)
+
+        revalidated = client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_changes_etag(self, client, custom_user_1, bank_account_factory):
+        bank_account = bank_account_factory(user=custom_user_1)
+        url = reverse("bank-accounts-list")
+        response = client.get(url)
+
+        bank_account.balance += 1
+        bank_account.save()
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_200_OK
+
+    def test_deleting_an_older_row_changes_etag(
+        self, client, custom_user_1, superannuation_factory
+    ):
+        oldest, _ = superannuation_factory.create_batch(2, user=custom_user_1)
+        url = reverse("superannuations-list")
+        response = client.get(url)
+
+        oldest.delete()
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_200_OK
+
+    def test_transactions_change_etf_holdings_etag(self, client, etf_1, etf_transaction_factory):
+        url = reverse("etfs-list")
+        response = client.get(url)
+
+        etf_transaction_factory(etf=etf_1, order_date=datetime.date(2024, 1, 1))
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_200_OK
+
+    def test_etag_depends_on_query(self, client, custom_user_1, bank_account_factory):
+        bank_account_factory(user=custom_user_1, bank="ANZ")
+        url = reverse("bank-accounts-list")
+        response = client.get(url)
+
+        filtered = _revalidate(client, url, response, bank="ANZ")
+
+        assert filtered.status_code == status.HTTP_200_OK
+        assert filtered["ETag"] != response["ETag"]
+
+    def test_etag_depends_on_user(
+        self, client, create_auth_client, custom_user_factory, bank_account_factory
+    ):
+        url = reverse("bank-accounts-list")
+        response = client.get(url)
+
+        other = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+
+        assert _revalidate(other, url, response).status_code == status.HTTP_200_OK
+
+    def test_etf_transactions_action(self, client, etf_1, etf_transaction_factory):
+        url = reverse("etfs-get-etf-transactions", kwargs={"pk": etf_1.pk})
+        response = client.get(url)
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_304_NOT_MODIFIED
+
+        etf_transaction_factory(etf=etf_1, order_date=datetime.date(2024, 1, 1))
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_200_OK
+
+
+class TestDetailConditionalGet:
+    def test_not_modified_until_updated(self, client, bank_account_1):
+        url = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+        response = client.get(url)
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.patch(url, {"balance": 1.0})
+
+        assert _revalidate(client, url, response).status_code == status.HTTP_200_OK
+
+    def test_not_found_for_other_users(self, create_auth_client, custom_user_factory, etf_1):
+        client = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.pk})
+
+        response = client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
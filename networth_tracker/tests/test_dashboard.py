@@ -0,0 +1,146 @@
+# networth_tracker/tests/test_dashboard.py
+
+import datetime
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from networth_tracker import dashboard
+from networth_tracker.api.throttling import MinuteRateThrottle
+from networth_tracker.dashboard import get_dashboard
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def serial(settings):
+    # Worker threads use connections of their own, outside the test's transaction
+    settings.DASHBOARD_MAX_WORKERS = 0
+
+
+@pytest.fixture
+def portfolio(
+    custom_user_1,
+    account_factory,
+    bank_account_factory,
+    etf_factory,
+    etf_transaction_factory,
+    superannuation_factory,
+):
+    account_factory(user=custom_user_1, first_name="Jane")
+    bank_account_factory(user=custom_user_1, account_name="Savings", balance=1000.0)
+    bank_account_factory(user=custom_user_1, account_name="Everyday", balance=500.0)
+    etf = etf_factory(user=custom_user_1, ticker="VAS")
+    etf_factory(user=custom_user_1, ticker="VGS")
+    for day in (3, 1, 2):
+        etf_transaction_factory(
+            etf=etf, transaction_type=0, order_date=datetime.date(2024, 1, day)
+        )
+    superannuation_factory(user=custom_user_1, provider="Super")
+    return custom_user_1
+
+
+class TestDashboard:
+    def test_payload(self, portfolio, custom_user_factory, bank_account_factory):
+        bank_account_factory(user=custom_user_factory(email="another@user.com"))
+
+        data = async_to_sync(get_dashboard)(portfolio.pk)
+
+        assert data["account"]["first_name"] == "Jane"
+        assert [row["account_name"] for row in data["bank_accounts"]] == [
+            "Everyday",
+            "Savings",
+        ]
+        etfs = {etf["ticker"]: etf["transactions"] for etf in data["etfs"]}
+        assert etfs == {
+            "VAS": {"count": 3, "first_order_date": "2024-01-01", "last_order_date": "2024-01-03"},
+            "VGS": {"count": 0, "first_order_date": None, "last_order_date": None},
+        }
+        assert [row["provider"] for row in data["superannuations"]] == ["Super"]
+
+    def test_user_without_data(self, custom_user_1):
+        assert async_to_sync(get_dashboard)(custom_user_1.pk) == {
+            "account": None,
+            "bank_accounts": [],
+            "etfs": [],
+            "superannuations": [],
+        }
+
+    def test_matches_the_list_endpoints(self, create_auth_client, portfolio):
+        client = create_auth_client(portfolio)
+        data = client.get(reverse("dashboard")).json()
+
+        for key, name in (
+            ("bank_accounts", "bank-accounts-list"),
+            ("superannuations", "superannuations-list"),
+        ):
+            assert data[key] == client.get(reverse(name)).json()["results"]
+
+    def test_endpoint(self, create_auth_client, portfolio):
+        response = create_auth_client(portfolio).get(reverse("dashboard"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/json"
+        assert len(response.json()["etfs"]) == 2
+
+    def test_token_authentication(self, portfolio):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=portfolio)}")
+
+        assert client.get(reverse("dashboard")).status_code == status.HTTP_200_OK
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse("dashboard"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {"detail": "Authentication credentials were not provided."}
+        assert response["WWW-Authenticate"] == "Token"
+
+    def test_throttled(self, create_auth_client, custom_user_1, monkeypatch):
+        monkeypatch.setattr(MinuteRateThrottle, "rate", "1/minute", raising=False)
+        client = create_auth_client(custom_user_1)
+
+        assert client.get(reverse("dashboard")).status_code == status.HTTP_200_OK
+        response = client.get(reverse("dashboard"))
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response
+
+    def test_only_get(self, create_auth_client, custom_user_1):
+        response = create_auth_client(custom_user_1).post(reverse("dashboard"))
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentDashboard:
+    def test_queries_run_on_worker_threads(self, portfolio, settings, monkeypatch):
+        serial = async_to_sync(get_dashboard)(portfolio.pk)
+        settings.DASHBOARD_MAX_WORKERS = 4
+        # Close the workers' connections after each query so the test database can be dropped
+        monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+        threads = set()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def _loader(loader):
+            def _load(user_id):
+                threads.add(threading.current_thread().name)
+                # Every loader waits for the others: they only all get here if they overlap
+                barrier.wait()
+                return loader(user_id)
+
+            return _load
+
+        for name in ("load_account", "load_bank_accounts", "load_etfs", "load_superannuations"):
+            monkeypatch.setattr(dashboard, name, _loader(getattr(dashboard, name)))
+
+        data = async_to_sync(get_dashboard)(portfolio.pk)
+
+        assert len(threads) == 4
+        assert all(name.startswith("dashboard") for name in threads)
+        assert data == serial
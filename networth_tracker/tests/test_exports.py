@@ -0,0 +1,69 @@
+# networth_tracker/tests/test_exports.py
+
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+def _content(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+class TestExports:
+    def test_csv_export_of_own_rows(
+        self,
+        settings,
+        create_auth_client,
+        custom_user_1,
+        custom_user_factory,
+        bank_account_factory,
+    ):
+        settings.EXPORT_CHUNK_SIZE = 2
+        accounts = [bank_account_factory(user=custom_user_1) for _ in range(5)]
+        bank_account_factory(user=custom_user_factory(email="anotheruser@user.com"))
+
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("bank-accounts-list") + "export/")
+
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert 'filename="bank-accounts.csv"' in response["Content-Disposition"]
+        rows = list(csv.DictReader(StringIO(_content(response))))
+        assert [int(row["id"]) for row in rows] == [account.id for account in accounts]
+        assert float(rows[0]["balance"]) == accounts[0].balance
+
+    def test_ndjson_export_with_related_fields(
+        self, create_auth_client, custom_user_1, etf_1, etf_transaction_factory
+    ):
+        transactions = [etf_transaction_factory(etf=etf_1) for _ in range(3)]
+
+        client = create_auth_client(custom_user_1)
+        response = client.get(
+            reverse("etf-transactions-list") + "export/", HTTP_ACCEPT="application/x-ndjson"
+        )
+
+        lines = [json.loads(line) for line in _content(response).splitlines()]
+        assert [line["id"] for line in lines] == [transaction.id for transaction in transactions]
+        assert lines[0]["etf"] == etf_1.id
+        assert lines[0]["etf_ticker"] == etf_1.ticker
+
+    @pytest.mark.parametrize("basename", ["etfs", "superannuations"])
+    def test_format_query_parameter(
+        self, create_auth_client, custom_user_1, etf_1, superannuation_1, basename
+    ):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse(f"{basename}-list") + "export/", {"format": "ndjson"})
+
+        assert len(_content(response).splitlines()) == 1
+
+    def test_export_requires_authentication(self, client):
+        response = client.get(reverse("etfs-list") + "export/")
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,147 @@
+# networth_tracker/tests/test_fieldsets.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.viewsets import ModelViewSet
+
+from networth_tracker.api.viewsets import BankAccountViewSet, EtfViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+def _queries(client, url, params, table):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK, response.data
+    sql = [query["sql"] for query in context.captured_queries]
+    # Leave out the aggregate behind the conditional GET validators
+    return response, [query for query in sql if f'FROM "{table}"' in query and "MAX(" not in query]
+
+
+class TestFields:
+    def test_user_is_a_primary_key_by_default(self, create_auth_client, custom_user_1, etf_1):
+        response = create_auth_client(custom_user_1).get(reverse("etfs-list"))
+
+        assert response.data["results"][0]["user"] == custom_user_1.pk
+
+    def test_expand_user(self, create_auth_client, custom_user_1, etf_1):
+        client = create_auth_client(custom_user_1)
+
+        results = client.get(reverse("etfs-list"), {"expand": "user"}).data["results"]
+        detail = client.get(reverse("etfs-detail", kwargs={"pk": etf_1.pk}), {"expand": "user"})
+
+        user = {"id": custom_user_1.pk, "email": custom_user_1.email}
+        assert results[0]["user"] == detail.data["user"] == user
+
+    def test_list_only_selects_the_requested_columns(
+        self, create_auth_client, custom_user_1, bank_account_1
+    ):
+        response, (query,) = _queries(
+            create_auth_client(custom_user_1),
+            reverse("bank-accounts-list"),
+            {"fields": "id,balance"},
+            "networth_tracker_bankaccount",
+        )
+
+        assert response.data["results"] == [
+            {"id": bank_account_1.pk, "balance": bank_account_1.balance}
+        ]
+        assert '"account_name"' not in query
+        assert "customuser" not in query
+
+    def test_retrieve_only_selects_the_requested_columns(
+        self, create_auth_client, custom_user_1, etf_1
+    ):
+        client = create_auth_client(custom_user_1)
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.pk})
+
+        response, (query,) = _queries(client, url, {"fields": "ticker"}, "networth_tracker_etf")
+        assert response.data == {"ticker": etf_1.ticker}
+        assert '"fund_name"' not in query
+        assert "customuser" not in query
+
+        response, (query,) = _queries(
+            client, url, {"fields": "ticker,user", "expand": "user"}, "networth_tracker_etf"
+        )
+        assert response.data["user"]["email"] == custom_user_1.email
+        assert "customuser" in query
+        assert '"password"' not in query
+
+    def test_pagination_without_the_ordering_columns(
+        self, create_auth_client, custom_user_1, bank_account_factory
+    ):
+        for bank in ("A", "C", "B"):
+            bank_account_factory(user=custom_user_1, bank=bank)
+        client = create_auth_client(custom_user_1)
+
+        params = {"fields": "bank", "ordering": "bank", "page_size": 2}
+        first = client.get(reverse("bank-accounts-list"), params).data
+        second = client.get(first["next"]).data
+
+        assert first["results"] == [{"bank": "A"}, {"bank": "B"}]
+        assert second["results"] == [{"bank": "C"}]
+
+    def test_variants_are_cached_separately(
+        self, create_auth_client, custom_user_1, bank_account_1
+    ):
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+
+        sparse = client.get(url, {"fields": "id"})
+        full = client.get(url)
+
+        assert sparse.data == {"id": bank_account_1.pk}
+        assert "balance" in full.data
+        assert sparse["ETag"] != full["ETag"]
+
+    @pytest.mark.parametrize(
+        "params", [{"fields": "id,secret"}, {"expand": "owner"}, {"expand": "id"}]
+    )
+    def test_unknown_names_are_rejected(self, create_auth_client, custom_user_1, params):
+        response = create_auth_client(custom_user_1).get(reverse("bank-accounts-list"), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_writes_are_validated_in_full(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-list") + "?fields=id"
+
+        invalid = client.post(url, {"bank": "Bank"}, format="json")
+        data = {"bank": "Bank", "account_name": "Savings", "balance": 1, "interest_rate": 1}
+        created = client.post(url, data, format="json")
+
+        assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+        assert "balance" in invalid.data
+        assert created.status_code == status.HTTP_201_CREATED
+        assert list(created.data) == ["id"]
+
+    @pytest.mark.parametrize(
+        "viewset, basename, params",
+        [
+            (BankAccountViewSet, "bank-accounts", {"fields": "bank,balance", "ordering": "bank"}),
+            (EtfViewSet, "etfs", {"fields": "id,user,ticker", "expand": "user"}),
+        ],
+    )
+    def test_output_matches_the_serializer(
+        self,
+        monkeypatch,
+        create_auth_client,
+        custom_user_1,
+        etf_1,
+        bank_account_1,
+        viewset,
+        basename,
+        params,
+    ):
+        client = create_auth_client(custom_user_1)
+        url = reverse(f"{basename}-list")
+
+        fast = client.get(url, params)
+        monkeypatch.setattr(viewset, "list", ModelViewSet.list)
+        slow = client.get(url, params)
+
+        assert fast.status_code == slow.status_code == status.HTTP_200_OK
+        assert fast.content == slow.content
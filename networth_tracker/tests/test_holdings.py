@@ -0,0 +1,151 @@
+# networth_tracker/tests/test_holdings.py
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.holdings import replay_holdings
+from networth_tracker.models import Etf
+from networth_tracker.networth import get_networth
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def empty_etf(etf_factory, custom_user_1):
+    return etf_factory(user=custom_user_1, units_held=0, average_cost=0)
+
+
+def _buy(etf, units, order_cost, brokerage=0.0, **kwargs):
+    return {
+        "etf": etf,
+        "transaction_type": 0,
+        "units": units,
+        "order_cost": order_cost,
+        "brokerage": brokerage,
+        **kwargs,
+    }
+
+
+class TestHoldingsEngine:
+    def test_buy_updates_units_and_average_cost(self, etf_transaction_factory, empty_etf):
+        etf_transaction_factory(**_buy(empty_etf, 10, 100.0, 10.0))
+        etf_transaction_factory(**_buy(empty_etf, 30, 290.0))
+
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 40
+        assert empty_etf.average_cost == pytest.approx(10.0)
+
+    def test_sell_reduces_units_only(self, etf_transaction_factory, empty_etf):
+        etf_transaction_factory(**_buy(empty_etf, 10, 100.0))
+        etf_transaction_factory(**_buy(empty_etf, 4, 60.0, transaction_type=1))
+
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 6
+        assert empty_etf.average_cost == pytest.approx(10.0)
+
+    def test_update_and_delete_revert_previous_delta(self, etf_transaction_factory, empty_etf):
+        first = etf_transaction_factory(**_buy(empty_etf, 10, 100.0))
+        second = etf_transaction_factory(**_buy(empty_etf, 10, 300.0))
+
+        first.units, first.order_cost = 20, 400.0
+        first.save()
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 30
+        assert empty_etf.average_cost == pytest.approx(700.0 / 30)
+
+        second.delete()
+        first.delete()
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 0
+        assert empty_etf.average_cost == 0
+
+    def test_moving_transaction_between_etfs(
+        self, etf_factory, etf_transaction_factory, custom_user_1, empty_etf
+    ):
+        other = etf_factory(user=custom_user_1, ticker="VAS", units_held=0, average_cost=0)
+        transaction = etf_transaction_factory(**_buy(empty_etf, 5, 50.0))
+
+        transaction.etf = other
+        transaction.save()
+
+        empty_etf.refresh_from_db()
+        other.refresh_from_db()
+        assert (empty_etf.units_held, empty_etf.average_cost) == (0, 0)
+        assert (other.units_held, other.average_cost) == (5, pytest.approx(10.0))
+
+    def test_api_create_updates_holdings(self, create_auth_client, custom_user_1, empty_etf):
+        client = create_auth_client(custom_user_1)
+        data = {
+            "etf": empty_etf.id,
+            "transaction_type": 0,
+            "order_date": "2024-06-01",
+            "units": 8,
+            "order_cost": 80.0,
+            "brokerage": 8.0,
+        }
+        response = client.post(reverse("etf-transactions-list"), data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        empty_etf.refresh_from_db()
+        assert empty_etf.units_held == 8
+        assert empty_etf.average_cost == pytest.approx(11.0)
+
+    def test_incremental_matches_replay(self, etf_transaction_factory, empty_etf):
+        for units, cost, kind in [(10, 95.0, 0), (3, 40.0, 1), (7, 80.0, 0), (2, 20.0, 1)]:
+            etf_transaction_factory(**_buy(empty_etf, units, cost, 5.0, transaction_type=kind))
+
+        empty_etf.refresh_from_db()
+        units_held, units_bought, average_cost = replay_holdings([empty_etf.pk])[empty_etf.pk]
+        assert empty_etf.units_held == pytest.approx(units_held)
+        assert empty_etf.units_bought == pytest.approx(units_bought)
+        assert empty_etf.average_cost == pytest.approx(average_cost)
+
+
+class TestReconcileHoldingsCommand:
+    def test_reports_and_fixes_drift(self, etf_transaction_factory, empty_etf):
+        etf_transaction_factory(**_buy(empty_etf, 10, 100.0))
+        Etf.objects.filter(pk=empty_etf.pk).update(units_held=99)
+
+        out = StringIO()
+        call_command("reconcile_holdings", stdout=out)
+        assert f"Drift on ETF {empty_etf.pk}" in out.getvalue()
+        assert Etf.objects.get(pk=empty_etf.pk).units_held == 99
+
+        call_command("reconcile_holdings", "--fix", "--chunk-size", "1", stdout=StringIO())
+        assert Etf.objects.get(pk=empty_etf.pk).units_held == 10
+
+    def test_fix_refreshes_the_cached_networth(self, etf_transaction_factory, empty_etf):
+        etf_transaction_factory(**_buy(empty_etf, 10, 100.0))
+        Etf.objects.filter(pk=empty_etf.pk).update(units_held=99)
+        assert get_networth(empty_etf.user_id)["etfs"] == pytest.approx(990.0)
+
+        call_command("reconcile_holdings", "--fix", stdout=StringIO())
+
+        assert get_networth(empty_etf.user_id)["etfs"] == pytest.approx(100.0)
+
+    def test_fix_queries_do_not_grow_with_the_etfs(
+        self, etf_factory, etf_transaction_factory, custom_user_1
+    ):
+        def _fix_queries(count):
+            for _ in range(count):
+                etf = etf_factory(user=custom_user_1, units_held=0, average_cost=0)
+                etf_transaction_factory(**_buy(etf, 10, 100.0))
+            Etf.objects.update(units_held=99)
+            with CaptureQueriesContext(connection) as context:
+                call_command("reconcile_holdings", "--fix", stdout=StringIO())
+            return len(context.captured_queries)
+
+        assert _fix_queries(1) == _fix_queries(3)
+
+    def test_no_drift(self, etf_transaction_factory, empty_etf):
+        etf_transaction_factory(**_buy(empty_etf, 10, 100.0))
+
+        out = StringIO()
+        call_command("reconcile_holdings", stdout=out)
+        assert "found 0 with drift" in out.getvalue()
@@ -0,0 +1,151 @@
+# networth_tracker/tests/test_imports.py
+
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.imports import _get_executor
+from networth_tracker.models import EtfTransaction, TransactionImport
+
+pytestmark = pytest.mark.django_db
+
+CSV = (
+    "\ufeffTrade Date,Code,Side,Quantity,Price,Brokerage\r\n"
+    "01/02/2024,vas,Buy,10,90.00,9.50\r\n"
+    "02/02/2024,VGS,Buy,5,100,0\r\n"
+    "03/02/2024,VAS,Sell,4,95.00,9.50\r\n"
+    "04/02/2024,VAS,Hold,1,95.00,0\r\n"
+    "\r\n"
+)
+
+
+@pytest.fixture
+def sync_imports(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.TRANSACTION_IMPORT_ASYNC = False
+    settings.TRANSACTION_IMPORT_CHUNK_SIZE = 1
+
+
+@pytest.fixture
+def vas(etf_factory, custom_user_1):
+    return etf_factory(user=custom_user_1, ticker="VAS", units_held=0, average_cost=0)
+
+
+def _upload(client, content, django_capture_on_commit_callbacks, **data):
+    file = SimpleUploadedFile("trades.csv", content.encode(), content_type="text/csv")
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse("etf-transactions-list") + "import/",
+            {"file": file, **data},
+            format="multipart",
+        )
+    return response
+
+
+class TestTransactionImport:
+    def test_imports_valid_rows_and_reports_invalid_ones(
+        self,
+        sync_imports,
+        create_auth_client,
+        custom_user_1,
+        vas,
+        django_capture_on_commit_callbacks,
+    ):
+        client = create_auth_client(custom_user_1)
+        response = _upload(client, CSV, django_capture_on_commit_callbacks)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        url = reverse("etf-transactions-list") + f"import/{response.data['id']}/"
+        result = client.get(url).data
+
+        assert result["status"] == "Completed"
+        assert result["progress"] == 1.0
+        assert (result["rows_read"], result["rows_imported"], result["rows_failed"]) == (4, 2, 2)
+        assert [error["line"] for error in result["errors"]] == [3, 5]
+        assert "ticker" in result["errors"][0]["errors"]
+        assert "transaction_type" in result["errors"][1]["errors"]
+
+        vas.refresh_from_db()
+        assert vas.units_held == 6
+        assert vas.average_cost == pytest.approx((900.0 + 9.5) / 10)
+        sale = EtfTransaction.objects.get(etf=vas, transaction_type=1)
+        assert (str(sale.order_date), sale.order_cost) == ("2024-02-03", pytest.approx(380.0))
+
+    def test_missing_columns_fail_the_import(
+        self,
+        sync_imports,
+        create_auth_client,
+        custom_user_1,
+        vas,
+        django_capture_on_commit_callbacks,
+    ):
+        client = create_auth_client(custom_user_1)
+        response = _upload(
+            client, "Date,Code\n2024-01-01,VAS\n", django_capture_on_commit_callbacks
+        )
+
+        transaction_import = TransactionImport.objects.get(pk=response.data["id"])
+        assert transaction_import.status == TransactionImport.FAILED
+        assert "transaction_type" in transaction_import.message
+        assert not transaction_import.file
+
+    def test_date_format(
+        self,
+        sync_imports,
+        create_auth_client,
+        custom_user_1,
+        vas,
+        django_capture_on_commit_callbacks,
+    ):
+        client = create_auth_client(custom_user_1)
+        content = "date,ticker,type,units,order_cost\n01.02.2024,VAS,b,1,90\n"
+        _upload(client, content, django_capture_on_commit_callbacks, date_format="%d.%m.%Y")
+
+        assert str(EtfTransaction.objects.get().order_date) == "2024-02-01"
+
+    def test_status_restricted_to_owner(
+        self, create_auth_client, custom_user_1, custom_user_factory
+    ):
+        transaction_import = TransactionImport.objects.create(user=custom_user_1, file="x.csv")
+        client = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+        url = reverse("etf-transactions-list") + f"import/{transaction_import.pk}/"
+
+        assert client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_run_imports_command(self, settings, tmp_path, custom_user_1, vas):
+        settings.MEDIA_ROOT = tmp_path
+        file = SimpleUploadedFile(
+            "trades.csv", b"date,code,side,units,value\n2024-01-01,VAS,buy,2,20\n"
+        )
+        TransactionImport.objects.create(user=custom_user_1, file=file)
+
+        out = StringIO()
+        call_command("run_imports", stdout=out)
+
+        assert "Ran 1 imports" in out.getvalue()
+        assert TransactionImport.objects.get().status == TransactionImport.COMPLETED
+        assert EtfTransaction.objects.filter(etf=vas).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_runs_on_background_thread(
+    settings, tmp_path, create_auth_client, custom_user_1, vas
+):
+    settings.MEDIA_ROOT = tmp_path
+    client = create_auth_client(custom_user_1)
+    file = SimpleUploadedFile(
+        "trades.csv", b"date,code,side,units,value\n2024-01-01,VAS,buy,2,20\n"
+    )
+    response = client.post(reverse("etf-transactions-list") + "import/", {"file": file})
+
+    # Imports run one at a time, so this waits for the one just scheduled
+    _get_executor().submit(lambda: None).result()
+
+    assert (
+        TransactionImport.objects.get(pk=response.data["id"]).status == TransactionImport.COMPLETED
+    )
+    assert EtfTransaction.objects.filter(etf=vas).count() == 1
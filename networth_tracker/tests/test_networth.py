@@ -0,0 +1,68 @@
+# networth_tracker/tests/test_networth.py
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.networth import compute_networth, get_networth
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def portfolio(custom_user_1, bank_account_factory, etf_factory, superannuation_factory):
+    bank_account_factory(user=custom_user_1, balance=1000.0)
+    bank_account_factory(user=custom_user_1, balance=500.0)
+    etf_factory(user=custom_user_1, units_held=10, average_cost=25.0)
+    superannuation_factory(user=custom_user_1, balance=20000.0)
+    return custom_user_1
+
+
+class TestNetWorth:
+    def test_totals(self, portfolio, custom_user_factory, bank_account_factory):
+        bank_account_factory(user=custom_user_factory(email="another@user.com"), balance=99.0)
+
+        assert compute_networth(portfolio.pk) == {
+            "cash": 1500.0,
+            "etfs": 250.0,
+            "superannuation": 20000.0,
+            "total": 21750.0,
+        }
+
+    def test_user_without_assets(self, custom_user_1):
+        assert compute_networth(custom_user_1.pk)["total"] == 0.0
+
+    def test_single_query_then_cached(self, portfolio, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            get_networth(portfolio.pk)
+        with django_assert_num_queries(0):
+            get_networth(portfolio.pk)
+
+    def test_write_invalidates_cache(
+        self, portfolio, bank_account_factory, etf_transaction_factory
+    ):
+        assert get_networth(portfolio.pk)["cash"] == 1500.0
+
+        account = bank_account_factory(user=portfolio, balance=100.0)
+        assert get_networth(portfolio.pk)["cash"] == 1600.0
+
+        account.delete()
+        assert get_networth(portfolio.pk)["cash"] == 1500.0
+
+        etf = portfolio.etf_set.get()
+        etf_transaction_factory(
+            etf=etf, transaction_type=0, units=10, order_cost=250.0, brokerage=0.0
+        )
+        assert get_networth(portfolio.pk)["etfs"] == 500.0
+
+    def test_endpoint(self, create_auth_client, portfolio):
+        client = create_auth_client(portfolio)
+        response = client.get(reverse("networth"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total"] == 21750.0
+
+    def test_endpoint_unauthenticated(self, client):
+        response = client.get(reverse("networth"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
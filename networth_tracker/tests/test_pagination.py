@@ -0,0 +1,115 @@
+# networth_tracker/tests/test_pagination.py
+
+import base64
+import json
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from networth_tracker.models import BankAccount
+
+pytestmark = pytest.mark.django_db
+
+
+def _collect_pages(client, url, params):
+    ids, pages = [], 0
+    response = client.get(url, params)
+
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(row["id"] for row in response.data["results"])
+        pages += 1
+        if response.data["next"] is None:
+            return ids, pages
+        response = client.get(response.data["next"])
+
+
+class TestKeysetCursorPagination:
+    def test_pages_cover_every_row_once_with_identical_created_at(
+        self, create_auth_client, custom_user_1, bank_account_factory
+    ):
+        accounts = [bank_account_factory(user=custom_user_1) for _ in range(5)]
+        # Force a tie on `created_at` so only the `id` column breaks it
+        BankAccount.objects.update(created_at=timezone.now())
+
+        client = create_auth_client(custom_user_1)
+        ids, pages = _collect_pages(client, reverse("bank-accounts-list"), {"page_size": 2})
+
+        assert pages == 3
+        assert ids == sorted((account.id for account in accounts), reverse=True)
+
+    def test_previous_link_returns_preceding_page(
+        self, create_auth_client, custom_user_1, etf_1, etf_transaction_factory
+    ):
+        for _ in range(4):
+            etf_transaction_factory(etf=etf_1)
+
+        client = create_auth_client(custom_user_1)
+        first = client.get(reverse("etf-transactions-list"), {"page_size": 2})
+        second = client.get(first.data["next"])
+        previous = client.get(second.data["previous"])
+
+        assert first.data["previous"] is None
+        assert second.data["next"] is None
+        assert previous.data["results"] == first.data["results"]
+
+    def test_client_ordering_is_used_as_keyset(
+        self, create_auth_client, custom_user_1, bank_account_factory
+    ):
+        for balance in (30.0, 10.0, 20.0, 10.0):
+            bank_account_factory(user=custom_user_1, balance=balance)
+
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-list")
+        ids, _ = _collect_pages(client, url, {"ordering": "balance", "page_size": 1})
+
+        expected = BankAccount.objects.order_by("balance", "id").values_list("id", flat=True)
+        assert ids == list(expected)
+
+    def test_nested_transactions_action_is_paginated(
+        self, create_auth_client, custom_user_1, etf_1, etf_transaction_factory
+    ):
+        for _ in range(3):
+            etf_transaction_factory(etf=etf_1)
+
+        client = create_auth_client(custom_user_1)
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.id}) + "transactions/"
+        response = client.get(url, {"page_size": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+    @override_settings(API_MAX_PAGE_SIZE=2)
+    def test_page_size_is_capped(self, create_auth_client, custom_user_1, bank_account_factory):
+        for _ in range(3):
+            bank_account_factory(user=custom_user_1)
+
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("bank-accounts-list"), {"page_size": 500})
+
+        assert len(response.data["results"]) == 2
+
+    def test_invalid_cursor(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("bank-accounts-list"), {"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "position", [["not-a-date", 1], ["2024-01-01T00:00:00Z", "x"], [[1], {"a": 1}]]
+    )
+    def test_cursor_values_that_do_not_fit_the_ordering(
+        self, create_auth_client, custom_user_1, bank_account_1, position
+    ):
+        payload = json.dumps({"p": position, "r": 0}).encode()
+        cursor = base64.urlsafe_b64encode(payload).decode()
+
+        response = create_auth_client(custom_user_1).get(
+            reverse("bank-accounts-list"), {"cursor": cursor}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,133 @@
+# networth_tracker/tests/test_parcels.py
+
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.models import Parcel, ParcelDisposal
+from networth_tracker.parcels import HIGHEST_COST, LIFO, open_position, realised_gains
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def trade(etf_transaction_factory, etf_1):
+    def _trade(transaction_type, day, units, order_cost, **kwargs):
+        return etf_transaction_factory(
+            etf=etf_1,
+            transaction_type=transaction_type,
+            order_date=datetime.date(2024, 1, day),
+            units=units,
+            order_cost=order_cost,
+            brokerage=0.0,
+            **kwargs,
+        )
+
+    return _trade
+
+
+def _gain(etf):
+    return realised_gains([etf.pk]).get(etf.pk, 0.0)
+
+
+class TestParcelMatching:
+    def test_fifo_by_default(self, trade, etf_1):
+        trade(0, 1, 10, 100.0)
+        trade(0, 2, 10, 200.0)
+        trade(1, 3, 15, 450.0)
+
+        # 10 @ 10 + 5 @ 20 sold @ 30
+        assert _gain(etf_1) == pytest.approx(450.0 - 200.0)
+        assert open_position(etf_1.pk) == (pytest.approx(5), pytest.approx(100.0))
+
+    @pytest.mark.parametrize(
+        "method, cost_basis",
+        [(LIFO, 10 * 20.0 + 5 * 30.0), (HIGHEST_COST, 10 * 30.0 + 5 * 20.0)],
+    )
+    def test_account_method(
+        self, trade, account_factory, custom_user_1, etf_1, method, cost_basis
+    ):
+        account_factory(user=custom_user_1, cost_basis_method=method)
+        trade(0, 1, 10, 300.0)
+        trade(0, 2, 10, 200.0)
+        trade(1, 3, 15, 600.0)
+
+        assert _gain(etf_1) == pytest.approx(600.0 - cost_basis)
+
+    def test_sale_only_matches_earlier_parcels(self, trade, etf_1):
+        trade(0, 1, 5, 50.0)
+        trade(1, 2, 5, 100.0)
+        trade(0, 3, 5, 500.0)
+
+        disposal = ParcelDisposal.objects.get()
+        assert disposal.parcel.acquired_date == datetime.date(2024, 1, 1)
+
+    def test_back_dated_edit_rematches_suffix(self, trade, etf_1):
+        early = trade(0, 1, 10, 100.0)
+        trade(0, 5, 10, 200.0)
+        late = trade(0, 9, 10, 300.0)
+        trade(1, 10, 10, 500.0)
+
+        early.order_date = datetime.date(2024, 1, 20)
+        early.save()
+
+        # The sale now consumes the 5th instead of the 1st
+        assert _gain(etf_1) == pytest.approx(500.0 - 200.0)
+        assert Parcel.objects.get(transaction=late).units_remaining == 10
+
+    def test_changing_method_rebuilds_parcels(self, trade, account_1, etf_1):
+        trade(0, 1, 10, 100.0)
+        trade(0, 2, 10, 200.0)
+        trade(1, 3, 10, 300.0)
+        assert _gain(etf_1) == pytest.approx(300.0 - 100.0)
+
+        account_1.cost_basis_method = LIFO
+        account_1.save()
+
+        assert _gain(etf_1) == pytest.approx(300.0 - 200.0)
+
+    def test_deleting_sale_reopens_parcels(self, trade, etf_1):
+        trade(0, 1, 10, 100.0)
+        sale = trade(1, 2, 10, 300.0)
+
+        sale.delete()
+
+        assert not ParcelDisposal.objects.exists()
+        assert open_position(etf_1.pk)[0] == pytest.approx(10)
+
+    def test_rebuild_command_matches_incremental(self, trade, etf_1):
+        trade(0, 1, 10, 100.0)
+        trade(0, 3, 10, 200.0)
+        trade(1, 2, 4, 100.0)
+        trade(1, 4, 10, 400.0)
+        gain = _gain(etf_1)
+
+        call_command("rebuild_parcels", stdout=StringIO())
+
+        assert _gain(etf_1) == pytest.approx(gain)
+
+
+class TestEtfGainsEndpoint:
+    def test_gains(self, create_auth_client, custom_user_1, trade, etf_1):
+        trade(0, 1, 10, 100.0)
+        trade(1, 2, 4, 60.0)
+
+        client = create_auth_client(custom_user_1)
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.id}) + "gains/"
+        response = client.get(url, {"price": 12})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["units"] == pytest.approx(6)
+        assert response.data["realised_gain"] == pytest.approx(20.0)
+        assert response.data["unrealised_gain"] == pytest.approx(6 * 12 - 60.0)
+
+    def test_gains_restricted_if_not_owner(self, create_auth_client, custom_user_factory, etf_1):
+        client = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.id}) + "gains/"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,116 @@
+# networth_tracker/tests/test_prices.py
+
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.models import InstrumentPrice
+from networth_tracker.prices import prices_as_of
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prices():
+    InstrumentPrice.objects.bulk_create(
+        InstrumentPrice(ticker=ticker, date=datetime.date(2024, 6, day), close=close)
+        for ticker, day, close in [
+            ("VAS", 3, 95.0),
+            ("VAS", 5, 96.0),
+            ("VAS", 10, 97.0),
+            ("VGS", 4, 120.0),
+        ]
+    )
+
+
+class TestPricesAsOf:
+    def test_latest_on_or_before(self, prices, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            result = prices_as_of(["VAS", "vgs", "IVV"], datetime.date(2024, 6, 7))
+
+        assert result == {
+            "VAS": (datetime.date(2024, 6, 5), 96.0),
+            "VGS": (datetime.date(2024, 6, 4), 120.0),
+        }
+
+    def test_before_first_price(self, prices):
+        assert prices_as_of(["VAS"], datetime.date(2024, 6, 1)) == {}
+
+    def test_endpoint(self, create_auth_client, custom_user_1, prices):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("prices"), {"tickers": "VAS,VGS", "date": "2024-06-10"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["VAS"] == {"date": datetime.date(2024, 6, 10), "close": 97.0}
+        assert response.data["VGS"]["close"] == 120.0
+
+    def test_endpoint_requires_tickers(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("prices"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestLoadPricesCommand:
+    def test_load_multi_ticker_file(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        path.write_text(
+            "Symbol,Date,Close\nvas,2024-06-03,95.5\nVGS,2024-06-03,120\nVAS,2024-06-04,96\n"
+        )
+
+        call_command("load_prices", str(path), "--batch-size", "2", stdout=StringIO())
+
+        assert InstrumentPrice.objects.count() == 3
+        assert InstrumentPrice.objects.get(ticker="VAS", date="2024-06-03").close == 95.5
+
+    def test_reload_overwrites(self, tmp_path, prices):
+        path = tmp_path / "vas.csv"
+        path.write_text("Date,Open,Close\n05/06/2024,1,99.0\n05/06/2024,1,98.0\n")
+
+        call_command(
+            "load_prices",
+            str(path),
+            "--ticker",
+            "VAS",
+            "--date-format",
+            "%d/%m/%Y",
+            stdout=StringIO(),
+        )
+
+        assert InstrumentPrice.objects.filter(ticker="VAS").count() == 3
+        assert InstrumentPrice.objects.get(ticker="VAS", date="2024-06-05").close == 98.0
+
+    def test_invalid_row(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        path.write_text("ticker,date,close\nVAS,2024-06-03,n/a\n")
+
+        with pytest.raises(CommandError, match=":2:"):
+            call_command("load_prices", str(path), stdout=StringIO())
+
+    def test_missing_ticker_column(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        path.write_text("date,close\n2024-06-03,1\n")
+
+        with pytest.raises(CommandError, match="--ticker"):
+            call_command("load_prices", str(path), stdout=StringIO())
+
+
+class TestEtfGainsWithStoredPrice:
+    def test_unrealised_gain_uses_latest_price(
+        self, create_auth_client, custom_user_1, etf_factory, etf_transaction_factory, prices
+    ):
+        etf = etf_factory(user=custom_user_1, ticker="vas", units_held=0, average_cost=0)
+        etf_transaction_factory(
+            etf=etf, transaction_type=0, units=10, order_cost=900.0, brokerage=0.0
+        )
+
+        client = create_auth_client(custom_user_1)
+        url = reverse("etfs-detail", kwargs={"pk": etf.id}) + "gains/"
+        response = client.get(url)
+
+        assert response.data["unrealised_gain"] == pytest.approx(10 * 97.0 - 900.0)
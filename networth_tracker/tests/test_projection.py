@@ -0,0 +1,81 @@
+# networth_tracker/tests/test_projection.py
+
+import numpy as np
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from networth_tracker.projection import PERCENTILES, project, simulate
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSimulation:
+    def test_without_volatility_compounds_exactly(self):
+        balances = simulate(1000.0, 0.1, 0.0, 100.0, 2, 5, seed=1)
+
+        np.testing.assert_allclose(balances[:, 0], [1000.0, 1200.0, 1420.0])
+
+    def test_percentiles_are_ordered(self):
+        percentiles = project(50000.0, 0.07, 0.12, 5000.0, 30, 2000, 0)
+
+        assert percentiles.shape == (len(PERCENTILES), 31)
+        assert np.all(np.diff(percentiles[:, -1]) > 0)
+
+    def test_cached_by_inputs(self):
+        assert project(1.0, 0.05, 0.1, 0.0, 3, 500, 7) is project(1.0, 0.05, 0.1, 0.0, 3, 500, 7)
+
+    @override_settings(SUPER_PROJECTION_PARALLEL_PATHS=1000, SUPER_PROJECTION_WORKERS=2)
+    def test_parallel_chunks(self):
+        percentiles = project(10000.0, 0.06, 0.1, 0.0, 10, 3500, 3)
+        median = np.percentile(simulate(10000.0, 0.06, 0.1, 0.0, 10, 20000, seed=5), 50, axis=1)
+
+        assert percentiles.shape == (len(PERCENTILES), 11)
+        # Both estimate the same distribution
+        np.testing.assert_allclose(percentiles[2], median, rtol=0.05)
+
+
+class TestProjectionEndpoint:
+    @pytest.fixture
+    def superannuation(self, superannuation_factory, account_factory, custom_user_1):
+        today = timezone.localdate()
+        account_factory(user=custom_user_1, date_of_birth=today.replace(year=today.year - 50))
+        return superannuation_factory(
+            user=custom_user_1, balance=100000.0, market_returns=7.0, voluntary_contributions=0
+        )
+
+    def test_projection(self, create_auth_client, custom_user_1, superannuation):
+        client = create_auth_client(custom_user_1)
+        url = reverse("superannuations-detail", kwargs={"pk": superannuation.id}) + "projection/"
+        response = client.get(url, {"paths": 1000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["age"] for row in response.data] == list(range(50, 61))
+        assert response.data[0]["p50"] == pytest.approx(100000.0)
+        assert response.data[-1]["p10"] < response.data[-1]["p50"] < response.data[-1]["p90"]
+
+    def test_requires_account(self, create_auth_client, custom_user_1, superannuation_1):
+        client = create_auth_client(custom_user_1)
+        url = reverse("superannuations-detail", kwargs={"pk": superannuation_1.id}) + "projection/"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_paths(self, create_auth_client, custom_user_1, superannuation):
+        client = create_auth_client(custom_user_1)
+        url = reverse("superannuations-detail", kwargs={"pk": superannuation.id}) + "projection/"
+        response = client.get(url, {"paths": 10**9})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "paths" in response.data
+
+    def test_restricted_if_not_owner(
+        self, create_auth_client, custom_user_factory, superannuation
+    ):
+        client = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+        url = reverse("superannuations-detail", kwargs={"pk": superannuation.id}) + "projection/"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,409 @@
+# networth_tracker/tests/test_query_budgets.py
+
+import datetime
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.authtoken.models import Token
+
+from networth_tracker import urls
+from networth_tracker.models import (
+    BankAccount,
+    Etf,
+    EtfTransaction,
+    InstrumentPrice,
+    NetWorthSnapshot,
+    Superannuation,
+    TransactionImport,
+)
+from networth_tracker.query_budgets import QUERY_BUDGETS, QueryBudgetExceeded
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "budget-password"
+
+
+def _seed(user, etf, count):
+    """
+    Add `count` rows of every user-owned model.
+    """
+
+    start = NetWorthSnapshot.objects.filter(user=user).count()
+    BankAccount.objects.bulk_create(
+        BankAccount(user=user, bank="Bank", account_name="Savings", balance=1.0, interest_rate=1.0)
+        for _ in range(count)
+    )
+    Etf.objects.bulk_create(
+        Etf(user=user, ticker=f"T{start + index}", fund_name="Fund", units_held=0, average_cost=0)
+        for index in range(count)
+    )
+    for index in range(count):
+        EtfTransaction.objects.create(
+            etf=etf,
+            transaction_type=index % 2,
+            order_date=datetime.date(2024, 1, 1) + datetime.timedelta(days=start + index),
+            units=1,
+            order_cost=10.0,
+            brokerage=1.0,
+        )
+    Superannuation.objects.bulk_create(
+        Superannuation(
+            user=user,
+            provider="Super",
+            investment_plan="Growth",
+            balance=1.0,
+            market_returns=7.0,
+            voluntary_contributions=0.0,
+        )
+        for _ in range(count)
+    )
+    NetWorthSnapshot.objects.bulk_create(
+        NetWorthSnapshot(
+            user=user,
+            date=datetime.date(2024, 1, 1) + datetime.timedelta(days=start + index),
+            cash=1.0,
+            etfs=1.0,
+            superannuation=1.0,
+            total=3.0,
+        )
+        for index in range(count)
+    )
+    InstrumentPrice.objects.bulk_create(
+        InstrumentPrice(
+            ticker="VAS",
+            date=datetime.date(2024, 1, 1) + datetime.timedelta(days=start + index),
+            close=90.0,
+        )
+        for index in range(count)
+    )
+
+
+def _bank_account(ctx):
+    return BankAccount.objects.create(
+        user=ctx["user"], bank="Bank", account_name="Target", balance=1.0, interest_rate=1.0
+    )
+
+
+def _etf(ctx):
+    return Etf.objects.create(
+        user=ctx["user"], ticker="TARGET", fund_name="Fund", units_held=0, average_cost=0
+    )
+
+
+def _etf_with_transactions(ctx):
+    etf = _etf(ctx)
+    for _ in range(ctx["rows"]):
+        EtfTransaction.objects.create(
+            etf=etf,
+            transaction_type=0,
+            order_date=datetime.date(2024, 1, 1),
+            units=1,
+            order_cost=1,
+        )
+    return etf
+
+
+def _transaction(ctx):
+    return EtfTransaction.objects.create(
+        etf=ctx["etf"],
+        transaction_type=0,
+        order_date=datetime.date(2030 + ctx["run"], 1, 1),
+        units=1,
+        order_cost=10.0,
+    )
+
+
+def _superannuation(ctx):
+    return Superannuation.objects.create(
+        user=ctx["user"],
+        provider="Super",
+        investment_plan="Target",
+        balance=1.0,
+        market_returns=7.0,
+        voluntary_contributions=0.0,
+    )
+
+
+def _detail(name, factory):
+    return lambda ctx: reverse(name, kwargs={"pk": factory(ctx).pk})
+
+
+BANK_ACCOUNT = {"bank": "Bank", "account_name": "New", "balance": 1.0, "interest_rate": 1.0}
+SUPERANNUATION = {
+    "provider": "Super",
+    "investment_plan": "New",
+    "balance": 1.0,
+    "market_returns": 7.0,
+    "voluntary_contributions": 0.0,
+}
+
+
+def _transaction_data(ctx):
+    return {
+        "etf": ctx["etf"].pk,
+        "transaction_type": 0,
+        "order_date": f"{2030 + ctx['run']}-01-02",
+        "units": 1,
+        "order_cost": 10.0,
+    }
+
+
+def _upload(ctx):
+    return {"file": SimpleUploadedFile("trades.csv", b"date,code,side,units,value\n")}
+
+
+def _import_status(ctx):
+    transaction_import = TransactionImport.objects.create(user=ctx["user"], file="x.csv")
+    return reverse("etf-transactions-get-import", kwargs={"import_id": transaction_import.pk})
+
+
+# (view name, method, url, data); `url` and `data` may be callables of the context
+CASES = [
+    ("api-root", "get", reverse("api-root"), None),
+    ("rest_framework:login", "get", reverse("rest_framework:login"), None),
+    ("rest_framework:logout", "post", reverse("rest_framework:logout"), None),
+    (
+        "api_token_auth",
+        "post",
+        reverse("api_token_auth"),
+        lambda ctx: {"username": ctx["user"].email, "password": PASSWORD},
+    ),
+    (
+        "register",
+        "post",
+        reverse("register"),
+        lambda ctx: {"email": f"new{ctx['run']}@user.com", "password": "x"},
+    ),
+    ("networth", "get", reverse("networth"), None),
+    ("networth-history", "get", reverse("networth-history"), None),
+    ("prices", "get", reverse("prices") + "?tickers=VAS,VGS", None),
+    ("dashboard", "get", reverse("dashboard"), None),
+    (
+        "batch",
+        "post",
+        reverse("batch"),
+        lambda ctx: {
+            "requests": [
+                {"path": reverse("networth")},
+                {"path": reverse("bank-accounts-list")},
+                {
+                    "method": "PATCH",
+                    "path": reverse("accounts-detail", kwargs={"pk": ctx["account"].pk}),
+                    "body": {"salary": 2.0},
+                },
+            ]
+        },
+    ),
+    ("accounts-list", "get", reverse("accounts-list"), None),
+    ("accounts-list", "post", reverse("accounts-list"), {"first_name": "A"}),
+    (
+        "accounts-detail",
+        "get",
+        lambda ctx: reverse("accounts-detail", kwargs={"pk": ctx["account"].pk}),
+        None,
+    ),
+    (
+        "accounts-detail",
+        "patch",
+        lambda ctx: reverse("accounts-detail", kwargs={"pk": ctx["account"].pk}),
+        {"salary": 2.0},
+    ),
+    (
+        "accounts-detail",
+        "delete",
+        lambda ctx: reverse("accounts-detail", kwargs={"pk": ctx["account"].pk}),
+        None,
+    ),
+    ("bank-accounts-list", "get", reverse("bank-accounts-list"), None),
+    ("bank-accounts-list", "post", reverse("bank-accounts-list"), BANK_ACCOUNT),
+    ("bank-accounts-export", "get", reverse("bank-accounts-export"), None),
+    ("bank-accounts-detail", "get", _detail("bank-accounts-detail", _bank_account), None),
+    (
+        "bank-accounts-detail",
+        "patch",
+        _detail("bank-accounts-detail", _bank_account),
+        {"balance": 2.0},
+    ),
+    ("bank-accounts-detail", "delete", _detail("bank-accounts-detail", _bank_account), None),
+    ("etfs-list", "get", reverse("etfs-list"), None),
+    (
+        "etfs-list",
+        "post",
+        reverse("etfs-list"),
+        lambda ctx: {"ticker": f"NEW{ctx['run']}", "fund_name": "Fund"},
+    ),
+    ("etfs-export", "get", reverse("etfs-export"), None),
+    ("etfs-detail", "get", _detail("etfs-detail", _etf), None),
+    ("etfs-detail", "patch", _detail("etfs-detail", _etf), {"fund_name": "Renamed"}),
+    ("etfs-detail", "delete", _detail("etfs-detail", _etf_with_transactions), None),
+    (
+        "etfs-get-etf-gains",
+        "get",
+        lambda ctx: reverse("etfs-get-etf-gains", kwargs={"pk": ctx["etf"].pk}),
+        None,
+    ),
+    (
+        "etfs-get-etf-transactions",
+        "get",
+        lambda ctx: reverse("etfs-get-etf-transactions", kwargs={"pk": ctx["etf"].pk}),
+        None,
+    ),
+    ("etf-transactions-list", "get", reverse("etf-transactions-list"), None),
+    ("etf-transactions-list", "post", reverse("etf-transactions-list"), _transaction_data),
+    ("etf-transactions-export", "get", reverse("etf-transactions-export"), None),
+    (
+        "etf-transactions-import-transactions",
+        "post",
+        reverse("etf-transactions-import-transactions"),
+        _upload,
+    ),
+    ("etf-transactions-get-import", "get", _import_status, None),
+    ("etf-transactions-detail", "get", _detail("etf-transactions-detail", _transaction), None),
+    (
+        "etf-transactions-detail",
+        "patch",
+        _detail("etf-transactions-detail", _transaction),
+        {"units": 2},
+    ),
+    ("etf-transactions-detail", "delete", _detail("etf-transactions-detail", _transaction), None),
+    ("superannuations-list", "get", reverse("superannuations-list"), None),
+    ("superannuations-list", "post", reverse("superannuations-list"), SUPERANNUATION),
+    ("superannuations-export", "get", reverse("superannuations-export"), None),
+    ("superannuations-detail", "get", _detail("superannuations-detail", _superannuation), None),
+    (
+        "superannuations-detail",
+        "patch",
+        _detail("superannuations-detail", _superannuation),
+        {"balance": 2.0},
+    ),
+    ("superannuations-detail", "delete", _detail("superannuations-detail", _superannuation), None),
+    (
+        "superannuations-get-projection",
+        "get",
+        _detail("superannuations-get-projection", _superannuation),
+        None,
+    ),
+]
+
+
+# Rows of every model added before the first request; the second request runs with 10x as many
+ROWS = 2
+
+
+@pytest.fixture
+def query_counts(settings, tmp_path, create_auth_client, custom_user_factory, account_factory):
+    """
+    Return a function running a request with `ROWS` and then `10 * ROWS` rows
+    of every model and returning the number of queries of both runs, and the
+    budget the request set for itself if any.
+    """
+
+    settings.MEDIA_ROOT = tmp_path
+    # The browsable API pages need static files, which are not collected for tests
+    settings.STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+    # Worker threads would neither see the test's transaction nor be counted
+    settings.DASHBOARD_MAX_WORKERS = 0
+    user = custom_user_factory(email="budget@user.com")
+    user.set_password(PASSWORD)
+    user.save()
+    account = account_factory(user=user)
+    Token.objects.create(user=user)
+    etf = Etf.objects.create(
+        user=user, ticker="VAS", fund_name="Fund", units_held=0, average_cost=0
+    )
+    client = create_auth_client(user)
+
+    def _query_counts(method, url, data):
+        counts = []
+        for run, rows in enumerate((ROWS, 9 * ROWS)):
+            _seed(user, etf, rows)
+            ctx = {
+                "user": user,
+                "account": account,
+                "etf": etf,
+                "run": run,
+                "rows": ROWS * 10**run,
+            }
+            request_url = url(ctx) if callable(url) else url
+            request_data = data(ctx) if callable(data) else data
+            request_format = "multipart" if request_data and "file" in request_data else "json"
+            cache.clear()
+            client.force_login(user)
+
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, method)(
+                    request_url, request_data, format=request_format
+                )
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            assert response.status_code < 500
+            counts.append(len(context.captured_queries))
+
+        return counts, getattr(response.wsgi_request, "query_budget", None)
+
+    return _query_counts
+
+
+def _route_names(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            yield from _route_names(pattern.url_patterns, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield namespace + pattern.name
+
+
+class TestQueryBudgets:
+    @pytest.mark.parametrize(
+        "view_name, method, url, data",
+        CASES,
+        ids=[f"{method.upper()} {view_name}" for view_name, method, _, _ in CASES],
+    )
+    def test_query_count_is_constant_and_within_budget(
+        self, query_counts, view_name, method, url, data
+    ):
+        counts, budget = query_counts(method, url, data)
+        assert counts[0] == counts[1], f"Query count grows with rows: {counts}"
+        assert counts[1] <= (budget or QUERY_BUDGETS[view_name][method.upper()])
+
+    def test_every_route_has_a_budget_and_a_case(self):
+        routes = set(_route_names(urls.urlpatterns))
+        exercised = {view_name for view_name, _, _, _ in CASES}
+
+        assert routes - set(QUERY_BUDGETS) == set()
+        assert routes - exercised == set()
+
+
+class TestQueryBudgetMiddleware:
+    @pytest.fixture
+    def over_budget(self, monkeypatch):
+        monkeypatch.setitem(QUERY_BUDGETS, "networth", {"GET": 0})
+
+    def test_logs_requests_over_budget(
+        self, create_auth_client, custom_user_1, over_budget, caplog
+    ):
+        client = create_auth_client(custom_user_1)
+        with caplog.at_level(logging.WARNING, logger="networth_tracker.query_budgets"):
+            response = client.get(reverse("networth"))
+
+        assert response.status_code == 200
+        assert "GET networth ran" in caplog.text
+
+    def test_does_not_log_requests_within_budget(self, create_auth_client, custom_user_1, caplog):
+        client = create_auth_client(custom_user_1)
+        with caplog.at_level(logging.WARNING, logger="networth_tracker.query_budgets"):
+            client.get(reverse("networth"))
+
+        assert caplog.text == ""
+
+    def test_raises_in_raise_mode(self, create_auth_client, custom_user_1, over_budget, settings):
+        settings.QUERY_BUDGET_MODE = "raise"
+        client = create_auth_client(custom_user_1)
+
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(reverse("networth"))
@@ -0,0 +1,93 @@
+# networth_tracker/tests/test_query_plans.py
+
+import datetime
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from networth_tracker.models import BankAccount
+from networth_tracker.tests.explain import capture_selects, table_scans
+
+pytestmark = pytest.mark.django_db
+
+# Tables whose rows grow with the number of users
+TABLES = {
+    f"networth_tracker_{model}"
+    for model in (
+        "account",
+        "bankaccount",
+        "etf",
+        "etftransaction",
+        "networthsnapshot",
+        "parcel",
+        "parceldisposal",
+        "portfoliovaluation",
+        "superannuation",
+        "transactionimport",
+    )
+}
+
+HOT_PATHS = [
+    ("accounts-list", {}),
+    ("accounts-detail", {"pk": "account"}),
+    ("bank-accounts-list", {}),
+    ("bank-accounts-detail", {"pk": "bank_account"}),
+    ("bank-accounts-export", {}),
+    ("etfs-list", {}),
+    ("etfs-detail", {"pk": "etf"}),
+    ("etfs-get-etf-transactions", {"pk": "etf"}),
+    ("etfs-get-etf-gains", {"pk": "etf"}),
+    ("etf-transactions-list", {}),
+    ("etf-transactions-detail", {"pk": "etf_transaction"}),
+    ("etf-transactions-export", {}),
+    ("superannuations-list", {}),
+    ("superannuations-detail", {"pk": "superannuation"}),
+    ("networth", {}),
+    ("networth-history", {}),
+]
+
+
+@pytest.fixture
+def rows(
+    custom_user_1,
+    account_factory,
+    bank_account_factory,
+    etf_factory,
+    etf_transaction_factory,
+    superannuation_factory,
+):
+    etf = etf_factory(user=custom_user_1)
+    return {
+        "account": account_factory(user=custom_user_1),
+        "bank_account": bank_account_factory(user=custom_user_1),
+        "etf": etf,
+        "etf_transaction": etf_transaction_factory(
+            etf=etf, transaction_type=0, order_date=datetime.date(2024, 1, 1)
+        ),
+        "superannuation": superannuation_factory(user=custom_user_1),
+    }
+
+
+@pytest.mark.parametrize(
+    "view_name, kwargs", HOT_PATHS, ids=[view_name for view_name, _ in HOT_PATHS]
+)
+def test_hot_paths_use_indexes(create_auth_client, custom_user_1, rows, view_name, kwargs):
+    client = create_auth_client(custom_user_1)
+    url = reverse(view_name, kwargs={key: rows[value].pk for key, value in kwargs.items()})
+
+    with capture_selects() as statements:
+        response = client.get(url)
+        b"".join(response.streaming_content) if response.streaming else response.content
+
+    assert response.status_code == 200
+    assert statements
+    assert table_scans(statements, TABLES) == [], f"Table scan on {connection.vendor}"
+
+
+def test_reports_table_scans(custom_user_1):
+    with capture_selects() as statements:
+        list(BankAccount.objects.filter(bank="ANZ"))
+        list(BankAccount.objects.filter(user=custom_user_1))
+
+    assert table_scans(statements, TABLES) == [("networth_tracker_bankaccount", statements[0][0])]
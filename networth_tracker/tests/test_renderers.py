@@ -0,0 +1,117 @@
+# networth_tracker/tests/test_renderers.py
+
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from networth_tracker.api import renderers
+from networth_tracker.api.renderers import FastJSONParser, FastJSONRenderer
+
+DATA = ReturnList(
+    [
+        ReturnDict(
+            {
+                "id": 1,
+                "name": "Café \u2028\u2029 \U0001f4b0",
+                "balance": 1000.5,
+                "rate": Decimal("1.25"),
+                "order_date": datetime.date(2024, 1, 2),
+                "created_at": datetime.datetime(
+                    2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+                ),
+                "label": gettext_lazy("Not found."),
+                "gain": np.float64(2.5),
+                "empty": None,
+                "flags": [True, False],
+                7: "key",
+            },
+            serializer=None,
+        )
+    ],
+    serializer=None,
+)
+
+
+class TestFastJSONRenderer:
+    def test_output_is_byte_identical_to_drf(self):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_indented_output_falls_back_to_drf(self):
+        context = {"indent": 4}
+
+        assert FastJSONRenderer().render(DATA, None, context) == JSONRenderer().render(
+            DATA, None, context
+        )
+
+    def test_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, "orjson", None)
+
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_no_content(self):
+        assert FastJSONRenderer().render(None) == b""
+
+
+class TestFastJSONParser:
+    @pytest.mark.parametrize("content", [b'{"a": [1, 2.5, "\xc3\xa9", null]}', b"[]"])
+    def test_matches_drf(self, content):
+        assert FastJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(
+            io.BytesIO(content)
+        )
+
+    @pytest.mark.parametrize("content", [b"{", b'{"a": NaN}', b""])
+    def test_invalid_json(self, content):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(content))
+
+    def test_other_encodings_fall_back_to_drf(self):
+        content = '{"name": "Café"}'.encode("latin-1")
+
+        data = FastJSONParser().parse(io.BytesIO(content), None, {"encoding": "latin-1"})
+
+        assert data == {"name": "Café"}
+
+
+@pytest.mark.django_db
+class TestNegotiation:
+    def test_json_by_default(self, create_auth_client, custom_user_1, bank_account_1):
+        response = create_auth_client(custom_user_1).get(reverse("bank-accounts-list"))
+
+        assert response["Content-Type"] == "application/json"
+        assert response.json()["results"][0]["id"] == bank_account_1.pk
+
+    @pytest.mark.parametrize(
+        "params, headers",
+        [({}, {"HTTP_ACCEPT": "application/msgpack"}), ({"format": "msgpack"}, {})],
+    )
+    def test_msgpack(self, create_auth_client, custom_user_1, bank_account_1, params, headers):
+        msgpack = pytest.importorskip("msgpack")
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+
+        response = client.get(url, params, **headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == client.get(url).json()
+
+    def test_json_request_bodies(self, create_auth_client, custom_user_1):
+        data = {"bank": "Bank", "account_name": "Café", "balance": 1.5, "interest_rate": 1}
+
+        response = create_auth_client(custom_user_1).post(
+            reverse("bank-accounts-list"), json.dumps(data), content_type="application/json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["account_name"] == "Café"
@@ -0,0 +1,112 @@
+# networth_tracker/tests/test_representation.py
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.viewsets import ModelViewSet
+
+from networth_tracker.api.representation import ValuesRepresentation
+from networth_tracker.api.viewsets import (
+    AccountViewSet,
+    BankAccountViewSet,
+    EtfTransactionViewSet,
+    EtfViewSet,
+    SuperannuationViewSet,
+)
+from networth_tracker.models import Etf
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def rows(
+    custom_user_1,
+    account_factory,
+    bank_account_factory,
+    etf_factory,
+    etf_transaction_factory,
+    superannuation_factory,
+):
+    account_factory(user=custom_user_1)
+    for index in range(3):
+        bank_account_factory(user=custom_user_1, balance=1000.5 + index)
+        etf = etf_factory(user=custom_user_1, ticker=f"T{index}")
+        etf_transaction_factory(etf=etf, transaction_type=0, brokerage=None if index else 9.95)
+        superannuation_factory(user=custom_user_1)
+
+
+class TestValuesListParity:
+    @pytest.mark.parametrize(
+        "viewset, basename, params",
+        [
+            (AccountViewSet, "accounts", {}),
+            (BankAccountViewSet, "bank-accounts", {"ordering": "balance"}),
+            (EtfViewSet, "etfs", {"page_size": 2}),
+            (EtfTransactionViewSet, "etf-transactions", {}),
+            (SuperannuationViewSet, "superannuations", {}),
+        ],
+    )
+    def test_output_is_byte_identical_to_serializer(
+        self, monkeypatch, create_auth_client, custom_user_1, rows, viewset, basename, params
+    ):
+        client = create_auth_client(custom_user_1)
+        url = reverse(f"{basename}-list")
+
+        fast = client.get(url, params)
+        monkeypatch.setattr(viewset, "list", ModelViewSet.list)
+        slow = client.get(url, params)
+
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+
+    @pytest.mark.parametrize("time_zone", ["UTC", "Australia/Sydney"])
+    def test_datetimes_match_the_serializer_in_any_time_zone(
+        self, monkeypatch, settings, create_auth_client, custom_user_1, rows, time_zone
+    ):
+        settings.TIME_ZONE = time_zone
+        client = create_auth_client(custom_user_1)
+        url = reverse("etf-transactions-list")
+
+        fast = client.get(url)
+        monkeypatch.setattr(EtfTransactionViewSet, "list", ModelViewSet.list)
+        slow = client.get(url)
+
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+        assert fast.data["results"][0]["created_at"].endswith("Z") == (time_zone == "UTC")
+
+    def test_one_query_regardless_of_row_count(
+        self, create_auth_client, custom_user_1, bank_account_factory
+    ):
+        client = create_auth_client(custom_user_1)
+        url = reverse("bank-accounts-list")
+
+        def _queries():
+            with CaptureQueriesContext(connection) as context:
+                client.get(url)
+            # Leave out the aggregate behind the conditional GET validators
+            return [
+                query
+                for query in context.captured_queries
+                if "bankaccount" in query["sql"] and "COUNT(" not in query["sql"]
+            ]
+
+        bank_account_factory(user=custom_user_1)
+        assert len(_queries()) == 1
+        for _ in range(5):
+            bank_account_factory(user=custom_user_1)
+        assert len(_queries()) == 1
+
+    def test_method_fields_are_rejected(self):
+        class MethodSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Etf
+                fields = ("id", "label")
+
+        with pytest.raises(ImproperlyConfigured):
+            ValuesRepresentation(MethodSerializer)
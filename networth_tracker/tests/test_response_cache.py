@@ -0,0 +1,169 @@
+# networth_tracker/tests/test_response_cache.py
+
+import datetime
+
+import pytest
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.api import response_cache
+from networth_tracker.api.response_cache import SharedCacheBackend
+from networth_tracker.data_version import VERSION_KEY, bump_data_version, get_data_version
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def local_backend(settings):
+    # The response cache is opt-in
+    settings.RESPONSE_CACHE_BACKEND = "local"
+
+
+@pytest.fixture
+def client(create_auth_client, custom_user_1):
+    return create_auth_client(custom_user_1)
+
+
+@pytest.fixture
+def stats():
+    response_cache.stats.reset()
+    yield response_cache.stats
+    response_cache.stats.reset()
+
+
+def _row_queries(client, url, table, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    return response, [query for query in context.captured_queries if table in query["sql"]]
+
+
+class TestResponseCache:
+    def test_hit_reads_no_rows(self, client, custom_user_1, bank_account_factory, stats):
+        bank_account_factory.create_batch(3, user=custom_user_1)
+        url = reverse("bank-accounts-list")
+
+        first, _ = _row_queries(client, url, "bankaccount")
+        second, queries = _row_queries(client, url, "bankaccount")
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+        assert queries == []
+        assert stats.as_dict() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    def test_write_invalidates(self, client, custom_user_1, bank_account_factory):
+        bank_account = bank_account_factory(user=custom_user_1)
+        url = reverse("bank-accounts-list")
+        client.get(url)
+
+        client.patch(
+            reverse("bank-accounts-detail", kwargs={"pk": bank_account.pk}), {"balance": 1.0}
+        )
+        response = client.get(url)
+
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["balance"] == 1.0
+
+    def test_transaction_invalidates_etf_holdings(self, client, etf_1, etf_transaction_factory):
+        url = reverse("etfs-detail", kwargs={"pk": etf_1.pk})
+        client.get(url)
+
+        etf_transaction_factory(etf=etf_1, order_date=datetime.date(2024, 1, 1))
+
+        assert client.get(url)["X-Cache"] == "MISS"
+
+    def test_keyed_by_query(self, client, custom_user_1, bank_account_factory):
+        bank_account_factory(user=custom_user_1, bank="ANZ")
+        url = reverse("bank-accounts-list")
+        client.get(url)
+
+        assert client.get(url, {"bank": "NAB"})["X-Cache"] == "MISS"
+        assert client.get(url, {"bank": "NAB"}).data["results"] == []
+
+    def test_keyed_by_user(self, client, create_auth_client, custom_user_factory, bank_account_1):
+        url = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+        assert client.get(url).status_code == status.HTTP_200_OK
+
+        other = create_auth_client(custom_user_factory(email="anotheruser@user.com"))
+
+        assert other.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_not_modified_on_hit(self, client, bank_account_1):
+        url = reverse("bank-accounts-detail", kwargs={"pk": bank_account_1.pk})
+        response = client.get(url)
+
+        revalidated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        assert revalidated["X-Cache"] == "HIT"
+
+    def test_superusers_bypass(self, create_auth_client, custom_user_factory):
+        client = create_auth_client(custom_user_factory(is_staff=True, is_superuser=True))
+        response = client.get(reverse("bank-accounts-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Cache" not in response
+
+    def test_disabled(self, client, settings):
+        settings.RESPONSE_CACHE_BACKEND = None
+
+        assert "X-Cache" not in client.get(reverse("bank-accounts-list"))
+
+    def test_shared_backend(self, client, monkeypatch):
+        monkeypatch.setattr(response_cache, "_backend", SharedCacheBackend("default", 60))
+        url = reverse("superannuations-list")
+
+        assert client.get(url)["X-Cache"] == "MISS"
+        assert client.get(url)["X-Cache"] == "HIT"
+
+    def test_shared_backend_keeps_the_versions(
+        self, client, settings, monkeypatch, custom_user_1, superannuation_factory
+    ):
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "shared",
+            },
+        }
+        settings.RESPONSE_CACHE_BACKEND = "shared"
+        monkeypatch.setattr(response_cache, "_backend", SharedCacheBackend("shared", 60))
+        url = reverse("superannuations-list")
+        assert client.get(url)["X-Cache"] == "MISS"
+
+        # Another process has a default cache of its own
+        cache.clear()
+        assert client.get(url)["X-Cache"] == "HIT"
+
+        # ...and its writes reach the version every process reads
+        superannuation_factory(user=custom_user_1)
+        cache.clear()
+        assert client.get(url)["X-Cache"] == "MISS"
+        assert caches["shared"].get(VERSION_KEY.format(user_id=custom_user_1.pk)) is not None
+
+
+class TestDataVersion:
+    def test_bump_replaces_version(self, custom_user_1):
+        version = get_data_version(custom_user_1.pk)
+
+        assert get_data_version(custom_user_1.pk) == version
+        bump_data_version(custom_user_1.pk)
+        assert get_data_version(custom_user_1.pk) != version
+
+    def test_bumped_again_on_commit(self, custom_user_1, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_data_version(custom_user_1.pk)
+            version = get_data_version(custom_user_1.pk)
+
+        assert get_data_version(custom_user_1.pk) != version
+
+    def test_eviction_does_not_reuse_version(self, custom_user_1):
+        version = get_data_version(custom_user_1.pk)
+
+        cache.delete(VERSION_KEY.format(user_id=custom_user_1.pk))
+
+        assert get_data_version(custom_user_1.pk) != version
@@ -0,0 +1,53 @@
+# networth_tracker/tests/test_snapshots.py
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from networth_tracker.models import NetWorthSnapshot
+from networth_tracker.networth import compute_networth, compute_networth_many
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def users(custom_user_factory, bank_account_factory, etf_factory, superannuation_factory):
+    users = [custom_user_factory(email=f"user{index}@user.com") for index in range(3)]
+    bank_account_factory(user=users[0], balance=100.0)
+    bank_account_factory(user=users[0], balance=50.0)
+    etf_factory(user=users[1], units_held=4, average_cost=10.0)
+    superannuation_factory(user=users[1], balance=1000.0)
+    return users
+
+
+class TestSnapshotNetworthCommand:
+    def test_grouped_totals_match_per_user_totals(self, users):
+        totals = compute_networth_many([user.pk for user in users])
+
+        for user in users:
+            assert totals[user.pk] == compute_networth(user.pk)
+
+    def test_stores_snapshot_per_user(self, users):
+        call_command(
+            "snapshot_networth", "--date", "2024-06-30", "--chunk-size", "2", stdout=StringIO()
+        )
+
+        snapshots = NetWorthSnapshot.objects.filter(date="2024-06-30")
+        assert snapshots.count() == 3
+        assert snapshots.get(user=users[0]).cash == 150.0
+        assert snapshots.get(user=users[1]).total == 1040.0
+        assert snapshots.get(user=users[2]).total == 0.0
+
+    def test_rerun_overwrites_same_day(self, users, bank_account_factory):
+        call_command("snapshot_networth", "--date", "2024-06-30", stdout=StringIO())
+        bank_account_factory(user=users[2], balance=75.0)
+        call_command("snapshot_networth", "--date", "2024-06-30", stdout=StringIO())
+
+        assert NetWorthSnapshot.objects.count() == 3
+        assert NetWorthSnapshot.objects.get(user=users[2]).cash == 75.0
+
+    def test_invalid_date(self):
+        with pytest.raises(CommandError):
+            call_command("snapshot_networth", "--date", "30/06/2024", stdout=StringIO())
@@ -0,0 +1,49 @@
+# networth_tracker/tests/test_sqlite.py
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from networth_tracker.sqlite import pragma_statements
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite only"),
+]
+
+
+def _pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    wrapper = connection.copy()
+    wrapper.settings_dict = {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")}
+    yield wrapper
+    wrapper.close()
+
+
+class TestSQLitePragmas:
+    def test_applied_to_new_connections(self, file_connection, settings):
+        assert _pragma(file_connection, "journal_mode") == "wal"
+        assert _pragma(file_connection, "synchronous") == 1
+        assert _pragma(file_connection, "busy_timeout") == settings.SQLITE_PRAGMAS["busy_timeout"]
+        assert _pragma(file_connection, "cache_size") == settings.SQLITE_PRAGMAS["cache_size"]
+        assert _pragma(file_connection, "temp_store") == 2
+
+    def test_settings_driven(self, file_connection, settings):
+        settings.SQLITE_PRAGMAS = {"synchronous": "FULL"}
+
+        assert _pragma(file_connection, "journal_mode") == "delete"
+        assert _pragma(file_connection, "synchronous") == 2
+
+    @pytest.mark.parametrize(
+        "pragmas",
+        [{"writable_schema": "ON"}, {"journal_mode": "WAL; DROP TABLE x"}],
+    )
+    def test_rejects_unsafe_pragmas(self, pragmas):
+        with pytest.raises(ImproperlyConfigured):
+            pragma_statements(pragmas)
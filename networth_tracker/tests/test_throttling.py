@@ -0,0 +1,98 @@
+# networth_tracker/tests/test_throttling.py
+
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+
+from networth_tracker.api.throttling import (
+    DailyRateThrottle,
+    GCRAUserRateThrottle,
+    MinuteRateThrottle,
+)
+
+REQUEST = SimpleNamespace(user=SimpleNamespace(pk=1, is_authenticated=True))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_throttle(clock):
+    class TenPerMinuteThrottle(GCRAUserRateThrottle):
+        scope = "test"
+        rate = "10/minute"
+        timer = clock
+
+    def _make_throttle():
+        # DRF creates a throttle per request
+        return TenPerMinuteThrottle()
+
+    return _make_throttle
+
+
+def _allowed(make_throttle, count):
+    return [make_throttle().allow_request(REQUEST, None) for _ in range(count)]
+
+
+class TestGCRAUserRateThrottle:
+    def test_allows_a_burst_of_the_rate(self, make_throttle):
+        assert _allowed(make_throttle, 11) == [True] * 10 + [False]
+
+    def test_refills_one_request_per_interval(self, make_throttle, clock):
+        _allowed(make_throttle, 10)
+
+        clock.now += 6
+        assert _allowed(make_throttle, 2) == [True, False]
+
+        clock.now += 60
+        assert _allowed(make_throttle, 11) == [True] * 10 + [False]
+
+    def test_wait(self, make_throttle, clock):
+        _allowed(make_throttle, 10)
+        clock.now += 1.5
+
+        throttle = make_throttle()
+        assert not throttle.allow_request(REQUEST, None)
+        assert throttle.wait() == pytest.approx(4.5)
+
+    def test_rejected_requests_do_not_consume(self, make_throttle, clock):
+        _allowed(make_throttle, 50)
+        clock.now += 6
+
+        assert _allowed(make_throttle, 1) == [True]
+
+    def test_state_is_one_integer(self, make_throttle):
+        _allowed(make_throttle, 10)
+
+        assert isinstance(cache.get("throttle_gcra_test_1"), int)
+
+    def test_users_are_throttled_separately(self, make_throttle):
+        _allowed(make_throttle, 10)
+        other = SimpleNamespace(user=SimpleNamespace(pk=2, is_authenticated=True))
+
+        assert make_throttle().allow_request(other, None)
+
+
+@pytest.mark.parametrize(
+    "throttle_class, scope, rate",
+    [
+        (MinuteRateThrottle, "user_minute", (200, 60)),
+        (DailyRateThrottle, "user_day", (10000, 86400)),
+    ],
+)
+def test_scopes_and_rates(throttle_class, scope, rate):
+    throttle = throttle_class()
+
+    assert throttle.scope == scope
+    assert (throttle.num_requests, throttle.duration) == rate
@@ -0,0 +1,83 @@
+# networth_tracker/tests/test_timeseries.py
+
+import datetime
+import math
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from networth_tracker.models import NetWorthSnapshot
+from networth_tracker.timeseries import lttb_indices
+
+pytestmark = pytest.mark.django_db
+
+
+class TestLttbIndices:
+    def test_keeps_endpoints_and_threshold(self):
+        x = np.arange(1000)
+        indices = lttb_indices(x, np.sin(x / 50), 50)
+
+        assert len(indices) == 50
+        assert indices[0] == 0 and indices[-1] == 999
+        assert np.all(np.diff(indices) > 0)
+
+    def test_keeps_spike(self):
+        y = np.zeros(1000)
+        y[500] = 100.0
+
+        assert 500 in lttb_indices(np.arange(1000), y, 20)
+
+    def test_short_series_is_returned_whole(self):
+        assert list(lttb_indices(range(5), range(5), 10)) == [0, 1, 2, 3, 4]
+
+
+class TestNetWorthHistoryView:
+    @pytest.fixture
+    def history(self, custom_user_1):
+        start = datetime.date(2015, 1, 1)
+        NetWorthSnapshot.objects.bulk_create(
+            NetWorthSnapshot(
+                user=custom_user_1,
+                date=start + datetime.timedelta(days=day),
+                cash=float(day),
+                etfs=0.0,
+                superannuation=0.0,
+                total=1000 * math.sin(day / 100) + day,
+            )
+            for day in range(3650)
+        )
+        return custom_user_1
+
+    def test_downsampled(self, create_auth_client, history):
+        client = create_auth_client(history)
+        response = client.get(reverse("networth-history"), {"points": 100})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 100
+        assert response.data[0]["date"] == datetime.date(2015, 1, 1)
+        # Every series is sampled at the same dates
+        assert all(
+            row["cash"] == (row["date"] - response.data[0]["date"]).days for row in response.data
+        )
+
+    def test_date_range(self, create_auth_client, history):
+        client = create_auth_client(history)
+        params = {"points": 500, "start": "2016-01-01", "end": "2016-01-31"}
+        response = client.get(reverse("networth-history"), params)
+
+        assert len(response.data) == 31
+
+    @pytest.mark.parametrize("points", ["2", "abc", "100000"])
+    def test_invalid_points(self, create_auth_client, custom_user_1, points):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("networth-history"), {"points": points})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_no_history(self, create_auth_client, custom_user_1):
+        client = create_auth_client(custom_user_1)
+        response = client.get(reverse("networth-history"))
+
+        assert response.data == []
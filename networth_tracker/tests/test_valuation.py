@@ -0,0 +1,66 @@
+# networth_tracker/tests/test_valuation.py
+
+import datetime
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from networth_tracker.models import InstrumentPrice, PortfolioValuation
+from networth_tracker.valuation import aggregate_by_user, load_holdings, value_holdings
+
+pytestmark = pytest.mark.django_db
+
+DATE = datetime.date(2024, 6, 28)
+
+
+@pytest.fixture
+def holdings(custom_user_factory, etf_factory):
+    first = custom_user_factory(email="first@user.com")
+    second = custom_user_factory(email="second@user.com")
+    etf_factory(user=first, ticker="vas", units_held=10, average_cost=90.0)
+    etf_factory(user=first, ticker="VGS", units_held=5, average_cost=100.0)
+    # No stored price, valued at cost
+    etf_factory(user=second, ticker="XYZ", units_held=2, average_cost=50.0)
+    InstrumentPrice.objects.bulk_create(
+        [
+            InstrumentPrice(ticker="VAS", date=DATE, close=100.0),
+            InstrumentPrice(ticker="VGS", date=DATE - datetime.timedelta(days=3), close=120.0),
+        ]
+    )
+    return first, second
+
+
+class TestValuation:
+    def test_value_holdings(self, holdings):
+        valuations = value_holdings(load_holdings(), DATE)
+        order = np.argsort(valuations["etf_id"])
+
+        np.testing.assert_allclose(valuations["market_value"][order], [1000.0, 600.0, 100.0])
+        np.testing.assert_allclose(valuations["unrealised_pnl"][order], [100.0, 100.0, 0.0])
+        np.testing.assert_allclose(valuations["weight"][order], [1000 / 1600, 600 / 1600, 1.0])
+
+    def test_aggregate_by_user(self, holdings):
+        first, second = holdings
+        users, market_value, cost_basis, pnl = aggregate_by_user(
+            value_holdings(load_holdings(), DATE)
+        )
+
+        assert list(users) == [first.pk, second.pk]
+        np.testing.assert_allclose(market_value, [1600.0, 100.0])
+        np.testing.assert_allclose(cost_basis, [1400.0, 100.0])
+        np.testing.assert_allclose(pnl, [200.0, 0.0])
+
+    def test_no_holdings(self):
+        valuations = value_holdings(load_holdings(), DATE)
+
+        assert len(valuations["market_value"]) == 0
+
+    def test_value_holdings_command(self, holdings):
+        first, _ = holdings
+        call_command("value_holdings", "--date", DATE.isoformat(), stdout=StringIO())
+        call_command("value_holdings", "--date", DATE.isoformat(), stdout=StringIO())
+
+        assert PortfolioValuation.objects.count() == 2
+        assert PortfolioValuation.objects.get(user=first).unrealised_pnl == pytest.approx(200.0)
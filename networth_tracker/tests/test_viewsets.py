@@ -9,7 +9,6 @@ from rest_framework.test import APIClient
 
 from networth_tracker.api.serializers import (
     BankAccountSerializer,
-    CustomUserSerializer,
     EtfSerializer,
     EtfTransactionSerializer,
     SuperannuationSerializer,
@@ -57,9 +56,9 @@ class TestUserBankAccountViewSet:
         response = client.get(url)
 
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert BankAccountSerializer(bank_account_1).data in response.data
-        assert BankAccountSerializer(another_user_account).data not in response.data
+        assert len(response.data["results"]) == 1
+        assert BankAccountSerializer(bank_account_1).data in response.data["results"]
+        assert BankAccountSerializer(another_user_account).data not in response.data["results"]
 
     def test_unauthenticated(self):
         client = APIClient()
@@ -190,9 +189,9 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"search": bank_account_1.bank})
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert BankAccountSerializer(bank_account_1).data in response.data
-        assert BankAccountSerializer(bank_account_2).data not in response.data
+        assert len(response.data["results"]) == 1
+        assert BankAccountSerializer(bank_account_1).data in response.data["results"]
+        assert BankAccountSerializer(bank_account_2).data not in response.data["results"]
 
     def test_bank_account_search_by_bank(
         self, create_auth_client, custom_user_1, bank_account_1, bank_account_factory
@@ -204,9 +203,9 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"bank": bank_account_1.bank})
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert BankAccountSerializer(bank_account_1).data in response.data
-        assert BankAccountSerializer(bank_account_2).data not in response.data
+        assert len(response.data["results"]) == 1
+        assert BankAccountSerializer(bank_account_1).data in response.data["results"]
+        assert BankAccountSerializer(bank_account_2).data not in response.data["results"]
 
     def test_bank_account_search_by_account_name(
         self, create_auth_client, custom_user_1, bank_account_1, bank_account_factory
@@ -220,9 +219,9 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"account_name": bank_account_1.account_name})
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert BankAccountSerializer(bank_account_1).data in response.data
-        assert BankAccountSerializer(bank_account_2).data not in response.data
+        assert len(response.data["results"]) == 1
+        assert BankAccountSerializer(bank_account_1).data in response.data["results"]
+        assert BankAccountSerializer(bank_account_2).data not in response.data["results"]
 
     def test_bank_account_order_by_bank(
         self, create_auth_client, custom_user_1, bank_account_1, bank_account_factory
@@ -236,8 +235,8 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"ordering": "bank"})
 
         assert response.status_code == status.HTTP_200_OK
-        assert BankAccountSerializer(bank_account_1).data == response.data[1]
-        assert BankAccountSerializer(bank_account_2).data == response.data[0]
+        assert BankAccountSerializer(bank_account_1).data == response.data["results"][1]
+        assert BankAccountSerializer(bank_account_2).data == response.data["results"][0]
 
     def test_bank_account_order_by_account_name(
         self, create_auth_client, custom_user_1, bank_account_1, bank_account_factory
@@ -251,8 +250,8 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"ordering": "account_name"})
 
         assert response.status_code == status.HTTP_200_OK
-        assert BankAccountSerializer(bank_account_1).data == response.data[1]
-        assert BankAccountSerializer(bank_account_2).data == response.data[0]
+        assert BankAccountSerializer(bank_account_1).data == response.data["results"][1]
+        assert BankAccountSerializer(bank_account_2).data == response.data["results"][0]
 
     def test_bank_account_order_by_balance(
         self, create_auth_client, custom_user_1, bank_account_1, bank_account_factory
@@ -266,8 +265,8 @@ class TestUserBankAccountViewSet:
         response = client.get(url, {"ordering": "balance"})
 
         assert response.status_code == status.HTTP_200_OK
-        assert BankAccountSerializer(bank_account_1).data == response.data[1]
-        assert BankAccountSerializer(bank_account_2).data == response.data[0]
+        assert BankAccountSerializer(bank_account_1).data == response.data["results"][1]
+        assert BankAccountSerializer(bank_account_2).data == response.data["results"][0]
 
 
 class TestAccountViewSet:
@@ -332,8 +331,8 @@ class TestAccountViewSet:
         response = client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["id"] == account_1.id
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["id"] == account_1.id
 
     def test_get_account_by_id(self, create_auth_client, custom_user_1, account_1):
         client = create_auth_client(custom_user_1)
@@ -466,10 +465,10 @@ class TestEtfViewSet:
         response = client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
-        assert EtfSerializer(etf_1).data in response.data
-        assert EtfSerializer(etf_2).data in response.data
-        assert EtfSerializer(etf_not_in).data not in response.data
+        assert len(response.data["results"]) == 2
+        assert EtfSerializer(etf_1).data in response.data["results"]
+        assert EtfSerializer(etf_2).data in response.data["results"]
+        assert EtfSerializer(etf_not_in).data not in response.data["results"]
 
     def test_create_etf(self, create_auth_client, custom_user_1):
         client = create_auth_client(custom_user_1)
@@ -482,7 +481,7 @@ class TestEtfViewSet:
 
         assert response.status_code == status.HTTP_201_CREATED
         assert Etf.objects.filter(ticker="TSLA").exists()
-        assert response.data["user"] == CustomUserSerializer(custom_user_1).data
+        assert response.data["user"] == custom_user_1.pk
         assert response.data["units_held"] == 0
         assert response.data["average_cost"] == 0
 
@@ -623,10 +622,13 @@ class TestEtfViewSet:
         response = client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
-        assert EtfTransactionSerializer(etf_transaction_1).data in response.data
-        assert EtfTransactionSerializer(etf_transaction_2).data in response.data
-        assert EtfTransactionSerializer(another_user_etf_transaction).data not in response.data
+        assert len(response.data["results"]) == 2
+        assert EtfTransactionSerializer(etf_transaction_1).data in response.data["results"]
+        assert EtfTransactionSerializer(etf_transaction_2).data in response.data["results"]
+        assert (
+            EtfTransactionSerializer(another_user_etf_transaction).data
+            not in response.data["results"]
+        )
 
 
 class TestEtfTransactionViewSet:
@@ -651,10 +653,13 @@ class TestEtfTransactionViewSet:
         response = client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
-        assert EtfTransactionSerializer(etf_transaction_1).data in response.data
-        assert EtfTransactionSerializer(etf_transaction_2).data in response.data
-        assert EtfTransactionSerializer(another_user_etf_transaction).data not in response.data
+        assert len(response.data["results"]) == 2
+        assert EtfTransactionSerializer(etf_transaction_1).data in response.data["results"]
+        assert EtfTransactionSerializer(etf_transaction_2).data in response.data["results"]
+        assert (
+            EtfTransactionSerializer(another_user_etf_transaction).data
+            not in response.data["results"]
+        )
 
     def test_get_etf_transactions_by_id(
         self, create_auth_client, custom_user_1, etf_transaction_1
@@ -831,9 +836,12 @@ class TestSuperannuationViewSet:
         response = client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert SuperannuationSerializer(superannuation_1).data in response.data
-        assert SuperannuationSerializer(another_user_superannuation).data not in response.data
+        assert len(response.data["results"]) == 1
+        assert SuperannuationSerializer(superannuation_1).data in response.data["results"]
+        assert (
+            SuperannuationSerializer(another_user_superannuation).data
+            not in response.data["results"]
+        )
 
     def test_get_superannuation_by_id(self, create_auth_client, custom_user_1, superannuation_1):
         client = create_auth_client(custom_user_1)
@@ -870,7 +878,7 @@ class TestSuperannuationViewSet:
         response = client.post(url, data, format="json")
 
         assert response.status_code == status.HTTP_201_CREATED
-        assert response.data["user"]["id"] == custom_user_1.id
+        assert response.data["user"] == custom_user_1.id
 
     def test_update_superannuation_by_id(
         self, create_auth_client, custom_user_1, superannuation_1
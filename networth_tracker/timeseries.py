@@ -0,0 +1,45 @@
+# networth_tracker/timeseries.py
+
+"""
+Downsampling of long time series for charts.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Return the indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the point kept in the previous
+    bucket and the average of the next bucket, which preserves peaks and dips
+    far better than taking every n-th point.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    length = len(x)
+
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+
+    # Bucket boundaries for the `threshold - 2` middle buckets
+    edges = np.floor(np.linspace(1, length - 1, threshold - 1)).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, length - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else length
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        # Twice the triangle areas; only their argmax matters
+        base = (x[previous] - next_x) * (y[start:end] - y[previous])
+        areas = np.abs(base - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
@@ -4,6 +4,7 @@ from django.urls import include, path
 from rest_framework import routers
 from rest_framework.authtoken.views import obtain_auth_token
 
+from networth_tracker.api.batch import BatchView
 from networth_tracker.api.viewsets import (
     AccountViewSet,
     BankAccountViewSet,
@@ -11,7 +12,8 @@ from networth_tracker.api.viewsets import (
     EtfViewSet,
     SuperannuationViewSet,
 )
-from networth_tracker.apis import RegisterView
+from networth_tracker.apis import NetWorthHistoryView, NetWorthView, PriceView, RegisterView
+from networth_tracker.views import dashboard
 
 router = routers.DefaultRouter()
 router.register(r"accounts", AccountViewSet, basename="accounts")
@@ -24,5 +26,10 @@ urlpatterns = [
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     path("api-token-auth/", obtain_auth_token, name="api_token_auth"),
     path("register/", RegisterView.as_view(), name="register"),
+    path("networth/", NetWorthView.as_view(), name="networth"),
+    path("networth/history/", NetWorthHistoryView.as_view(), name="networth-history"),
+    path("prices/", PriceView.as_view(), name="prices"),
+    path("dashboard/", dashboard, name="dashboard"),
+    path("batch/", BatchView.as_view(), name="batch"),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,112 @@
+# networth_tracker/valuation.py
+
+"""
+Vectorised mark-to-market valuation of every `Etf` holding.
+
+Holdings and their as-of prices are loaded into NumPy arrays once, so market
+value, unrealised P&L and portfolio weight are computed for all users in a
+single pass instead of a Python loop over model instances.
+"""
+
+import numpy as np
+
+from networth_tracker.models import Etf, PortfolioValuation
+from networth_tracker.prices import normalise_ticker, prices_as_of
+
+
+def load_holdings(queryset=None, chunk_size=10000):
+    """
+    Return the `(etf_id, user_id, ticker, units_held, average_cost)` columns as arrays.
+    """
+
+    queryset = Etf.objects.all() if queryset is None else queryset
+    rows = list(
+        queryset.order_by()
+        .values_list("pk", "user_id", "ticker", "units_held", "average_cost")
+        .iterator(chunk_size=chunk_size)
+    )
+    count = len(rows)
+
+    return {
+        "etf_id": np.fromiter((row[0] for row in rows), dtype=np.int64, count=count),
+        "user_id": np.fromiter((row[1] for row in rows), dtype=np.int64, count=count),
+        "ticker": np.array([normalise_ticker(row[2]) for row in rows], dtype=object),
+        "units_held": np.fromiter((row[3] for row in rows), dtype=np.float64, count=count),
+        "average_cost": np.fromiter((row[4] for row in rows), dtype=np.float64, count=count),
+    }
+
+
+def value_holdings(holdings, date):
+    """
+    Mark `holdings` (as returned by `load_holdings`) to market as of `date`.
+
+    Holdings without a stored price on or before `date` are valued at cost.
+    Returns the input columns plus per-holding `close`, `market_value`,
+    `cost_basis`, `unrealised_pnl` and `weight` (share of the user's ETF
+    market value) arrays.
+    """
+
+    tickers, ticker_index = np.unique(holdings["ticker"].astype(str), return_inverse=True)
+    prices = prices_as_of(tickers.tolist(), date)
+    ticker_close = np.array([prices.get(ticker, (None, np.nan))[1] for ticker in tickers])
+
+    units = holdings["units_held"]
+    cost_basis = units * holdings["average_cost"]
+    close = ticker_close[ticker_index] if len(tickers) else np.empty(0)
+    market_value = np.where(np.isnan(close), cost_basis, units * close)
+
+    users, user_index = np.unique(holdings["user_id"], return_inverse=True)
+    user_value = np.bincount(user_index, weights=market_value, minlength=len(users))
+    user_value = user_value[user_index]
+    weight = np.divide(
+        market_value, user_value, out=np.zeros_like(market_value), where=user_value != 0
+    )
+
+    return {
+        **holdings,
+        "close": close,
+        "market_value": market_value,
+        "cost_basis": cost_basis,
+        "unrealised_pnl": market_value - cost_basis,
+        "weight": weight,
+    }
+
+
+def aggregate_by_user(valuations):
+    """
+    Return `(user_ids, market_value, cost_basis, unrealised_pnl)` arrays summed per user.
+    """
+
+    users, user_index = np.unique(valuations["user_id"], return_inverse=True)
+    totals = [
+        np.bincount(user_index, weights=valuations[column], minlength=len(users))
+        for column in ("market_value", "cost_basis", "unrealised_pnl")
+    ]
+    return (users, *totals)
+
+
+def store_valuations(valuations, date, batch_size=2000):
+    """
+    Upsert the per-user totals of `valuations` into `PortfolioValuation` for `date`.
+    """
+
+    users, market_value, cost_basis, unrealised_pnl = aggregate_by_user(valuations)
+    rows = [
+        PortfolioValuation(
+            user_id=int(user_id),
+            date=date,
+            market_value=float(value),
+            cost_basis=float(cost),
+            unrealised_pnl=float(pnl),
+        )
+        for user_id, value, cost, pnl in zip(users, market_value, cost_basis, unrealised_pnl)
+    ]
+
+    PortfolioValuation.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["user", "date"],
+        update_fields=["market_value", "cost_basis", "unrealised_pnl", "updated_at"],
+    )
+    return len(rows)